@@ -6,61 +6,202 @@ Exercices sur la manipulation de fichiers CSV - Système de bibliothèque
 """
 
 import csv
+import hashlib
+import itertools
+import json
+import math
+import mmap
+import os
+import random
+import shutil
+import struct
+import tempfile
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
 
 # ============= EXERCICE 1 : EXTRACTION =============
 
-def extract():
+def extract(chemin="input.csv", cache=False):
     """
     Exercice 1 : Lire le fichier input.csv
     
-    Retourne une liste de dictionnaires avec les colonnes :
+    Générateur : produit un dictionnaire par ligne avec les colonnes :
     - titre : titre du livre
     - jours_emprunt : nombre de jours d'emprunt
+    
+    Les lignes sont lues une à une : le fichier n'est jamais chargé en entier.
+    Avec cache=True, les lignes viennent du cache colonnaire binaire
+    (construit au premier appel, voir ouvrir_colonnes()).
     """
-    # À compléter
-    # Conseil : utilisez csv.DictReader
-    pass
+    if cache:
+        with ouvrir_colonnes(chemin) as colonnes:
+            yield from colonnes.lignes()
+        return
+    with open(chemin, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
 
 
 # ============= EXERCICE 2 : TRANSFORMATION =============
 
+JOURS_GRATUITS = 14
+TARIF_JOUR = 0.50
+STATUTS = ("À temps", "En retard")
+
+
+def calculer_frais(jours_emprunt):
+    """Frais de retard : 0.50 € par jour au-delà de 14 jours"""
+    if jours_emprunt > JOURS_GRATUITS:
+        return (jours_emprunt - JOURS_GRATUITS) * TARIF_JOUR
+    return 0
+
+
+def calculer_frais_lot(jours, jours_gratuits=JOURS_GRATUITS, tarif=TARIF_JOUR):
+    """
+    Moteur de calcul vectorisé : frais et statuts d'un tableau de jours.
+    
+    Retourne (frais, codes) où codes[i] vaut 0 ("À temps") ou 1
+    ("En retard") : STATUTS[code] donne le libellé. Avec NumPy ce sont
+    deux ndarray calculés en un appel ; sinon un array('d') et un
+    array('b'). Les deux se convertissent avec .tolist().
+    
+    Avec jours_gratuits=0, `jours` est directement un nombre de jours de
+    retard.
+    
+    Sans NumPy, les jours étant des petits entiers, on précalcule une
+    table frais/code par nombre de jours : chaque ligne ne coûte plus
+    qu'une indexation de liste, sans appel de fonction.
+    """
+    try:
+        import numpy as np
+        frais = np.maximum(np.asarray(jours) - jours_gratuits, 0) * tarif
+        return frais, (frais > 0).astype(np.int8)
+    except ImportError:
+        pass
+    
+    def regle(j):
+        return (j - jours_gratuits) * tarif if j > jours_gratuits else 0.0
+    
+    if not len(jours):
+        return array("d"), array("b")
+    bas, haut = min(jours), max(jours)
+    if bas < 0 or haut > 100_000:
+        frais = array("d", [regle(j) for j in jours])
+        return frais, array("b", [f > 0 for f in frais])
+    table_frais = [regle(j) for j in range(haut + 1)]
+    table_codes = [int(f > 0) for f in table_frais]
+    return (array("d", [table_frais[j] for j in jours]),
+            array("b", [table_codes[j] for j in jours]))
+
+
+def _transformer_par_blocs(data, avec_statut, taille_bloc=4096):
+    """Applique calculer_frais_lot() par blocs de lignes"""
+    lignes = iter(data)
+    while True:
+        bloc = list(itertools.islice(lignes, taille_bloc))
+        if not bloc:
+            return
+        frais, codes = calculer_frais_lot(array("i", [int(l["jours_emprunt"]) for l in bloc]))
+        for ligne, montant, code in zip(bloc, frais.tolist(), codes.tolist()):
+            # 0 plutôt que 0.0 pour les livres rendus à temps
+            sortie = {"titre": ligne["titre"], "frais": montant if montant else 0}
+            if avec_statut:
+                sortie["statut"] = STATUTS[code]
+            yield sortie
+
+
 def transform(data):
     """
     Exercice 2 : Transformer les données et calculer les frais
     
     Paramètres :
-    - data : liste de dictionnaires avec titre et jours_emprunt
+    - data : itérable de dictionnaires avec titre et jours_emprunt
     
-    Retourne une liste de dictionnaires avec :
+    Générateur de dictionnaires avec :
     - titre : titre du livre
     - frais : frais de retard calculés
     
     Règles de calcul :
     - Si jours_emprunt <= 14 : frais = 0
     - Si jours_emprunt > 14 : frais = (jours_emprunt - 14) × 0.50
+    
+    Les frais sont calculés par blocs avec calculer_frais_lot().
     """
-    # À compléter
-    pass
+    yield from _transformer_par_blocs(data, avec_statut=False)
+
+
+def _ecrire_par_lots(writer, lignes, taille_lot, agregats):
+    """Écrit les lignes par lots et met à jour les agrégats au passage"""
+    total = 0
+    lot = []
+    for ligne in lignes:
+        lot.append(ligne)
+        agregats.ajouter(float(ligne["frais"]))
+        if len(lot) >= taille_lot:
+            writer.writerows(lot)
+            total += len(lot)
+            lot.clear()
+    writer.writerows(lot)
+    return total + len(lot)
 
 
-def load(data):
+def load(data, chemin="output.csv", taille_lot=1000, ecrire_entete=True, agregats=None):
     """
     Exercice 2 (suite) : Charger les données dans output.csv
     
     Paramètres :
-    - data : liste de dictionnaires avec titre et frais
+    - data : itérable de dictionnaires avec titre et frais
+    - taille_lot : nombre de lignes écrites à la fois
+    - ecrire_entete : False pour écrire un morceau sans en-tête
+    - agregats : AgregatsFrais à mettre à jour (un nouveau par défaut)
     
-    Crée un fichier output.csv avec les données transformées
+    Crée un fichier output.csv avec les données transformées et retourne
+    le nombre de lignes écrites. Les colonnes sont celles de la première
+    ligne ; seules `taille_lot` lignes sont en mémoire à un instant donné.
+    Les statistiques sont calculées pendant l'écriture et enregistrées
+    à côté du fichier complet (voir statistiques()).
     """
-    # À compléter
-    # Conseil : utilisez csv.DictWriter
-    pass
+    if agregats is None:
+        agregats = AgregatsFrais()
+    lignes = iter(data)
+    premiere = next(lignes, None)
+    with open(chemin, "w", newline="", encoding="utf-8") as f:
+        if premiere is None:
+            return 0
+        writer = csv.DictWriter(f, fieldnames=list(premiere))
+        if ecrire_entete:
+            writer.writeheader()
+        total = _ecrire_par_lots(writer, itertools.chain([premiere], lignes),
+                                 taille_lot, agregats)
+    if ecrire_entete:
+        sauvegarder_agregats(chemin, agregats)
+    return total
+
+
+def ajouter(data, chemin="output.csv", taille_lot=1000):
+    """
+    Ajoute des lignes transformées à la fin d'un fichier de sortie existant.
+
+    Les statistiques sont mises à jour avec les seules nouvelles lignes,
+    sans relire le fichier. Retourne le nombre de lignes ajoutées.
+    """
+    if not os.path.exists(chemin):
+        return load(data, chemin, taille_lot)
+    agregats = charger_agregats(chemin)
+    with open(chemin, newline="", encoding="utf-8") as f:
+        colonnes = next(csv.reader(f))
+    with open(chemin, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=colonnes)
+        total = _ecrire_par_lots(writer, data, taille_lot, agregats)
+    sauvegarder_agregats(chemin, agregats)
+    return total
 
 
 # ============= EXERCICE 3 : ORCHESTRATION =============
 
-def main():
+def main(entree="input.csv", sortie="output.csv", taille_lot=1000, cache=False):
     """
     Exercice 3 : Fonction principale qui orchestre le processus ETL
     
@@ -68,9 +209,16 @@ def main():
     1. extract() pour lire les données
     2. transform() pour calculer les frais
     3. load() pour sauvegarder le résultat
+    
+    Les trois étapes sont des générateurs chaînés : chaque ligne traverse
+    le pipeline dès sa lecture, la mémoire reste constante.
+    Avec cache=True, les frais sont calculés d'un bloc sur la colonne
+    jours_emprunt du cache colonnaire (transform_colonnes()).
     """
-    # À compléter
-    pass
+    if cache:
+        with ouvrir_colonnes(entree) as colonnes:
+            return load(transform_colonnes(colonnes), sortie, taille_lot)
+    return load(transform(extract(entree)), sortie, taille_lot)
 
 
 # ============= EXERCICE 4 : AJOUT STATUT =============
@@ -80,30 +228,512 @@ def transform_avec_statut(data):
     Exercice 4 : Transformer les données avec ajout du statut
     
     Paramètres :
-    - data : liste de dictionnaires avec titre et jours_emprunt
+    - data : itérable de dictionnaires avec titre et jours_emprunt
     
-    Retourne une liste de dictionnaires avec :
+    Générateur de dictionnaires avec :
     - titre : titre du livre
     - frais : frais de retard calculés
     - statut : "À temps" si frais = 0, "En retard" sinon
     """
-    # À compléter
-    pass
+    yield from _transformer_par_blocs(data, avec_statut=True)
+
+
+# ============= CACHE COLONNAIRE =============
+
+# Fichier <input>.colonnes :
+#   en-tête de 64 octets (magic, nb_lignes, taille et mtime du CSV, SHA-1)
+#   offsets  : int64 x (nb_lignes + 1), position de chaque titre dans le blob
+#   jours    : int32 x nb_lignes
+#   titres   : blob UTF-8 de tous les titres mis bout à bout
+_MAGIC_COLONNES = b"BIBCOL01"
+_ENTETE_COLONNES = struct.Struct("<8sQQq20s12x")
+
+
+def _hash_fichier(chemin):
+    sha1 = hashlib.sha1()
+    with open(chemin, "rb") as f:
+        for bloc in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(bloc)
+    return sha1.digest()
+
+
+def construire_cache(chemin="input.csv", chemin_cache=None):
+    """
+    Construit le cache colonnaire d'un CSV en une seule lecture.
+
+    Les colonnes sont écrites en flux dans des fichiers temporaires puis
+    assemblées : la mémoire reste bornée quelle que soit la taille du CSV.
+    """
+    chemin_cache = chemin_cache or chemin + ".colonnes"
+    infos = os.stat(chemin)
+    dossier = os.path.dirname(os.path.abspath(chemin_cache))
+    with tempfile.TemporaryDirectory(dir=dossier) as tmp:
+        chemins = {nom: os.path.join(tmp, nom) for nom in ("offsets", "jours", "titres")}
+        nb_lignes = 0
+        position = 0
+        with open(chemins["offsets"], "wb") as f_off, \
+             open(chemins["jours"], "wb") as f_jours, \
+             open(chemins["titres"], "wb") as f_titres, \
+             open(chemin, newline="", encoding="utf-8") as f_csv:
+            offsets, jours = array("q", [0]), array("i")
+            for ligne in csv.DictReader(f_csv):
+                titre = ligne["titre"].encode("utf-8")
+                f_titres.write(titre)
+                position += len(titre)
+                offsets.append(position)
+                jours.append(int(ligne["jours_emprunt"]))
+                nb_lignes += 1
+                if len(jours) >= 65536:
+                    offsets.tofile(f_off)
+                    jours.tofile(f_jours)
+                    offsets, jours = array("q"), array("i")
+            offsets.tofile(f_off)
+            jours.tofile(f_jours)
+
+        entete = _ENTETE_COLONNES.pack(_MAGIC_COLONNES, nb_lignes, infos.st_size,
+                                       infos.st_mtime_ns, _hash_fichier(chemin))
+        chemin_tmp = os.path.join(tmp, "cache")
+        with open(chemin_tmp, "wb") as f_cache:
+            f_cache.write(entete)
+            for nom in ("offsets", "jours", "titres"):
+                with open(chemins[nom], "rb") as f_colonne:
+                    shutil.copyfileobj(f_colonne, f_cache, 1 << 20)
+        os.replace(chemin_tmp, chemin_cache)
+    return chemin_cache
+
+
+def cache_valide(chemin="input.csv", chemin_cache=None):
+    """
+    Vérifie que le cache correspond encore au CSV.
+
+    Taille différente : invalide. Même taille et même mtime : valide.
+    Même taille mais mtime différent : le SHA-1 tranche (un simple `touch`
+    ne force pas de reconstruction, le mtime du cache est alors mis à jour).
+    """
+    chemin_cache = chemin_cache or chemin + ".colonnes"
+    try:
+        with open(chemin_cache, "rb") as f:
+            entete = f.read(_ENTETE_COLONNES.size)
+        magic, nb_lignes, taille, mtime_ns, sha1 = _ENTETE_COLONNES.unpack(entete)
+    except (OSError, struct.error):
+        return False
+    infos = os.stat(chemin)
+    if magic != _MAGIC_COLONNES or taille != infos.st_size:
+        return False
+    if mtime_ns == infos.st_mtime_ns:
+        return True
+    if _hash_fichier(chemin) != sha1:
+        return False
+    with open(chemin_cache, "r+b") as f:
+        f.write(_ENTETE_COLONNES.pack(magic, nb_lignes, taille, infos.st_mtime_ns, sha1))
+    return True
+
+
+class ColonnesCSV:
+    """
+    Vue en mémoire partagée (mmap) d'un cache colonnaire.
+
+    `jours` est un memoryview d'int32 lu directement dans le fichier : aucune
+    conversion texte -> entier ni copie. À utiliser comme context manager.
+    """
+
+    def __init__(self, chemin_cache):
+        self._fichier = open(chemin_cache, "rb")
+        self._mmap = mmap.mmap(self._fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        _, self.nb_lignes, _, _, _ = _ENTETE_COLONNES.unpack_from(self._mmap)
+        vue = memoryview(self._mmap)
+        debut_jours = _ENTETE_COLONNES.size + 8 * (self.nb_lignes + 1)
+        debut_titres = debut_jours + 4 * self.nb_lignes
+        self.offsets = vue[_ENTETE_COLONNES.size:debut_jours].cast("q")
+        self.jours = vue[debut_jours:debut_titres].cast("i")
+        self._titres = vue[debut_titres:]
+        self._vues = [vue, self.offsets, self.jours, self._titres]
+
+    def __len__(self):
+        return self.nb_lignes
+
+    def titre(self, i):
+        return str(self._titres[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def titres(self):
+        offsets, blob = self.offsets, self._titres
+        for i in range(self.nb_lignes):
+            yield str(blob[offsets[i]:offsets[i + 1]], "utf-8")
+
+    def lignes(self):
+        """Mêmes dictionnaires que extract() (jours_emprunt déjà en int)"""
+        for titre, jours in zip(self.titres(), self.jours):
+            yield {"titre": titre, "jours_emprunt": jours}
+
+    def fermer(self):
+        for vue in self._vues:
+            vue.release()
+        self._mmap.close()
+        self._fichier.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+        return False
+
+
+def ouvrir_colonnes(chemin="input.csv", chemin_cache=None):
+    """Ouvre le cache colonnaire du CSV, en le (re)construisant si besoin"""
+    chemin_cache = chemin_cache or chemin + ".colonnes"
+    if not cache_valide(chemin, chemin_cache):
+        construire_cache(chemin, chemin_cache)
+    return ColonnesCSV(chemin_cache)
+
+
+def frais_colonnes(jours):
+    """Frais de retard d'un bloc d'entiers jours_emprunt (buffer int32)"""
+    return calculer_frais_lot(jours)[0].tolist()
+
+
+def transform_colonnes(colonnes, taille_bloc=65536):
+    """
+    Équivalent de transform(extract()) à partir du cache colonnaire.
+
+    Les frais sont calculés par blocs de `taille_bloc` lignes pour garder
+    une mémoire bornée.
+    """
+    titres = colonnes.titres()
+    for debut in range(0, len(colonnes), taille_bloc):
+        # Frais calculés avant le premier yield : aucune vue sur le mmap ne
+        # reste exportée si le générateur est abandonné en cours de bloc
+        with colonnes.jours[debut:debut + taille_bloc] as bloc:
+            frais_bloc = frais_colonnes(bloc)
+        # frais en premier : zip s'arrête sans consommer un titre de trop
+        for frais, titre in zip(frais_bloc, titres):
+            # 0 plutôt que 0.0 : même sortie que transform()
+            yield {"titre": titre, "frais": frais if frais else 0}
+
+
+# ============= ETL PARALLÈLE =============
+
+def _decouper_en_plages(chemin, nb_plages):
+    """
+    Découpe un CSV en plages d'octets [debut, fin[ alignées sur des débuts
+    d'enregistrement (l'en-tête est exclu). Retourne (entete, plages).
+
+    Un retour à la ligne ne termine un enregistrement que hors guillemets :
+    le nombre de '"' depuis le début des données doit être pair (un ""
+    échappé compte double). Les titres sur plusieurs lignes restent donc
+    entiers. Le fichier est lu une fois par blocs, guillemets comptés en C.
+    """
+    taille = os.path.getsize(chemin)
+    with open(chemin, "rb") as f:
+        entete = next(csv.reader([f.readline().decode("utf-8-sig")]))
+        debut_donnees = f.tell()
+        bornes = [debut_donnees]
+        cibles = [debut_donnees + (taille - debut_donnees) * i // nb_plages
+                  for i in range(nb_plages - 1, 0, -1)]  # pile : la plus proche à la fin
+        decalage = debut_donnees
+        parite_bloc = 0  # parité des guillemets avant le bloc courant
+        for bloc in iter(lambda: f.read(1 << 20), b""):
+            if not cibles:
+                break
+            connu, parite = 0, parite_bloc  # parité avant bloc[connu]
+            while cibles and cibles[-1] < decalage + len(bloc):
+                j = max(cibles[-1] - decalage, connu)
+                while True:
+                    j = bloc.find(b"\n", j)
+                    if j < 0:
+                        break
+                    parite ^= bloc.count(b'"', connu, j) & 1
+                    connu = j
+                    if not parite:
+                        break
+                    j += 1
+                if j < 0:
+                    break  # Fin d'enregistrement dans un bloc suivant
+                borne = decalage + j + 1
+                if bornes[-1] < borne < taille:
+                    bornes.append(borne)
+                while cibles and cibles[-1] < borne:
+                    cibles.pop()
+            parite_bloc = parite ^ (bloc.count(b'"', connu) & 1)
+            decalage += len(bloc)
+        bornes.append(taille)
+    return entete, list(zip(bornes, bornes[1:]))
+
+
+def _lignes_plage(chemin, debut, fin):
+    """Produit les lignes (décodées) comprises entre les octets debut et fin"""
+    with open(chemin, "rb") as f:
+        f.seek(debut)
+        position = debut
+        for ligne in f:
+            if position >= fin:
+                break
+            position += len(ligne)
+            yield ligne.decode("utf-8")
+
+
+def _transformer_plage(tache):
+    """Worker : transforme une plage d'octets et l'écrit dans son fichier part"""
+    entree, debut, fin, entete, fonction, chemin_part, taille_lot = tache
+    lignes = csv.DictReader(_lignes_plage(entree, debut, fin), fieldnames=entete)
+    agregats = AgregatsFrais()
+    load(fonction(lignes), chemin_part, taille_lot, ecrire_entete=False, agregats=agregats)
+    return agregats
+
+
+def main_parallele(entree="input.csv", sortie="output.csv", avec_statut=False,
+                   max_workers=None, taille_lot=1000):
+    """
+    ETL parallèle : transform (ou transform_avec_statut) sur plusieurs cœurs.
+
+    Le fichier d'entrée est découpé en plages d'octets alignées sur les
+    enregistrements (retours à la ligne hors guillemets) ; chaque worker
+    d'un ProcessPoolExecutor lit sa plage et écrit son propre fichier part, puis les parts sont concaténées dans l'ordre
+    dans le fichier de sortie. Retourne le nombre de lignes écrites.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    fonction = transform_avec_statut if avec_statut else transform
+    colonnes = ["titre", "frais", "statut"] if avec_statut else ["titre", "frais"]
+    # Plus de plages que de workers pour équilibrer la charge
+    entete, plages = _decouper_en_plages(entree, max_workers * 4)
+
+    dossier = os.path.dirname(os.path.abspath(sortie))
+    with tempfile.TemporaryDirectory(dir=dossier) as tmp:
+        taches = [
+            (entree, debut, fin, entete, fonction,
+             os.path.join(tmp, f"part-{i:05d}.csv"), taille_lot)
+            for i, (debut, fin) in enumerate(plages)
+        ]
+        agregats = AgregatsFrais()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for agregats_plage in executor.map(_transformer_plage, taches):
+                agregats.fusionner(agregats_plage)
+
+        with open(sortie, "w", newline="", encoding="utf-8") as f_out:
+            csv.DictWriter(f_out, fieldnames=colonnes).writeheader()
+            f_out.flush()
+            for tache in taches:
+                with open(tache[5], "rb") as f_part:
+                    shutil.copyfileobj(f_part, f_out.buffer, 1 << 20)
+    sauvegarder_agregats(sortie, agregats)
+    return agregats.nombre
 
 
 # ============= EXERCICE 5 : STATISTIQUES (BONUS) =============
 
-def statistiques():
+class AgregatsFrais:
+    """
+    Statistiques des frais calculées en une passe (agrégats en ligne).
+
+    Les frais sont des multiples de 0.50 € : un histogramme des valeurs
+    donne des percentiles exacts en mémoire bornée par le nombre de
+    montants distincts. Deux agrégats se fusionnent (ETL parallèle).
+    """
+
+    def __init__(self):
+        self.nombre = 0
+        self.total = 0.0
+        self.en_retard = 0
+        self.minimum = None
+        self.maximum = None
+        self.histogramme = Counter()
+
+    def ajouter(self, frais):
+        self.nombre += 1
+        self.total += frais
+        if frais > 0:
+            self.en_retard += 1
+        if self.minimum is None or frais < self.minimum:
+            self.minimum = frais
+        if self.maximum is None or frais > self.maximum:
+            self.maximum = frais
+        self.histogramme[frais] += 1
+
+    def fusionner(self, autre):
+        self.nombre += autre.nombre
+        self.total += autre.total
+        self.en_retard += autre.en_retard
+        for valeur in (autre.minimum, autre.maximum):
+            if valeur is not None:
+                self.minimum = valeur if self.minimum is None else min(self.minimum, valeur)
+                self.maximum = valeur if self.maximum is None else max(self.maximum, valeur)
+        self.histogramme.update(autre.histogramme)
+
+    def percentile(self, p):
+        """Percentile p (0-100) par la méthode du rang le plus proche"""
+        if not self.nombre:
+            return None
+        rang = max(1, math.ceil(p / 100 * self.nombre))
+        cumul = 0
+        for valeur in sorted(self.histogramme):
+            cumul += self.histogramme[valeur]
+            if cumul >= rang:
+                return valeur
+
+    def vers_dict(self):
+        return {
+            "nombre": self.nombre,
+            "total": self.total,
+            "en_retard": self.en_retard,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "histogramme": sorted(self.histogramme.items()),
+        }
+
+    @classmethod
+    def depuis_dict(cls, donnees):
+        agregats = cls()
+        agregats.nombre = donnees["nombre"]
+        agregats.total = donnees["total"]
+        agregats.en_retard = donnees["en_retard"]
+        agregats.minimum = donnees["minimum"]
+        agregats.maximum = donnees["maximum"]
+        agregats.histogramme = Counter(dict((v, n) for v, n in donnees["histogramme"]))
+        return agregats
+
+
+def _chemin_agregats(chemin):
+    """Fichier compagnon contenant les statistiques d'un fichier de sortie"""
+    return chemin + ".stats.json"
+
+
+def _signature(chemin):
+    infos = os.stat(chemin)
+    return {"taille": infos.st_size, "mtime_ns": infos.st_mtime_ns}
+
+
+def sauvegarder_agregats(chemin, agregats):
+    """Enregistre les agrégats avec la signature (taille, mtime) du fichier"""
+    with open(_chemin_agregats(chemin), "w", encoding="utf-8") as f:
+        json.dump({"fichier": _signature(chemin), "agregats": agregats.vers_dict()}, f)
+
+
+def charger_agregats(chemin="output.csv"):
+    """
+    Agrégats d'un fichier de sortie : lus dans le fichier compagnon en O(1)
+    s'il correspond au fichier, sinon recalculés par une relecture complète
+    (fichier modifié hors du pipeline) puis réenregistrés.
+    """
+    try:
+        with open(_chemin_agregats(chemin), encoding="utf-8") as f:
+            donnees = json.load(f)
+        if donnees["fichier"] == _signature(chemin):
+            return AgregatsFrais.depuis_dict(donnees["agregats"])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    agregats = AgregatsFrais()
+    with open(chemin, newline="", encoding="utf-8") as f:
+        for ligne in csv.DictReader(f):
+            agregats.ajouter(float(ligne["frais"]))
+    sauvegarder_agregats(chemin, agregats)
+    return agregats
+
+
+def statistiques(chemin="output.csv"):
     """
     Bonus : Afficher des statistiques sur output.csv
     
-    Lit le fichier output.csv et affiche :
+    Affiche (et retourne) :
     - Le nombre total de livres
     - Le montant total des frais
     - Le nombre de livres en retard
+    - Les frais minimum, maximum, médian et 90e percentile
+    
+    Les agrégats sont maintenus par load() et ajouter() : pas de relecture
+    du fichier tant qu'il n'a pas été modifié par un autre programme.
+    """
+    agregats = charger_agregats(chemin)
+    resume = {
+        "nombre": agregats.nombre,
+        "total_frais": agregats.total,
+        "en_retard": agregats.en_retard,
+        "minimum": agregats.minimum,
+        "maximum": agregats.maximum,
+        "mediane": agregats.percentile(50),
+        "p90": agregats.percentile(90),
+    }
+    print(f"Nombre total de livres : {resume['nombre']}")
+    print(f"Montant total des frais : {resume['total_frais']:.2f} €")
+    print(f"Livres en retard : {resume['en_retard']}")
+    print(f"Frais min / médian / p90 / max : {resume['minimum']} / "
+          f"{resume['mediane']} / {resume['p90']} / {resume['maximum']}")
+    return resume
+
+
+# ============= BENCHMARK =============
+
+def generer_input_synthetique(chemin, nb_lignes):
+    """Génère un fichier d'entrée synthétique (~18 octets par ligne)"""
+    rng = random.Random(42)
+    with open(chemin, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["titre", "jours_emprunt"])
+        for debut in range(0, nb_lignes, 10000):
+            writer.writerows(
+                (f"Livre {i}", rng.randint(1, 60))
+                for i in range(debut, min(debut + 10000, nb_lignes))
+            )
+
+
+def benchmark_etl(nb_lignes=100_000_000, entree="input_synthetique.csv",
+                  sortie="output_synthetique.csv", taille_lot=1000):
     """
-    # À compléter
-    pass
+    Benchmark du pipeline ETL en streaming.
+
+    Avec la valeur par défaut, le fichier d'entrée fait environ 1.8 Go.
+    Mesure le débit et le pic mémoire du processus (RSS, Unix uniquement),
+    qui doit rester le même quelle que soit la taille du fichier.
+    """
+    print(f"=== Benchmark ETL ({nb_lignes} lignes) ===")
+    generer_input_synthetique(entree, nb_lignes)
+    taille = os.path.getsize(entree)
+
+    start = time.perf_counter()
+    total = main(entree, sortie, taille_lot)
+    temps = time.perf_counter() - start
+
+    print(f"{total} lignes en {temps:.2f}s ({total / temps:,.0f} lignes/s, "
+          f"{taille / temps / 1024**2:.1f} Mo/s)")
+
+    construire_cache(entree)
+    start = time.perf_counter()
+    total = main(entree, sortie, taille_lot, cache=True)
+    temps_cache = time.perf_counter() - start
+    print(f"Avec cache colonnaire : {temps_cache:.2f}s "
+          f"({total / temps_cache:,.0f} lignes/s, gain {temps / temps_cache:.1f}x)")
+
+    workers = os.cpu_count() or 1
+    start = time.perf_counter()
+    total = main_parallele(entree, sortie, max_workers=workers, taille_lot=taille_lot)
+    temps_parallele = time.perf_counter() - start
+    print(f"Parallèle ({workers} workers) : {temps_parallele:.2f}s "
+          f"({total / temps_parallele:,.0f} lignes/s, gain {temps / temps_parallele:.1f}x)")
+    try:
+        import resource
+        pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f"Pic mémoire du processus : {pic / 1024:.1f} Mo")
+    except ImportError:
+        print("Pic mémoire non disponible (module resource absent)")
+
+
+def benchmark_frais(nb_lignes=1_000_000):
+    """Calcul des frais ligne par ligne comparé au moteur par lot"""
+    print(f"=== Benchmark frais ({nb_lignes} emprunts) ===")
+    rng = random.Random(42)
+    jours = array("i", (rng.randint(1, 60) for _ in range(nb_lignes)))
+
+    start = time.perf_counter()
+    for j in jours:
+        calculer_frais(j)
+    temps_ligne = time.perf_counter() - start
+
+    start = time.perf_counter()
+    calculer_frais_lot(jours)
+    temps_lot = time.perf_counter() - start
+
+    print(f"Ligne par ligne : {temps_ligne * 1000:.1f} ms")
+    print(f"Par lot : {temps_lot * 1000:.1f} ms (gain {temps_ligne / temps_lot:.1f}x)")
 
 
 # ============= TESTS =============
@@ -115,3 +745,4 @@ if __name__ == "__main__":
     # Décommentez pour tester :
     # main()
     # statistiques()
+    # benchmark_etl(nb_lignes=1_000_000)
@@ -1,6 +1,12 @@
-from main import main
+from main import (STATUTS, ajouter, calculer_frais, calculer_frais_lot, extract, main,
+                  main_parallele, ouvrir_colonnes, statistiques, transform, transform_colonnes)
+from array import array
 import os
 import csv
+import math
+import sys
+
+import pytest
 
 
 def test_output():
@@ -20,3 +26,122 @@ def test_output():
                 case _:
                     assert False
     os.remove(filename)
+
+
+def ecrire_entree(chemin, titres):
+    with open(chemin, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["titre", "jours_emprunt"])
+        writer.writerows((titre, 1 + i % 60) for i, titre in enumerate(titres))
+
+
+def lire(chemin):
+    with open(chemin, "rb") as f:
+        return f.read()
+
+
+def test_parallele_retours_ligne_entre_guillemets(tmp_path):
+    entree, sequentiel, parallele = (str(tmp_path / nom) for nom in
+                                     ("input.csv", "sequentiel.csv", "parallele.csv"))
+    motifs = ["Livre {}", 'Titre, "cité" {}', "Sur\ndeux lignes {}", 'a""\n\n""b {}']
+    ecrire_entree(entree, (motifs[i % 4].format(i) for i in range(5000)))
+    main(entree, sequentiel)
+    for max_workers in (1, 3, 7):
+        main_parallele(entree, parallele, max_workers=max_workers)
+        assert lire(parallele) == lire(sequentiel)
+
+
+def test_etl_sequentiel_parallele_cache(tmp_path):
+    entree, sequentiel, parallele, cache = (str(tmp_path / nom) for nom in
+                                            ("input.csv", "sequentiel.csv",
+                                             "parallele.csv", "cache.csv"))
+    ecrire_entree(entree, (f'Livre "{i}",\ntome {i % 3}' for i in range(3000)))
+    assert main(entree, sequentiel, taille_lot=7) == 3000
+    main_parallele(entree, parallele, max_workers=2)
+    main(entree, cache, cache=True)  # construit le cache colonnaire
+    assert lire(parallele) == lire(sequentiel)
+    assert lire(cache) == lire(sequentiel)
+    main(entree, cache, cache=True)  # relit le cache existant
+    assert lire(cache) == lire(sequentiel)
+
+
+def test_transform_colonnes_abandonne(tmp_path):
+    entree = str(tmp_path / "input.csv")
+    ecrire_entree(entree, (f"Livre {i}" for i in range(100)))
+    with ouvrir_colonnes(entree) as colonnes:
+        lignes = transform_colonnes(colonnes, taille_bloc=10)
+        assert next(lignes) == {"titre": "Livre 0", "frais": 0}
+    # Le générateur encore suspendu n'empêche pas la fermeture du mmap
+    with ouvrir_colonnes(entree) as colonnes:
+        for ligne in transform_colonnes(colonnes, taille_bloc=10):
+            break
+
+
+def statistiques_reference(chemin):
+    with open(chemin, newline="", encoding="utf-8") as f:
+        frais = sorted(float(ligne["frais"]) for ligne in csv.DictReader(f))
+
+    def percentile(p):
+        return frais[max(1, math.ceil(p / 100 * len(frais))) - 1]
+
+    return {
+        "nombre": len(frais),
+        "total_frais": sum(frais),
+        "en_retard": sum(1 for f in frais if f > 0),
+        "minimum": frais[0],
+        "maximum": frais[-1],
+        "mediane": percentile(50),
+        "p90": percentile(90),
+    }
+
+
+def verifier_statistiques(chemin):
+    resume = statistiques(chemin)
+    reference = statistiques_reference(chemin)
+    assert resume.pop("total_frais") == pytest.approx(reference.pop("total_frais"))
+    assert resume == reference
+
+
+def test_statistiques(tmp_path):
+    entree, sortie = str(tmp_path / "input.csv"), str(tmp_path / "output.csv")
+    ecrire_entree(entree, (f"Livre {i}" for i in range(1000)))
+    main(entree, sortie)
+    verifier_statistiques(sortie)
+    # Ajout incrémental : agrégats mis à jour sans relecture
+    ajouter(transform(extract(entree)), sortie)
+    verifier_statistiques(sortie)
+    # Fichier modifié hors du pipeline : agrégats recalculés
+    with open(sortie, "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(["Livre ajouté à la main", 99.5])
+    verifier_statistiques(sortie)
+    # ETL parallèle : agrégats des workers fusionnés
+    main_parallele(entree, sortie, max_workers=3)
+    verifier_statistiques(sortie)
+
+
+JOURS_TESTES = [0, 1, 13, 14, 15, 16, 30, 60, 365, 100_001]
+
+
+def verifier_frais_lot(jours):
+    frais, codes = calculer_frais_lot(jours)
+    attendu = [calculer_frais(j) for j in jours]
+    assert list(frais) == attendu
+    assert [STATUTS[c] for c in codes] == ["En retard" if f else "À temps" for f in attendu]
+    # jours_gratuits=0 : les jours sont directement des jours de retard
+    frais, _ = calculer_frais_lot(jours, jours_gratuits=0, tarif=1.0)
+    assert list(frais) == [float(max(j, 0)) for j in jours]
+
+
+def test_calculer_frais_lot_sans_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)  # import numpy -> ImportError
+    verifier_frais_lot(array("i", JOURS_TESTES))  # table de frais (jours <= 100 000)
+    verifier_frais_lot(array("i", JOURS_TESTES[:-1]))
+    verifier_frais_lot(array("i", [-3, 5, 200_000]))  # hors table : calcul par jour
+    frais, codes = calculer_frais_lot(array("i"))
+    assert (list(frais), list(codes)) == ([], [])
+
+
+def test_calculer_frais_lot_numpy():
+    pytest.importorskip("numpy")
+    verifier_frais_lot(array("i", JOURS_TESTES))
+    verifier_frais_lot(JOURS_TESTES)
@@ -6,56 +6,370 @@ Module 09 - Expressions Régulières et Bases de Données
 Exercices sur regex et SQLite
 """
 
+import asyncio
+import csv
+import io
+import itertools
+import os
+import queue
 import re
 import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
 from datetime import datetime
-import os
+from functools import lru_cache
 
 # ============= PARTIE 1 : EXPRESSIONS RÉGULIÈRES =============
 
+class Validateur:
+    """
+    Validation d'une chaîne entière par un pattern compilé une seule fois.
+    
+    Avant la regex, des tests sans regex éliminent la plupart des valeurs
+    invalides : longueur, jeu de caractères autorisés, puis rapide(valeur)
+    qui tranche (True / False) ou laisse la regex décider (None).
+    Après la regex, controle(match) vérifie ce qu'elle ne sait pas
+    exprimer (jours du mois...).
+    """
+    
+    __slots__ = ("nom", "regex", "longueur_min", "longueur_max", "caracteres",
+                 "rapide", "controle", "valider")
+    
+    def __init__(self, nom, pattern, longueur_min=0, longueur_max=None,
+                 caracteres=None, rapide=None, controle=None, flags=0):
+        self.nom = nom
+        self.regex = re.compile(pattern, flags)
+        self.longueur_min = longueur_min
+        self.longueur_max = longueur_max
+        self.caracteres = frozenset(caracteres) if caracteres is not None else None
+        self.rapide = rapide
+        self.controle = controle
+        self.valider = self._specialiser()
+    
+    def _specialiser(self):
+        """
+        Fonction de validation n'ayant que les étapes utiles, liées en
+        variables locales : pas d'attribut relu ni d'étape vide à chaque
+        appel (c'est elle que valider_lot applique)
+        """
+        longueur_min = self.longueur_min
+        longueur_max = self.longueur_max if self.longueur_max is not None else float("inf")
+        autorises = self.caracteres.issuperset if self.caracteres is not None else None
+        rapide, controle, fullmatch = self.rapide, self.controle, self.regex.fullmatch
+        
+        if rapide is None and controle is None:
+            # Cas le plus courant : la regex seule après les tests de base
+            def valider(valeur):
+                if not isinstance(valeur, str) or not longueur_min <= len(valeur) <= longueur_max:
+                    return False
+                if autorises is not None and not autorises(valeur):
+                    return False
+                return fullmatch(valeur) is not None
+            return valider
+        
+        def valider(valeur):
+            if not isinstance(valeur, str) or not longueur_min <= len(valeur) <= longueur_max:
+                return False
+            if autorises is not None and not autorises(valeur):
+                return False
+            if rapide is not None:
+                verdict = rapide(valeur)
+                if verdict is not None:
+                    return verdict
+            match = fullmatch(valeur)
+            return match is not None and (controle is None or controle(match))
+        return valider
+    
+    def __call__(self, valeur):
+        return self.valider(valeur)
+
+
+class RegistreValidateurs:
+    """
+    Validateurs nommés, compilés à l'enregistrement.
+    
+    Utilisation :
+        VALIDATEURS.valider("email", "alice@example.com")
+        VALIDATEURS.valider_lot("code_postal", codes)        # [True, False...]
+        VALIDATEURS.valider_colonnes(lignes, {"email": "email", 2: "date"})
+    """
+    
+    def __init__(self):
+        self._validateurs = {}
+    
+    def enregistrer(self, nom, pattern, **options):
+        """Compile et enregistre un validateur (options : voir Validateur)"""
+        validateur = Validateur(nom, pattern, **options)
+        self._validateurs[nom] = validateur
+        return validateur
+    
+    def __getitem__(self, nom):
+        return self._validateurs[nom]
+    
+    def __contains__(self, nom):
+        return nom in self._validateurs
+    
+    def noms(self):
+        return list(self._validateurs)
+    
+    def valider(self, nom, valeur):
+        return self._validateurs[nom](valeur)
+    
+    def valider_lot(self, nom, valeurs):
+        """Liste de booléens, un par valeur"""
+        return list(map(self._validateurs[nom].valider, valeurs))
+    
+    def compter_valides(self, nom, valeurs):
+        return sum(map(self._validateurs[nom].valider, valeurs))
+    
+    def valider_colonnes(self, lignes, colonnes):
+        """
+        Valide des colonnes de lignes (tuples, listes ou dictionnaires).
+        
+        colonnes associe une colonne (indice ou clé) à un nom de
+        validateur. Retourne les erreurs : (numéro de ligne, colonne, valeur).
+        """
+        controles = [(colonne, self._validateurs[nom].valider) for colonne, nom in colonnes.items()]
+        erreurs = []
+        for numero, ligne in enumerate(lignes):
+            for colonne, validateur in controles:
+                valeur = ligne[colonne]
+                if not validateur(valeur):
+                    erreurs.append((numero, colonne, valeur))
+        return erreurs
+
+
+_CHIFFRES = "0123456789"
+_MAJUSCULES = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_MINUSCULES = frozenset("abcdefghijklmnopqrstuvwxyz")
+_ALPHANUMERIQUES = _MAJUSCULES | _MINUSCULES | frozenset(_CHIFFRES)
+_JOURS_PAR_MOIS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _telephone_rapide(telephone):
+    # 10 caractères : forcément sans séparateur, pas besoin de regex
+    if len(telephone) == 10:
+        return telephone.isdigit() and telephone[0] == "0" and telephone[1] != "0"
+    return None
+
+
+def _jours_dans_mois(mois, annee):
+    if mois == 2 and annee % 4 == 0 and (annee % 100 != 0 or annee % 400 == 0):
+        return 29
+    return _JOURS_PAR_MOIS[mois - 1]
+
+
+def _date_rapide(date_str):
+    # Chiffres et "/" déjà vérifiés : avec les deux "/" à leur place, les
+    # trois champs sont des nombres, on tranche sans regex. Sur deux
+    # chiffres, l'ordre des chaînes est celui des nombres : pas d'int()
+    # tant que le jour ne dépasse pas 28
+    if date_str[2] != "/" or date_str[5] != "/" or date_str.count("/") != 2:
+        return False
+    jour, mois = date_str[:2], date_str[3:5]
+    if not ("01" <= mois <= "12" and "01" <= jour <= "31"):
+        return False
+    return jour <= "28" or int(jour) <= _jours_dans_mois(int(mois), int(date_str[6:]))
+
+
+def _date_existe(match):
+    jour, mois, annee = map(int, match.groups())
+    return jour <= _jours_dans_mois(mois, annee)
+
+
+def _mot_de_passe_rapide(mdp):
+    # Les quatre classes par opérations d'ensembles, sans les quatre
+    # lookahead qui reparcourent chacun le mot de passe
+    caracteres = set(mdp)
+    return (not caracteres.isdisjoint(_MAJUSCULES)
+            and not caracteres.isdisjoint(_MINUSCULES)
+            and not caracteres.isdisjoint(_CHIFFRES)
+            and not caracteres <= _ALPHANUMERIQUES)
+
+
+VALIDATEURS = RegistreValidateurs()
+VALIDATEURS.enregistrer(
+    "email", r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+    longueur_min=6, longueur_max=254,
+    caracteres=_ALPHANUMERIQUES | frozenset("._%+-@"),
+)
+VALIDATEURS.enregistrer(
+    "telephone", r"0[1-9](?P<separateur>[ -]?)[0-9]{2}(?:(?P=separateur)[0-9]{2}){3}",
+    longueur_min=10, longueur_max=14, caracteres=_CHIFFRES + " -",
+    rapide=_telephone_rapide,
+)
+VALIDATEURS.enregistrer(
+    # Longueur et chiffres ASCII suffisent : la regex ne sert jamais
+    "code_postal", r"[0-9]{5}",
+    longueur_min=5, longueur_max=5, caracteres=_CHIFFRES,
+    rapide=lambda code_postal: True,
+)
+VALIDATEURS.enregistrer(
+    "date", r"(0[1-9]|[12][0-9]|3[01])/(0[1-9]|1[0-2])/([0-9]{4})",
+    longueur_min=10, longueur_max=10, caracteres=_CHIFFRES + "/",
+    rapide=_date_rapide, controle=_date_existe,
+)
+VALIDATEURS.enregistrer(
+    "mot_de_passe", r"(?=.*[A-Z])(?=.*[a-z])(?=.*[0-9])(?=.*[^A-Za-z0-9]).{8,}",
+    longueur_min=8, rapide=_mot_de_passe_rapide, flags=re.DOTALL,
+)
+
+
 # Exercice 1 : Validation
 def valider_email(email):
     """Valide une adresse email"""
-    # À compléter
-    pass
+    return VALIDATEURS["email"].valider(email)
 
 
 def valider_telephone(telephone):
     """Valide un numéro de téléphone français"""
     # Formats acceptés: 06 12 34 56 78, 06-12-34-56-78, 0612345678
-    # À compléter
-    pass
+    return VALIDATEURS["telephone"].valider(telephone)
 
 
 def valider_code_postal(code_postal):
     """Valide un code postal français (5 chiffres)"""
-    # À compléter
-    pass
+    return VALIDATEURS["code_postal"].valider(code_postal)
 
 
 def valider_date(date_str):
     """Valide une date au format JJ/MM/AAAA"""
-    # À compléter
-    pass
+    return VALIDATEURS["date"].valider(date_str)
 
 
 # Exercice 2 : Extraction
+Correspondance = namedtuple("Correspondance", "type valeur debut fin")
+
+
+class ExtracteurMultiple:
+    """
+    Extraction de plusieurs types de motifs en un seul passage.
+    
+    Les patterns nommés sont réunis en une alternative
+    (?P<email>...)|(?P<url>...)|... : le texte n'est parcouru qu'une
+    fois et chaque correspondance indique son type. Les correspondances
+    ne se chevauchent pas : à une même position, le premier type de la
+    liste l'emporte, et un email dans une URL fait partie de l'URL.
+    
+    garde est une assertion placée devant l'alternative (et devant chaque
+    pattern seul) : c'est elle qui est essayée à chaque caractère du texte,
+    une garde qui échoue vite évite d'essayer tous les patterns.
+    
+    iterer_flux() parcourt un texte découpé en blocs (fichier lu par
+    morceaux) en gardant les chevauchement derniers caractères de chaque
+    bloc pour le suivant : une correspondance à cheval sur deux blocs est
+    trouvée entière, à condition d'être plus courte que chevauchement.
+    
+    Utilisation :
+        for c in EXTRACTEUR.iterer(texte):
+            print(c.type, c.valeur, c.debut)
+        EXTRACTEUR.extraire_fichier("dump.txt")   # {"email": [...], ...}
+    """
+    
+    # Caractères gardés avant le point de reprise, pour les lookbehind
+    CONTEXTE = 16
+    
+    def __init__(self, patterns, garde=""):
+        self.types = list(patterns)
+        alternative = "|".join(f"(?P<{nom}>{pattern})" for nom, pattern in patterns.items())
+        self.regex = re.compile(f"{garde}(?:{alternative})")
+        self.regex_par_type = {nom: re.compile(f"{garde}(?:{pattern})") for nom, pattern in patterns.items()}
+    
+    def iterer(self, texte, debut=0):
+        """Correspondances de texte, dans l'ordre, en un seul passage"""
+        for m in self.regex.finditer(texte, debut):
+            yield Correspondance(m.lastgroup, m.group(), m.start(), m.end())
+    
+    def _par_type(self, correspondances):
+        resultats = {nom: [] for nom in self.types}
+        for c in correspondances:
+            resultats[c.type].append(c.valeur)
+        return resultats
+    
+    def extraire(self, texte):
+        """Valeurs trouvées, par type : {"email": [...], "url": [...], ...}"""
+        return self._par_type(self.iterer(texte))
+    
+    def extraire_type(self, texte, nom):
+        """Toutes les valeurs d'un seul type (pattern seul, sans les autres)"""
+        return [m.group() for m in self.regex_par_type[nom].finditer(texte)]
+    
+    def iterer_flux(self, blocs, chevauchement=4096):
+        """
+        Correspondances d'un texte donné par blocs (itérable de chaînes),
+        avec leurs positions dans le texte complet.
+        """
+        finditer = self.regex.finditer
+        tampon = ""
+        position = 0   # reprise de la recherche dans tampon
+        decalage = 0   # position de tampon[0] dans le texte complet
+        for bloc in blocs:
+            tampon += bloc
+            limite = len(tampon) - chevauchement
+            if limite <= position:
+                continue
+            # Une correspondance qui finit dans les derniers caractères
+            # pourrait continuer dans le bloc suivant : on la recherchera
+            # avec lui
+            reprise = limite
+            for m in finditer(tampon, position):
+                if m.end() > limite:
+                    reprise = min(m.start(), limite)
+                    break
+                yield Correspondance(m.lastgroup, m.group(), decalage + m.start(), decalage + m.end())
+            coupe = max(reprise - self.CONTEXTE, 0)
+            tampon = tampon[coupe:]
+            decalage += coupe
+            position = reprise - coupe
+        for m in finditer(tampon, position):
+            yield Correspondance(m.lastgroup, m.group(), decalage + m.start(), decalage + m.end())
+    
+    def iterer_fichier(self, chemin, taille_bloc=1 << 20, chevauchement=4096, encoding="utf-8"):
+        """Correspondances d'un fichier texte lu par blocs de taille_bloc caractères"""
+        with open(chemin, encoding=encoding, errors="replace", newline="") as f:
+            yield from self.iterer_flux(iter(lambda: f.read(taille_bloc), ""), chevauchement)
+    
+    def extraire_fichier(self, chemin, **options):
+        """Valeurs trouvées dans un fichier, par type (options : iterer_fichier)"""
+        return self._par_type(self.iterer_fichier(chemin, **options))
+
+
+_OCTET = r"(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])"
+
+# Tout commence en début de mot : au milieu d'un mot, seule la garde est
+# essayée (quatre fois plus rapide que les quatre patterns à chaque
+# caractère). Un email commence forcément au début de sa partie locale,
+# une IP ou un numéro après un caractère qui n'est pas un chiffre.
+EXTRACTEUR = ExtracteurMultiple({
+    "url": r"(?:https?://|www\.)[^\s<>\"']*[^\s<>\"'.,;:!?)\]]",
+    "email": VALIDATEURS["email"].regex.pattern,
+    "ip": rf"(?=[0-9]){_OCTET}(?:\.{_OCTET}){{3}}(?!\.?[0-9])",
+    "telephone": rf"{VALIDATEURS['telephone'].regex.pattern}(?![0-9])",
+}, garde=r"(?<![a-zA-Z0-9._%+-])")
+
+
+def extraire_tout(texte):
+    """Emails, téléphones, URLs et IPs d'un texte, en un seul passage"""
+    return EXTRACTEUR.extraire(texte)
+
+
 def extraire_emails(texte):
     """Extrait tous les emails d'un texte"""
-    # À compléter
-    pass
+    return EXTRACTEUR.extraire_type(texte, "email")
 
 
 def extraire_telephones(texte):
     """Extrait tous les numéros de téléphone"""
-    # À compléter
-    pass
+    return EXTRACTEUR.extraire_type(texte, "telephone")
 
 
 def extraire_urls(texte):
     """Extrait toutes les URLs"""
-    # À compléter
-    pass
+    return EXTRACTEUR.extraire_type(texte, "url")
 
 
 # Exercice 3 : Remplacement
@@ -88,8 +402,7 @@ def valider_mot_de_passe(mdp):
     - Au moins un chiffre
     - Au moins un caractère spécial
     """
-    # À compléter
-    pass
+    return VALIDATEURS["mot_de_passe"].valider(mdp)
 
 
 # Exercice 5 : Parsing de logs
@@ -101,290 +414,1702 @@ def parser_log(ligne_log):
 
 def extraire_ips(texte):
     """Extrait les adresses IP d'un texte"""
-    # À compléter
-    pass
+    return EXTRACTEUR.extraire_type(texte, "ip")
 
 
 # ============= PARTIE 2 : BASE DE DONNÉES SQLITE =============
 
+# REGEXP dans SQLite : `valeur REGEXP pattern` appelle regexp(pattern, valeur).
+# Le filtrage se fait dans la base, seules les lignes retenues en sortent.
+
+@lru_cache(maxsize=256)
+def _regex_compilee(pattern):
+    """Compile un pattern une seule fois (cache partagé par les connexions)"""
+    return re.compile(pattern)
+
+
+def _sql_regexp(pattern, valeur):
+    """Fonction SQL REGEXP : re.search() du pattern dans la valeur"""
+    if pattern is None or valeur is None:
+        return None
+    return _regex_compilee(pattern).search(str(valeur)) is not None
+
+
+@lru_cache(maxsize=128)
+def classe_ligne(colonnes):
+    """
+    Tuple nommé pour une liste de noms de colonnes (une classe par liste).
+    
+    Pas de __dict__ par ligne (__slots__ vide) : aussi léger qu'un tuple,
+    lisible par nom (ligne.titre) ou par position (ligne[1]). Les noms
+    invalides (COUNT(*), doublons) deviennent _0, _1...
+    """
+    return namedtuple("Ligne", colonnes, rename=True)
+
+
+# Échappements de plusieurs caractères : hexadécimal, octal, nom Unicode,
+# référence arrière
+_ECHAPPEMENT_LONG = re.compile(
+    r"x[0-9a-fA-F]{0,2}|u[0-9a-fA-F]{0,4}|U[0-9a-fA-F]{0,8}|N\{[^}]*\}|[0-9]{1,3}"
+)
+
+
+def analyser_pattern(pattern):
+    """
+    Extrait les littéraux qu'une correspondance contient forcément.
+    
+    Retourne (prefixe, litteraux) :
+    - litteraux : morceaux de texte obligatoires, dans l'ordre, hors
+      groupes et classes (r'harry.*potter' -> ['harry', 'potter']) ;
+    - prefixe : littéral par lequel commence toute correspondance
+      ancrée au début (r'2024-11-.*' -> '2024-11-'), '' sinon.
+    
+    L'analyse est volontairement prudente : une alternative au premier
+    niveau ou le mode verbeux donnent ('', []), c'est-à-dire aucun
+    préfiltre.
+    """
+    if _regex_compilee(pattern).flags & re.VERBOSE:
+        return "", []
+    
+    litteraux, courant = [], []
+    prefixe = ""
+    i = 1 if pattern.startswith("^") else 0
+    debut_run = debut = i
+    profondeur = 0
+    
+    def couper():
+        nonlocal prefixe
+        if courant:
+            if debut_run == debut and not litteraux:
+                prefixe = "".join(courant)
+            litteraux.append("".join(courant))
+            courant.clear()
+    
+    while i < len(pattern):
+        c, atome = pattern[i], i
+        litteral = None
+        if c == "\\" and i + 1 < len(pattern):
+            # \. \- ... sont des littéraux ; \d \w \b \1 \x41 ... non
+            if not pattern[i + 1].isalnum():
+                litteral = pattern[i + 1]
+            echappement = _ECHAPPEMENT_LONG.match(pattern, i + 1)
+            i = echappement.end() if echappement else i + 2
+        elif c == "[":
+            # classe de caractères : on saute jusqu'au ] fermant
+            i += 1
+            if i < len(pattern) and pattern[i] == "^":
+                i += 1
+            if i < len(pattern) and pattern[i] == "]":
+                i += 1
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+        elif c in "*?{":
+            # l'élément précédent peut être absent : il n'est pas garanti
+            if courant:
+                courant.pop()
+            if c == "{":
+                i = pattern.find("}", i) + 1 or len(pattern)
+            else:
+                i += 1
+        elif c == "|" and profondeur == 0:
+            return "", []
+        else:
+            if c == "(":
+                profondeur += 1
+            elif c == ")":
+                profondeur -= 1
+            elif c not in ".^$+|":
+                litteral = c
+            i += 1
+        
+        if litteral is not None and profondeur == 0:
+            if not courant:
+                debut_run = atome
+            courant.append(litteral)
+        else:
+            couper()
+    couper()
+    return prefixe, litteraux
+
+
+def _echapper_like(texte):
+    return texte.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def filtre_regexp(colonne, pattern, ignorer_casse=False, ancre=False):
+    """
+    Construit la clause WHERE (sql, params) d'un filtre regex sur colonne.
+    
+    Le `colonne REGEXP ?` est précédé de préfiltres évalués par SQLite
+    sans rappel Python :
+    - ancre=True (correspondance au début, comme re.match) : le préfixe
+      littéral devient un intervalle `colonne >= ? AND colonne < ?`,
+      utilisable par un index ;
+    - sinon : les littéraux obligatoires deviennent un LIKE '%a%b%'.
+    
+    LIKE ignore la casse des seules lettres ASCII, re apparie aussi
+    i, k et s à ı, İ, K (kelvin) et ſ : avec ignorer_casse, ces lettres
+    et les caractères non ASCII des littéraux deviennent le joker _.
+    """
+    drapeaux = _regex_compilee(pattern).flags  # erreur de syntaxe levée ici
+    # Les options globales (?i) doivent rester en tête du pattern
+    options = re.match(r"(?:\(\?[aiLmsux]+\))*", pattern).group()
+    corps = pattern[len(options):]
+    regex = pattern
+    if ancre:
+        # \A et non ^, qui avec (?m) correspond aussi en début de ligne ;
+        # en mode verbeux, le retour à la ligne termine un # commentaire
+        fin = "\n" if drapeaux & re.VERBOSE else ""
+        regex = f"{options}\\A(?:{corps}{fin})"
+    if ignorer_casse:
+        regex = "(?i)" + regex
+        drapeaux |= re.IGNORECASE
+    ignorer_casse = bool(drapeaux & re.IGNORECASE)
+    
+    prefixe, litteraux = "", []
+    if not drapeaux & re.VERBOSE:
+        prefixe, litteraux = analyser_pattern(corps)
+    
+    clauses, params = [], []
+    if ancre and prefixe and not (ignorer_casse and prefixe.lower() != prefixe.upper()):
+        # 'abc' <= x < 'abd' : toutes les chaînes qui commencent par 'abc'
+        clauses.append(f"{colonne} >= ? AND {colonne} < ?")
+        params += [prefixe, prefixe[:-1] + chr(ord(prefixe[-1]) + 1)]
+    elif not ancre and litteraux:
+        motif = "%" + "%".join(map(_echapper_like, litteraux)) + "%"
+        if ignorer_casse:
+            motif = re.sub(r"[^\x00-\x7f]|[iksIKS]", "_", motif)
+        clauses.append(f"{colonne} LIKE ? ESCAPE '\\'")
+        params.append(motif)
+    clauses.append(f"{colonne} REGEXP ?")
+    params.append(regex)
+    return " AND ".join(clauses), params
+
+
+def requete_fts(texte, prefixe=True):
+    """
+    Transforme un texte libre en requête FTS5 : "harry" "pot"*
+    
+    Chaque mot est mis entre guillemets, la ponctuation et les mots-clés
+    FTS5 (AND, OR, NEAR...) saisis par l'utilisateur restent du texte.
+    Avec prefixe, seul le dernier mot (celui en cours de saisie) est un
+    préfixe : un préfixe court correspond à beaucoup de termes et coûte
+    bien plus cher qu'un mot complet.
+    """
+    mots = [f'"{mot}"' for mot in re.findall(r"\w+", texte)]
+    if mots and prefixe:
+        mots[-1] += "*"
+    return " ".join(mots)
+
+
+class PoolConnexions:
+    """
+    Pool borné de connexions SQLite partagé entre threads.
+    
+    - chaque thread emprunte au plus une connexion à la fois : un
+      connexion() imbriqué dans le même thread réutilise la sienne ;
+    - au-delà de taille_max emprunts simultanés, on attend qu'une
+      connexion soit rendue (TimeoutError après `timeout` secondes) ;
+    - mode WAL : les lecteurs ne bloquent pas l'écrivain et inversement ;
+    - les écritures passent par transaction(), sur une connexion
+      d'écriture dédiée : elles sont sérialisées dans le processus et
+      prennent le verrou SQLite dès le BEGIN IMMEDIATE, pas de "database
+      is locked" sur une promotion lecture -> écriture. busy_timeout
+      couvre les écrivains d'autres processus ;
+    - après chaque commit, les fonctions de apres_commit reçoivent les
+      tables modifiées (relevées par un authorizer SQLite, triggers
+      compris) ; version_donnees() change quand une autre connexion
+      (autre processus, self.conn...) a écrit ;
+    - une modification du schéma (CREATE INDEX...) par le pool recycle
+      les connexions de lecture (recycler()).
+    
+    Utilisation :
+        with pool.connexion() as conn:
+            conn.execute("SELECT ...")
+        with pool.transaction() as conn:
+            conn.execute("INSERT ...")
+    """
+    
+    def __init__(self, db_name, taille_max=4, timeout=30.0, busy_timeout_ms=5000):
+        self.db_name = db_name
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        # ':memory:' serait une base différente par connexion : on passe
+        # par une base mémoire partagée, avec une seule connexion
+        # (le cache partagé verrouille par table, sans busy_timeout)
+        if db_name == ':memory:':
+            self._cible = f"file:bibliotheque-{id(self)}?mode=memory&cache=shared"
+            self._uri = True
+            taille_max = 1
+        else:
+            self._cible = db_name
+            self._uri = False
+        self.taille_max = taille_max
+        
+        self._libres = queue.LifoQueue()  # LIFO : connexions « chaudes » d'abord
+        self._places = threading.BoundedSemaphore(taille_max)
+        self._local = threading.local()
+        self._verrou_ecriture = threading.RLock()
+        self._verrou_stats = threading.Lock()
+        self._verrou_version = threading.Lock()
+        self._ferme = False
+        self._ecrivain = None
+        self._tables_modifiees = set()
+        self._schema_modifie = False
+        self._generation = 0      # incrémentée par recycler()
+        self._generations = {}    # connexion de lecture -> génération
+        self.apres_commit = []
+        
+        self.nb_connexions = 0
+        self.nb_emprunts = 0
+        self.nb_empruntees = 0
+        self.nb_attentes = 0
+        self.attente_totale = 0.0
+        self.attente_max = 0.0
+        self.nb_ecritures = 0
+        self.attente_ecriture_totale = 0.0
+        self.attente_ecriture_max = 0.0
+    
+    def ouvrir_connexion(self, autocommit=True, cache_requetes=128):
+        """
+        Ouvre une connexion configurée (WAL, busy_timeout, clés étrangères).
+        
+        Les connexions du pool sont en autocommit : les transactions sont
+        explicites (transaction()). autocommit=False redonne le
+        comportement par défaut de sqlite3 (BEGIN implicite, commit()).
+        """
+        conn = sqlite3.connect(
+            self._cible, uri=self._uri, check_same_thread=False,
+            isolation_level=None if autocommit else "",
+            cached_statements=cache_requetes,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if not self._uri:
+            conn.execute("PRAGMA journal_mode = WAL")
+            # NORMAL suffit en WAL : la base reste cohérente après un crash
+            conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.create_function("REGEXP", 2, _sql_regexp, deterministic=True)
+        return conn
+    
+    def emprunter(self):
+        """
+        Emprunte une connexion hors de tout thread, à rendre avec rendre().
+        
+        Pour garder une connexion entre plusieurs appels exécutés sur des
+        threads différents (curseur lu par lots) ; sinon, connexion().
+        """
+        if self._ferme:
+            raise sqlite3.ProgrammingError("Pool de connexions fermé")
+        
+        debut = time.perf_counter()
+        if not self._places.acquire(timeout=self.timeout):
+            raise TimeoutError(
+                f"Aucune connexion libre après {self.timeout}s "
+                f"(taille_max={self.taille_max})"
+            )
+        attente = time.perf_counter() - debut
+        try:
+            conn = self._libres.get_nowait()
+        except queue.Empty:
+            try:
+                conn = self.ouvrir_connexion()
+            except BaseException:
+                self._places.release()
+                raise
+            with self._verrou_stats:
+                self.nb_connexions += 1
+                self._generations[conn] = self._generation
+        with self._verrou_stats:
+            self.nb_emprunts += 1
+            self.nb_empruntees += 1
+            self.attente_totale += attente
+            self.attente_max = max(self.attente_max, attente)
+            if attente > 1e-3:
+                self.nb_attentes += 1
+        return conn
+    
+    def rendre(self, conn):
+        """Rend une connexion obtenue par emprunter()"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        finally:
+            with self._verrou_stats:
+                self.nb_empruntees -= 1
+                perimee = self._generations.get(conn) != self._generation
+                if perimee or self._ferme:
+                    self._generations.pop(conn, None)
+                else:
+                    self._libres.put(conn)
+            if perimee or self._ferme:
+                conn.close()
+            self._places.release()
+    
+    def recycler(self):
+        """
+        Remplace les connexions de lecture : les libres sont fermées tout
+        de suite, les empruntées à leur retour.
+        
+        Après un changement de schéma : une connexion garde ses requêtes
+        préparées, et SQLite ne recompile pas un EXPLAIN QUERY PLAN (il ne
+        lit aucune table), qui décrirait encore le plan sans l'index.
+        """
+        # La connexion d'écriture garde ouverte une base ':memory:'
+        self._connexion_ecrivain()
+        with self._verrou_stats:
+            self._generation += 1
+            perimees = []
+            while True:
+                try:
+                    perimees.append(self._libres.get_nowait())
+                except queue.Empty:
+                    break
+            for conn in perimees:
+                del self._generations[conn]
+        for conn in perimees:
+            conn.close()
+    
+    @contextmanager
+    def connexion(self):
+        """Emprunte une connexion pour le thread courant"""
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is not None:
+            # Emprunt imbriqué : même connexion, pas de nouvelle place
+            yield conn
+            return
+        
+        conn = self.emprunter()
+        local.conn = conn
+        try:
+            yield conn
+        finally:
+            local.conn = None
+            self.rendre(conn)
+    
+    def _autoriser(self, action, table, colonne, base, trigger):
+        """Authorizer de l'écrivain : relève les tables modifiées"""
+        if action in (sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE, sqlite3.SQLITE_DELETE):
+            self._tables_modifiees.add(table)
+        elif action in (sqlite3.SQLITE_DROP_TABLE, sqlite3.SQLITE_ALTER_TABLE,
+                        sqlite3.SQLITE_DROP_VTABLE):
+            self._tables_modifiees.add("*")
+            self._schema_modifie = True
+        elif action in (sqlite3.SQLITE_CREATE_INDEX, sqlite3.SQLITE_DROP_INDEX,
+                        sqlite3.SQLITE_CREATE_TABLE, sqlite3.SQLITE_CREATE_VTABLE):
+            self._schema_modifie = True
+        return sqlite3.SQLITE_OK
+    
+    def _connexion_ecrivain(self):
+        with self._verrou_stats:
+            if self._ecrivain is None:
+                if self._ferme:
+                    raise sqlite3.ProgrammingError("Pool de connexions fermé")
+                # Sans cache de requêtes préparées : l'authorizer n'est
+                # appelé qu'à la préparation, il doit voir chaque écriture
+                self._ecrivain = self.ouvrir_connexion(cache_requetes=0)
+                self._ecrivain.set_authorizer(self._autoriser)
+            return self._ecrivain
+    
+    def version_donnees(self):
+        """
+        PRAGMA data_version de la connexion d'écriture : il ne change que
+        lorsqu'une autre connexion a commité, jamais pour nos écritures.
+        
+        Lu sous un petit verrou dédié, pas sous le verrou d'écriture : les
+        lecteurs n'attendent pas la fin d'une écriture. SQLite sérialise
+        les appels sur une même connexion (sqlite3.threadsafety == 3).
+        """
+        ecrivain = self._connexion_ecrivain()
+        with self._verrou_version:
+            return ecrivain.execute("PRAGMA data_version").fetchone()[0]
+    
+    def en_transaction(self):
+        """Vrai si la connexion du thread courant a une transaction ouverte"""
+        conn = getattr(self._local, "conn", None)
+        return conn is not None and conn.in_transaction
+    
+    @contextmanager
+    def ecriture(self):
+        """
+        Connexion d'écriture, sans transaction ouverte.
+        
+        Pour les écritures qui découpent elles-mêmes leurs transactions
+        (un chargement commité par lots) ; les transaction() des autres
+        threads attendent la fin du bloc. Dans le bloc, connexion() et
+        transaction() du même thread utilisent cette connexion.
+        """
+        ecrivain = self._connexion_ecrivain()
+        local = self._local
+        precedente = getattr(local, "conn", None)
+        if precedente is ecrivain:
+            yield ecrivain
+            return
+        debut = time.perf_counter()
+        with self._verrou_ecriture:
+            attente = time.perf_counter() - debut
+            with self._verrou_stats:
+                self.nb_ecritures += 1
+                self.attente_ecriture_totale += attente
+                self.attente_ecriture_max = max(self.attente_ecriture_max, attente)
+            local.conn = ecrivain
+            try:
+                yield ecrivain
+            finally:
+                local.conn = precedente
+                if ecrivain.in_transaction:
+                    ecrivain.rollback()
+                if self._schema_modifie:
+                    self._schema_modifie = False
+                    self.recycler()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Transaction d'écriture : commit en sortie, rollback sur exception.
+        
+        Imbriquée dans une transaction du même thread, elle en fait partie.
+        """
+        with self.ecriture() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+            self._tables_modifiees.clear()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+            tables = set(self._tables_modifiees)
+            for ecouteur in self.apres_commit:
+                ecouteur(tables)
+    
+    def statistiques(self):
+        """Statistiques d'emprunt : nombre, attentes (en ms), connexions, empruntées"""
+        with self._verrou_stats:
+            return {
+                "emprunts": self.nb_emprunts,
+                "attentes": self.nb_attentes,
+                "attente_moyenne_ms": 1000 * self.attente_totale / max(self.nb_emprunts, 1),
+                "attente_max_ms": 1000 * self.attente_max,
+                "connexions": self.nb_connexions,
+                "empruntees": self.nb_empruntees,
+                "taille_max": self.taille_max,
+                "ecritures": self.nb_ecritures,
+                "attente_ecriture_moyenne_ms": 1000 * self.attente_ecriture_totale / max(self.nb_ecritures, 1),
+                "attente_ecriture_max_ms": 1000 * self.attente_ecriture_max,
+            }
+    
+    def fermer(self):
+        """Ferme les connexions libres ; les empruntées le seront au retour"""
+        self._ferme = True
+        with self._verrou_ecriture, self._verrou_stats:
+            if self._ecrivain is not None:
+                self._ecrivain.close()
+                self._ecrivain = None
+        while True:
+            try:
+                self._libres.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class ProfileurRequetes:
+    """
+    Instrumentation des requêtes de lecture de BibliothequeDB.
+    
+    Pour chaque requête (SQL normalisé) : nombre d'exécutions, temps total
+    et maximal, plan d'exécution (EXPLAIN QUERY PLAN, calculé une seule
+    fois) et tables parcourues en entier ("SCAN table" sans index).
+    Le journal garde les dernières exécutions ; verbeux les affiche.
+    
+    Utilisation :
+        profileur = db.activer_instrumentation()
+        db.livres_par_auteur(2)
+        profileur.rapport()
+        db.conseiller_index(appliquer=True)
+    """
+    
+    def __init__(self, taille_journal=1000, seuil_lent_ms=50.0, verbeux=False):
+        self.seuil_lent_ms = seuil_lent_ms
+        self.verbeux = verbeux
+        self.journal = deque(maxlen=taille_journal)
+        self.requetes = {}
+        self._verrou = threading.Lock()
+    
+    @staticmethod
+    def normaliser(sql):
+        return " ".join(sql.split())
+    
+    @staticmethod
+    def tables_parcourues(plan):
+        """Tables lues en entier d'après les lignes d'un EXPLAIN QUERY PLAN"""
+        return sorted({
+            m.group(1) for detail in plan
+            if (m := re.match(r"SCAN (\w+)", detail))
+            and "USING" not in detail and "VIRTUAL TABLE" not in detail
+            and not detail.startswith("SCAN CONSTANT ROW")
+        })
+    
+    def enregistrer(self, conn, sql, params, duree):
+        """Enregistre une exécution ; le plan est calculé à la première"""
+        cle = self.normaliser(sql)
+        with self._verrou:
+            stats = self.requetes.get(cle)
+        if stats is None:
+            plan = [ligne[3] for ligne in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+            stats = {"nb": 0, "total": 0.0, "max": 0.0, "plan": plan,
+                     "scans": self.tables_parcourues(plan)}
+            with self._verrou:
+                stats = self.requetes.setdefault(cle, stats)
+        with self._verrou:
+            stats["nb"] += 1
+            stats["total"] += duree
+            stats["max"] = max(stats["max"], duree)
+            self.journal.append((time.time(), duree, cle, stats["scans"]))
+        if self.verbeux:
+            alerte = f" [SCAN {', '.join(stats['scans'])}]" if stats["scans"] else ""
+            print(f"[{1000 * duree:8.3f} ms]{alerte} {cle[:100]}")
+    
+    def scans_complets(self):
+        """Requêtes dont le plan lit au moins une table en entier"""
+        with self._verrou:
+            return {sql: stats["scans"] for sql, stats in self.requetes.items() if stats["scans"]}
+    
+    def invalider_plans(self):
+        """
+        Oublie les plans (à appeler après une création d'index). Les plans
+        suivants sont exacts si l'index a été créé par le pool, qui recycle
+        alors ses connexions de lecture ; sinon, appeler pool.recycler().
+        """
+        with self._verrou:
+            self.requetes.clear()
+    
+    def rapport(self, n=10):
+        """Affiche les n requêtes les plus coûteuses avec leur plan"""
+        with self._verrou:
+            classees = sorted(self.requetes.items(), key=lambda e: e[1]["total"], reverse=True)
+        print(f"\n{'total ms':>10} {'moy ms':>8} {'max ms':>8} {'nb':>6}  requête")
+        for sql, stats in classees[:n]:
+            lent = " LENTE" if 1000 * stats["max"] > self.seuil_lent_ms else ""
+            print(f"{1000 * stats['total']:10.2f} {1000 * stats['total'] / stats['nb']:8.3f} "
+                  f"{1000 * stats['max']:8.3f} {stats['nb']:6}  {sql[:90]}{lent}")
+            for detail in stats["plan"]:
+                marque = "  <- parcours complet" if self.tables_parcourues([detail]) else ""
+                print(f"{'':36}{detail}{marque}")
+        return classees[:n]
+
+
+class CacheRequetes:
+    """
+    Cache LRU des résultats de lecture de BibliothequeDB.
+    
+    Clé : SQL normalisé + paramètres. Chaque résultat est rattaché aux
+    tables lues par la requête (FROM / JOIN) :
+    - invalider(tables) retire les résultats qui lisent une table
+      modifiée ; branché sur pool.apres_commit, il reçoit les tables de
+      chaque transaction commitée par le pool ;
+    - verifier_version(v) vide tout le cache quand PRAGMA data_version a
+      changé, c'est-à-dire quand une autre connexion (autre processus,
+      self.conn, outil externe) a écrit dans la base ;
+    - un résultat calculé pendant une invalidation n'est pas stocké
+      (compteur de génération), pour ne jamais garder un état périmé ;
+    - une lecture dans une transaction ne passe pas par le cache : elle
+      est comptée dans contournements (et dans le taux de hits).
+    
+    Les requêtes mises en cache doivent être déterministes (pas de
+    date('now') ni random()).
+    """
+    
+    def __init__(self, taille_max=1024):
+        self.taille_max = taille_max
+        self._resultats = OrderedDict()  # clé -> (lignes, tables)
+        self._par_table = {}             # table -> clés qui la lisent
+        self._generation = 0
+        self._version = None
+        self._verrou = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.contournements = 0  # lectures passées à côté du cache
+        self.invalidations = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def cle(sql, params):
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        return ProfileurRequetes.normaliser(sql), tuple(params)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def tables_de(sql):
+        """Tables lues par une requête (en minuscules)"""
+        return frozenset(t.lower() for t in re.findall(r"\b(?:FROM|JOIN)\s+(\w+)", sql, re.IGNORECASE))
+    
+    def verifier_version(self, version):
+        with self._verrou:
+            if version != self._version:
+                if self._version is not None:
+                    self._vider()
+                self._version = version
+    
+    def contourner(self):
+        """Compte une lecture faite sans le cache (dans une transaction)"""
+        with self._verrou:
+            self.contournements += 1
+    
+    def lire(self, cle):
+        """(lignes, génération) ; lignes vaut None si absent du cache"""
+        with self._verrou:
+            entree = self._resultats.get(cle)
+            if entree is None:
+                self.misses += 1
+                return None, self._generation
+            self._resultats.move_to_end(cle)
+            self.hits += 1
+            return list(entree[0]), self._generation
+    
+    def stocker(self, cle, lignes, generation):
+        tables = self.tables_de(cle[0])
+        with self._verrou:
+            if generation != self._generation:
+                return
+            self._resultats[cle] = (lignes, tables)
+            self._resultats.move_to_end(cle)
+            for table in tables:
+                self._par_table.setdefault(table, set()).add(cle)
+            while len(self._resultats) > self.taille_max:
+                ancienne, (_, tables) = self._resultats.popitem(last=False)
+                self._oublier(ancienne, tables)
+                self.evictions += 1
+    
+    def _oublier(self, cle, tables):
+        for table in tables:
+            cles = self._par_table.get(table)
+            if cles is not None:
+                cles.discard(cle)
+                if not cles:
+                    del self._par_table[table]
+    
+    def invalider(self, tables):
+        """Retire les résultats qui lisent l'une des tables ("*" : toutes)"""
+        with self._verrou:
+            self._generation += 1
+            if "*" in tables:
+                self._vider()
+                return
+            for table in tables:
+                for cle in self._par_table.pop(table.lower(), ()):
+                    entree = self._resultats.pop(cle, None)
+                    if entree is not None:
+                        self._oublier(cle, entree[1])
+                        self.invalidations += 1
+    
+    def _vider(self):
+        self._generation += 1
+        self.invalidations += len(self._resultats)
+        self._resultats.clear()
+        self._par_table.clear()
+    
+    def vider(self):
+        with self._verrou:
+            self._vider()
+    
+    def statistiques(self):
+        with self._verrou:
+            total = self.hits + self.misses + self.contournements
+            return {
+                "entrees": len(self._resultats),
+                "hits": self.hits,
+                "misses": self.misses,
+                "contournements": self.contournements,
+                "taux_hits": self.hits / total if total else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
 class BibliothequeDB:
-    """Classe pour gérer la base de données de la bibliothèque"""
+    """
+    Classe pour gérer la base de données de la bibliothèque
+    
+    self.conn / self.cursor restent disponibles pour un usage simple en
+    un seul thread. Les méthodes de requête passent par le pool
+    (connexion() / transaction()) et peuvent être appelées depuis
+    plusieurs threads sur la même instance.
+    """
     
-    def __init__(self, db_name='bibliotheque.db'):
+    def __init__(self, db_name='bibliotheque.db', taille_pool=4):
         """Initialise la connexion à la base de données"""
         self.db_name = db_name
+        self.taille_pool = taille_pool
+        self.pool = None
+        self.profileur = None
+        self.cache = None
         self.conn = None
         self.cursor = None
     
     def connecter(self):
         """Établit la connexion à la base de données"""
-        self.conn = sqlite3.connect(self.db_name)
+        self.pool = PoolConnexions(self.db_name, self.taille_pool)
+        self.conn = self.pool.ouvrir_connexion(autocommit=False)
         self.cursor = self.conn.cursor()
-        self.cursor.execute("PRAGMA foreign_keys = ON")
     
     def deconnecter(self):
         """Ferme la connexion"""
         if self.conn:
             self.conn.close()
+        if self.pool:
+            self.pool.fermer()
     
-    def creer_tables(self):
-        """Crée les tables de la bibliothèque"""
-        # Table auteurs
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS auteurs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nom TEXT NOT NULL,
-                prenom TEXT NOT NULL,
-                date_naissance TEXT,
-                nationalite TEXT
-            )
-        ''')
-        
-        # Table livres
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS livres (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                titre TEXT NOT NULL,
-                auteur_id INTEGER,
-                annee_publication INTEGER,
-                isbn TEXT UNIQUE,
-                genre TEXT,
-                FOREIGN KEY (auteur_id) REFERENCES auteurs(id)
-            )
-        ''')
-        
-        # Table emprunts
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS emprunts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                livre_id INTEGER,
-                emprunteur TEXT NOT NULL,
-                date_emprunt TEXT NOT NULL,
-                date_retour TEXT,
-                statut TEXT DEFAULT 'en_cours',
-                FOREIGN KEY (livre_id) REFERENCES livres(id)
-            )
-        ''')
+    def connexion(self):
+        """Context manager : connexion du pool pour des lectures"""
+        return self.pool.connexion()
+    
+    def transaction(self):
+        """Context manager : transaction d'écriture sérialisée"""
+        return self.pool.transaction()
+    
+    def _lire(self, sql, params=()):
+        """Exécute une requête de lecture et retourne toutes ses lignes"""
+        cache = self.cache
+        if cache is None:
+            return self._executer(sql, params)
+        # Dans une transaction, on peut lire des écritures non commitées
+        if self.pool.en_transaction():
+            cache.contourner()
+            return self._executer(sql, params)
+        cache.verifier_version(self.pool.version_donnees())
+        cle = cache.cle(sql, params)
+        lignes, generation = cache.lire(cle)
+        if lignes is not None:
+            return lignes
+        lignes = self._executer(sql, params)
+        cache.stocker(cle, lignes, generation)
+        return list(lignes)
+    
+    def iterer(self, sql, params=(), taille_lot=1000, fabrique=None):
+        """
+        Générateur sur les lignes d'une requête, lues par lots (fetchmany).
         
-        self.conn.commit()
-        print("Tables créées avec succès !")
+        Au plus taille_lot lignes en mémoire à la fois. Les lignes sont des
+        tuples nommés (classe_ligne) ; fabrique les remplace par une
+        row_factory sqlite3 (sqlite3.Row par exemple). La connexion du
+        pool reste empruntée par le thread jusqu'à la fin du parcours ou
+        au close() du générateur : à consommer dans le thread qui l'a créé.
+        Ne passe pas par le cache des résultats.
+        """
+        with self.connexion() as conn:
+            curseur = conn.cursor()
+            try:
+                if fabrique is not None:
+                    curseur.row_factory = fabrique
+                curseur.execute(sql, params)
+                if fabrique is None:
+                    ligne_nommee = classe_ligne(tuple(c[0] for c in curseur.description))._make
+                while lot := curseur.fetchmany(taille_lot):
+                    if fabrique is None:
+                        yield from map(ligne_nommee, lot)
+                    else:
+                        yield from lot
+            finally:
+                curseur.close()
     
-    def inserer_donnees_exemple(self):
-        """Insère des données d'exemple"""
-        # Insérer des auteurs
-        auteurs = [
-            ('Hugo', 'Victor', '1802-02-26', 'Française'),
-            ('Camus', 'Albert', '1913-11-07', 'Française'),
-            ('Rowling', 'J.K.', '1965-07-31', 'Britannique'),
-            ('Orwell', 'George', '1903-06-25', 'Britannique'),
-            ('Saint-Exupéry', 'Antoine de', '1900-06-29', 'Française'),
-            ('Dumas', 'Alexandre', '1802-07-24', 'Française'),
-            ('Zola', 'Émile', '1840-04-02', 'Française')
-        ]
+    def _executer(self, sql, params):
+        with self.connexion() as conn:
+            if self.profileur is None:
+                return conn.execute(sql, params).fetchall()
+            debut = time.perf_counter()
+            lignes = conn.execute(sql, params).fetchall()
+            self.profileur.enregistrer(conn, sql, params, time.perf_counter() - debut)
+            return lignes
+    
+    # ============= CACHE DES RÉSULTATS =============
+    
+    def activer_cache(self, taille_max=1024):
+        """
+        Met en cache les résultats de _lire (voir CacheRequetes).
         
-        self.cursor.executemany('''
-            INSERT INTO auteurs (nom, prenom, date_naissance, nationalite)
-            VALUES (?, ?, ?, ?)
-        ''', auteurs)
-        
-        # Insérer des livres
-        livres = [
-            ('Les Misérables', 1, 1862, '978-2-253-09633-4', 'Roman'),
-            ('Notre-Dame de Paris', 1, 1831, '978-2-253-00699-0', 'Roman'),
-            ('L\'Étranger', 2, 1942, '978-2-07-036002-4', 'Roman'),
-            ('La Peste', 2, 1947, '978-2-07-036001-7', 'Roman'),
-            ('Harry Potter à l\'école des sorciers', 3, 1997, '978-2-07-054120-0', 'Fantasy'),
-            ('Harry Potter et la Chambre des secrets', 3, 1998, '978-2-07-054121-7', 'Fantasy'),
-            ('1984', 4, 1949, '978-0-452-28423-4', 'Dystopie'),
-            ('La Ferme des animaux', 4, 1945, '978-2-07-037516-5', 'Fable'),
-            ('Le Petit Prince', 5, 1943, '978-2-07-061275-8', 'Conte'),
-            ('Vol de nuit', 5, 1931, '978-2-07-036088-8', 'Roman'),
-            ('Les Trois Mousquetaires', 6, 1844, '978-2-253-00811-6', 'Aventure'),
-            ('Le Comte de Monte-Cristo', 6, 1844, '978-2-253-09811-6', 'Aventure'),
-            ('Germinal', 7, 1885, '978-2-253-00429-3', 'Roman'),
-            ('L\'Assommoir', 7, 1877, '978-2-253-00428-6', 'Roman')
-        ]
+        Les transactions du pool invalident les tables qu'elles modifient ;
+        toute autre écriture (self.conn, autre processus) vide le cache à
+        la lecture suivante.
+        """
+        self.desactiver_cache()
+        self.cache = CacheRequetes(taille_max)
+        self.pool.apres_commit.append(self.cache.invalider)
+        return self.cache
+    
+    def desactiver_cache(self):
+        if self.cache is not None:
+            self.pool.apres_commit.remove(self.cache.invalider)
+            self.cache = None
+    
+    # ============= INSTRUMENTATION ET INDEX =============
+    
+    def activer_instrumentation(self, **options):
+        """Active le ProfileurRequetes (options : voir son constructeur)"""
+        self.profileur = ProfileurRequetes(**options)
+        return self.profileur
+    
+    def desactiver_instrumentation(self):
+        self.profileur = None
+    
+    def _schema(self, conn):
+        """{table: (colonnes, clé rowid, index existants)} des tables ordinaires"""
+        schema = {}
+        for (table,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%' AND sql NOT LIKE 'CREATE VIRTUAL%'"
+        ).fetchall():
+            if table.startswith("livres_fts"):  # tables internes de FTS5
+                continue
+            infos = conn.execute(f"PRAGMA table_info({table})").fetchall()
+            colonnes = [info[1] for info in infos]
+            rowid = {info[1] for info in infos if info[5] == 1 and info[2].upper() == "INTEGER"}
+            index = [
+                tuple(col[2] for col in conn.execute(f"PRAGMA index_info({nom})"))
+                for _, nom, *_ in conn.execute(f"PRAGMA index_list({table})")
+            ]
+            schema[table] = (colonnes, rowid, index)
+        return schema
+    
+    @staticmethod
+    def _colonnes_filtrees(sql, schema):
+        """
+        Colonnes comparées dans une requête, par table. Retourne
+        ({alias ou nom: table}, {table: ([colonnes d'égalité],
+        [colonnes d'intervalle], {colonnes citées}, étoile,
+        {colonnes de jointure})})
+        """
+        sql = re.sub(r"'[^']*'", "?", sql)  # les littéraux ne sont pas des colonnes
+        alias = {}
+        for table, nom in re.findall(r"(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", sql, re.I):
+            if table in schema:
+                alias[table] = table
+                if nom and nom.upper() not in {"JOIN", "WHERE", "ON", "LEFT", "INNER", "CROSS",
+                                                "GROUP", "ORDER", "LIMIT", "USING", "NATURAL"}:
+                    alias[nom] = table
+        tables = set(alias.values())
+        
+        def resoudre(prefixe, colonne):
+            if prefixe:
+                table = alias.get(prefixe)
+                return table if table and colonne in schema[table][0] else None
+            candidates = [t for t in tables if colonne in schema[t][0]]
+            return candidates[0] if len(candidates) == 1 else None
+        
+        resultat = {t: ([], [], set(), False, set()) for t in tables}
+        operande = r"(?:(\w+)\.)?(\w+)"
+        operateur = r"(<>|!=|<=|>=|==|=|<|>|\bIN\b|\bIS\b|\bBETWEEN\b)"
+        comparaisons = [(m.group(1), m.group(2), m.group(3).upper())
+                        for m in re.finditer(operande + r"\s*" + operateur, sql, re.I)]
+        comparaisons += [(m.group(2), m.group(3), m.group(1).upper())
+                         for m in re.finditer(r"(<=|>=|==|=|<|>)\s*" + operande, sql)]
+        for prefixe, colonne, op in comparaisons:
+            table = resoudre(prefixe, colonne)
+            if table is None or op in ("<>", "!="):
+                continue
+            egalites, intervalles = resultat[table][0], resultat[table][1]
+            cible = egalites if op in ("=", "==", "IN", "IS") else intervalles
+            if colonne not in cible:
+                cible.append(colonne)
+        for prefixe, colonne in re.findall(operande, sql):
+            table = resoudre(prefixe, colonne)
+            if table:
+                resultat[table][2].add(colonne)
+        for jointure in re.finditer(r"(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)", sql):
+            for prefixe, colonne in (jointure.group(1, 2), jointure.group(3, 4)):
+                table = resoudre(prefixe, colonne)
+                if table:
+                    resultat[table][4].add(colonne)
+        for table in tables:
+            noms = [n for n, t in alias.items() if t == table]
+            etoile = bool(re.search(r"SELECT\s+\*", sql, re.I)) or any(f"{n}.*" in sql for n in noms)
+            resultat[table] = resultat[table][:3] + (etoile,) + resultat[table][4:]
+        return alias, resultat
+    
+    def conseiller_index(self, appliquer=False, colonnes_max=4):
+        """
+        Propose les index manquants, et les crée si appliquer=True.
+        
+        Deux sources :
+        - les clés étrangères sans index (jointures, vérifications des
+          suppressions) : emprunts.livre_id, livres.auteur_id ;
+        - les requêtes instrumentées dont le plan parcourt une table en
+          entier : colonnes d'égalité puis une colonne d'intervalle, puis
+          les autres colonnes lues par la requête pour que l'index soit
+          couvrant (sauf SELECT * ou simple jointure, dans la limite de
+          colonnes_max).
         
-        self.cursor.executemany('''
-            INSERT INTO livres (titre, auteur_id, annee_publication, isbn, genre)
-            VALUES (?, ?, ?, ?, ?)
-        ''', livres)
-        
-        # Insérer des emprunts
-        emprunts = [
-            (1, 'Alice Dupont', '2024-11-01', '2024-11-15', 'retourné'),
-            (3, 'Bob Martin', '2024-11-10', None, 'en_cours'),
-            (5, 'Charlie Bernard', '2024-11-15', None, 'en_cours'),
-            (7, 'Diana Laurent', '2024-11-05', '2024-11-20', 'retourné'),
-            (9, 'Emma Petit', '2024-11-20', None, 'en_cours'),
-            (2, 'Frank Dubois', '2024-10-15', '2024-11-01', 'retourné'),
-            (11, 'Grace Moreau', '2024-11-18', None, 'en_cours')
+        Retourne la liste des CREATE INDEX proposés.
+        """
+        with self.connexion() as conn:
+            schema = self._schema(conn)
+        propositions = []
+        
+        def proposer(table, colonnes):
+            _, rowid, existants = schema[table]
+            cles = tuple(c for c in colonnes if c not in rowid)
+            if not cles:
+                return
+            if any(index[:len(cles)] == cles for index in existants):
+                return
+            for i, (t, autres) in enumerate(propositions):
+                if t == table and autres[:len(cles)] == cles:
+                    return
+                if t == table and cles[:len(autres)] == autres:
+                    propositions[i] = (table, cles)
+                    return
+            propositions.append((table, cles))
+        
+        with self.connexion() as conn:
+            for table in schema:
+                for cle in conn.execute(f"PRAGMA foreign_key_list({table})").fetchall():
+                    proposer(table, (cle[3],))
+        
+        scans = self.profileur.scans_complets() if self.profileur else {}
+        for sql, tables in scans.items():
+            alias, filtres = self._colonnes_filtrees(sql, schema)
+            for nom in tables:
+                table = alias.get(nom)  # le plan nomme les tables par leur alias
+                if table is None:
+                    continue
+                egalites, intervalles, citees, etoile, jointures = filtres[table]
+                cles = egalites + intervalles[:1]
+                if not cles:
+                    continue
+                # Table parcourue par une jointure sans autre filtre : l'index
+                # sur la colonne de jointure suffit (SQLite choisit l'ordre)
+                if not etoile and not set(cles) <= jointures:
+                    reste = sorted(citees - set(cles) - schema[table][1])
+                    if len(cles) + len(reste) <= colonnes_max:
+                        cles += reste
+                proposer(table, cles)
+        
+        requetes = [
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(cles)} ON {table} ({', '.join(cles)})"
+            for table, cles in propositions
         ]
+        if appliquer and requetes:
+            with self.transaction() as conn:
+                for requete in requetes:
+                    conn.execute(requete)
+            if self.profileur:
+                self.profileur.invalider_plans()
+        return requetes
+    
+    def creer_tables(self, plein_texte=True):
+        """Crée les tables de la bibliothèque (et l'index plein texte)"""
+        with self.transaction() as conn:
+            # Table auteurs
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS auteurs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nom TEXT NOT NULL,
+                    prenom TEXT NOT NULL,
+                    date_naissance TEXT,
+                    nationalite TEXT
+                )
+            ''')
+            
+            # Table livres
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS livres (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    titre TEXT NOT NULL,
+                    auteur_id INTEGER,
+                    annee_publication INTEGER,
+                    isbn TEXT UNIQUE,
+                    genre TEXT,
+                    FOREIGN KEY (auteur_id) REFERENCES auteurs(id)
+                )
+            ''')
+            
+            # Table emprunts
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS emprunts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    livre_id INTEGER,
+                    emprunteur TEXT NOT NULL,
+                    date_emprunt TEXT NOT NULL,
+                    date_retour TEXT,
+                    statut TEXT DEFAULT 'en_cours',
+                    FOREIGN KEY (livre_id) REFERENCES livres(id)
+                )
+            ''')
+            
+        if plein_texte:
+            self.creer_index_plein_texte()
+        print("Tables créées avec succès !")
+    
+    def creer_index_plein_texte(self):
+        """
+        Crée l'index plein texte livres_fts (FTS5) sur titre + auteur.
         
-        self.cursor.executemany('''
-            INSERT INTO emprunts (livre_id, emprunteur, date_emprunt, date_retour, statut)
-            VALUES (?, ?, ?, ?, ?)
-        ''', emprunts)
+        - tokenizer unicode61 remove_diacritics 2 : "Étranger", "etranger"
+          et "ÉTRANGER" donnent le même terme ;
+        - prefix='2 3' : index des préfixes pour les recherches "pot*" ;
+        - rowid = livres.id ; des triggers sur livres et auteurs tiennent
+          l'index à jour, il est rempli à la création si livres n'est pas
+          vide.
         
-        self.conn.commit()
+        Le trigger coûte cher à l'insertion (FTS5 vide son tampon à chaque
+        instruction déclenchée) : pour un import massif, créer les tables
+        avec creer_tables(plein_texte=False) et appeler cette méthode
+        après le chargement, qui remplit l'index en une seule requête.
+        """
+        auteur = "(SELECT prenom || ' ' || nom FROM auteurs WHERE id = new.auteur_id)"
+        with self.transaction() as conn:
+            existe = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'livres_fts'"
+            ).fetchone()
+            conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS livres_fts USING fts5(
+                    titre, auteur,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
+                )
+            ''')
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS livres_fts_insert AFTER INSERT ON livres
+                BEGIN
+                    INSERT INTO livres_fts (rowid, titre, auteur)
+                    VALUES (new.id, new.titre, {auteur});
+                END
+            ''')
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS livres_fts_delete AFTER DELETE ON livres
+                BEGIN
+                    DELETE FROM livres_fts WHERE rowid = old.id;
+                END
+            ''')
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS livres_fts_update
+                AFTER UPDATE OF id, titre, auteur_id ON livres
+                BEGIN
+                    DELETE FROM livres_fts WHERE rowid = old.id;
+                    INSERT INTO livres_fts (rowid, titre, auteur)
+                    VALUES (new.id, new.titre, {auteur});
+                END
+            ''')
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS livres_fts_auteur
+                AFTER UPDATE OF nom, prenom ON auteurs
+                BEGIN
+                    UPDATE livres_fts SET auteur = new.prenom || ' ' || new.nom
+                    WHERE rowid IN (SELECT id FROM livres WHERE auteur_id = new.id);
+                END
+            ''')
+            if not existe:
+                conn.execute('''
+                    INSERT INTO livres_fts (rowid, titre, auteur)
+                    SELECT livres.id, livres.titre, auteurs.prenom || ' ' || auteurs.nom
+                    FROM livres LEFT JOIN auteurs ON livres.auteur_id = auteurs.id
+                ''')
+    
+    def inserer_donnees_exemple(self):
+        """Insère des données d'exemple"""
+        with self.transaction() as conn:
+            # Insérer des auteurs
+            auteurs = [
+                ('Hugo', 'Victor', '1802-02-26', 'Française'),
+                ('Camus', 'Albert', '1913-11-07', 'Française'),
+                ('Rowling', 'J.K.', '1965-07-31', 'Britannique'),
+                ('Orwell', 'George', '1903-06-25', 'Britannique'),
+                ('Saint-Exupéry', 'Antoine de', '1900-06-29', 'Française'),
+                ('Dumas', 'Alexandre', '1802-07-24', 'Française'),
+                ('Zola', 'Émile', '1840-04-02', 'Française')
+            ]
+            
+            conn.executemany('''
+                INSERT INTO auteurs (nom, prenom, date_naissance, nationalite)
+                VALUES (?, ?, ?, ?)
+            ''', auteurs)
+            
+            # Insérer des livres
+            livres = [
+                ('Les Misérables', 1, 1862, '978-2-253-09633-4', 'Roman'),
+                ('Notre-Dame de Paris', 1, 1831, '978-2-253-00699-0', 'Roman'),
+                ('L\'Étranger', 2, 1942, '978-2-07-036002-4', 'Roman'),
+                ('La Peste', 2, 1947, '978-2-07-036001-7', 'Roman'),
+                ('Harry Potter à l\'école des sorciers', 3, 1997, '978-2-07-054120-0', 'Fantasy'),
+                ('Harry Potter et la Chambre des secrets', 3, 1998, '978-2-07-054121-7', 'Fantasy'),
+                ('1984', 4, 1949, '978-0-452-28423-4', 'Dystopie'),
+                ('La Ferme des animaux', 4, 1945, '978-2-07-037516-5', 'Fable'),
+                ('Le Petit Prince', 5, 1943, '978-2-07-061275-8', 'Conte'),
+                ('Vol de nuit', 5, 1931, '978-2-07-036088-8', 'Roman'),
+                ('Les Trois Mousquetaires', 6, 1844, '978-2-253-00811-6', 'Aventure'),
+                ('Le Comte de Monte-Cristo', 6, 1844, '978-2-253-09811-6', 'Aventure'),
+                ('Germinal', 7, 1885, '978-2-253-00429-3', 'Roman'),
+                ('L\'Assommoir', 7, 1877, '978-2-253-00428-6', 'Roman')
+            ]
+            
+            conn.executemany('''
+                INSERT INTO livres (titre, auteur_id, annee_publication, isbn, genre)
+                VALUES (?, ?, ?, ?, ?)
+            ''', livres)
+            
+            # Insérer des emprunts
+            emprunts = [
+                (1, 'Alice Dupont', '2024-11-01', '2024-11-15', 'retourné'),
+                (3, 'Bob Martin', '2024-11-10', None, 'en_cours'),
+                (5, 'Charlie Bernard', '2024-11-15', None, 'en_cours'),
+                (7, 'Diana Laurent', '2024-11-05', '2024-11-20', 'retourné'),
+                (9, 'Emma Petit', '2024-11-20', None, 'en_cours'),
+                (2, 'Frank Dubois', '2024-10-15', '2024-11-01', 'retourné'),
+                (11, 'Grace Moreau', '2024-11-18', None, 'en_cours')
+            ]
+            
+            conn.executemany('''
+                INSERT INTO emprunts (livre_id, emprunteur, date_emprunt, date_retour, statut)
+                VALUES (?, ?, ?, ?, ?)
+            ''', emprunts)
+            
         print("Données d'exemple insérées avec succès !")
         print(f"- {len(auteurs)} auteurs")
         print(f"- {len(livres)} livres")
         print(f"- {len(emprunts)} emprunts")
     
+    def charger_en_masse(self, table, lignes, colonnes=None, taille_lot=50_000):
+        """
+        Import massif dans `table` depuis un fichier CSV ou un itérable.
+        
+        - lignes : chemin d'un CSV (avec en-tête), ou itérable de tuples
+          ou de dictionnaires, lu en flux : la mémoire ne dépend que de
+          taille_lot ;
+        - colonnes : colonnes à remplir (par défaut l'en-tête du CSV, les
+          clés du premier dictionnaire ou les colonnes de la table hors
+          clé primaire auto-incrémentée, comme dans inserer_donnees_exemple).
+        
+        Pendant le chargement :
+        - une transaction par lot de taille_lot lignes ;
+        - PRAGMA synchronous = OFF et journal_mode = MEMORY : une coupure
+          de courant en plein import peut corrompre la base, à réserver
+          aux imports que l'on peut rejouer. Le passage de WAL à MEMORY
+          exige d'être seul sur la base : s'il est refusé on reste en
+          WAL (stats["journal_mode"]), où synchronous = OFF apporte déjà
+          l'essentiel ;
+        - les index de la table sont supprimés puis recréés à la fin (un
+          tri global au lieu d'une insertion par ligne), de même pour
+          l'index plein texte de livres. Un index qui ne peut être recréé
+          (UNIQUE violé par les lignes chargées) est signalé : par une
+          exception si le chargement a réussi, sinon en note de l'erreur
+          du chargement, qui reste celle qui remonte.
+        
+        Retourne les statistiques : lignes, durées, lignes par seconde.
+        """
+        fichier = None
+        if isinstance(lignes, (str, os.PathLike)):
+            fichier = open(lignes, newline="", encoding="utf-8")
+            lecteur = csv.reader(fichier)
+            entete = next(lecteur, [])
+            if colonnes is None:
+                colonnes = entete
+            else:
+                positions = [entete.index(c) for c in colonnes]
+                lecteur = ([ligne[i] for i in positions] for ligne in lecteur)
+            # Dans un CSV, un champ vide est une valeur absente
+            lignes = ([valeur if valeur != "" else None for valeur in ligne] for ligne in lecteur)
+        
+        lignes = iter(lignes)
+        premiere = next(lignes, None)
+        if isinstance(premiere, dict):
+            colonnes = colonnes or list(premiere)
+            lignes = ([ligne.get(c) for c in colonnes] for ligne in itertools.chain([premiere], lignes))
+        elif premiere is not None:
+            lignes = itertools.chain([premiere], lignes)
+        
+        stats = {"table": table, "lignes": 0}
+        try:
+            with self.pool.ecriture() as conn:
+                if colonnes is None:
+                    colonnes = [info[1] for info in conn.execute(f"PRAGMA table_info({table})")
+                                if not (info[5] == 1 and info[2].upper() == "INTEGER")]
+                requete = (f"INSERT INTO {table} ({', '.join(colonnes)}) "
+                           f"VALUES ({', '.join('?' * len(colonnes))})")
+                
+                synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+                journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+                index = conn.execute(
+                    "SELECT name, sql FROM sqlite_master "
+                    "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+                ).fetchall()
+                plein_texte = table == "livres" and conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'livres_fts_insert'"
+                ).fetchone() is not None
+                dernier_id = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+                
+                conn.execute("PRAGMA synchronous = OFF")
+                try:
+                    stats["journal_mode"] = conn.execute("PRAGMA journal_mode = MEMORY").fetchone()[0]
+                except sqlite3.OperationalError:
+                    # Sortie du mode WAL refusée : d'autres connexions sont ouvertes
+                    stats["journal_mode"] = journal
+                for nom, _ in index:
+                    conn.execute(f"DROP INDEX {nom}")
+                if plein_texte:
+                    conn.execute("DROP TRIGGER livres_fts_insert")
+                
+                erreur = None
+                try:
+                    debut = time.perf_counter()
+                    while True:
+                        lot = list(itertools.islice(lignes, taille_lot))
+                        if not lot:
+                            break
+                        with self.transaction():
+                            conn.executemany(requete, lot)
+                        stats["lignes"] += len(lot)
+                    stats["duree_chargement"] = time.perf_counter() - debut
+                except BaseException as e:
+                    erreur = e
+                    raise
+                finally:
+                    # Index et index plein texte reconstruits même après une
+                    # erreur, pragmas restaurés même si une reconstruction échoue
+                    try:
+                        debut = time.perf_counter()
+                        echecs = self._reconstruire_index(conn, index, plein_texte, dernier_id)
+                        stats["duree_index"] = time.perf_counter() - debut
+                    finally:
+                        try:
+                            conn.execute(f"PRAGMA journal_mode = {journal}")
+                        finally:
+                            conn.execute(f"PRAGMA synchronous = {synchronous}")
+                    if echecs:
+                        message = "Index non reconstruits après le chargement : " + ", ".join(
+                            f"{nom} ({cause})" for nom, cause in echecs)
+                        if erreur is None:
+                            raise type(echecs[0][1])(message) from echecs[0][1]
+                        # L'erreur du chargement reste celle qui remonte
+                        print(message)
+                        erreur.add_note(message)
+        finally:
+            if fichier:
+                fichier.close()
+        
+        duree = stats["duree_chargement"] + stats["duree_index"]
+        stats["lignes_par_seconde"] = stats["lignes"] / duree if duree else 0.0
+        print(f"{stats['lignes']} lignes chargées dans {table} en {duree:.2f}s "
+              f"({stats['lignes_par_seconde']:,.0f} lignes/s, dont index {stats['duree_index']:.2f}s)")
+        return stats
+    
+    def _reconstruire_index(self, conn, index, plein_texte, dernier_id):
+        """
+        Recrée les index supprimés par charger_en_masse, chacun dans sa
+        transaction : un index UNIQUE que les lignes chargées violent ne
+        fait pas perdre les autres. Retourne les échecs [(nom, erreur)].
+        """
+        echecs = []
+        for nom, sql in index:
+            try:
+                with self.transaction():
+                    conn.execute(sql)
+            except sqlite3.Error as erreur:
+                echecs.append((nom, erreur))
+        if plein_texte:
+            try:
+                with self.transaction():
+                    conn.execute('''
+                        INSERT INTO livres_fts (rowid, titre, auteur)
+                        SELECT livres.id, livres.titre, auteurs.prenom || ' ' || auteurs.nom
+                        FROM livres LEFT JOIN auteurs ON livres.auteur_id = auteurs.id
+                        WHERE livres.id > ?
+                    ''', (dernier_id,))
+                self.creer_index_plein_texte()
+            except sqlite3.Error as erreur:
+                echecs.append(("livres_fts", erreur))
+        return echecs
+    
     # Exercice 8 : Requêtes SELECT
+    REQUETE_LIVRES = 'SELECT * FROM livres'
+    
+    REQUETE_LIVRES_PAR_AUTEUR = '''
+        SELECT * FROM livres
+        WHERE auteur_id = ?
+    '''
+    
+    REQUETE_LIVRES_APRES_ANNEE = '''
+        SELECT * FROM livres
+        WHERE annee_publication > ?
+    '''
+    
+    REQUETE_EMPRUNTS_EN_COURS = '''
+        SELECT * FROM emprunts
+        WHERE statut = ?
+    '''
+    
     def afficher_tous_livres(self):
         """Affiche tous les livres"""
-        # TODO : Sélectionnez tous les livres
-        # Template :
-        # self.cursor.execute('SELECT * FROM livres')
-        # livres = self.cursor.fetchall()
-        # 
-        # for livre in livres:
-        #     print(f"[{livre[0]}] {livre[1]} - Année: {livre[3]}")
-        # 
-        # return livres
-        pass
+        livres = self._lire(self.REQUETE_LIVRES)
+        
+        for livre in livres:
+            print(f"[{livre[0]}] {livre[1]} - Année: {livre[3]}")
+        
+        return livres
     
     def livres_par_auteur(self, auteur_id):
         """Affiche les livres d'un auteur"""
-        # TODO : Sélectionnez les livres d'un auteur spécifique
-        # Template :
-        # self.cursor.execute('''
-        #     SELECT * FROM livres
-        #     WHERE auteur_id = ?
-        # ''', (auteur_id,))
-        # livres = self.cursor.fetchall()
-        # 
-        # for livre in livres:
-        #     print(f"  - {livre[1]} ({livre[3]})")
-        # 
-        # return livres
-        pass
+        livres = self._lire(self.REQUETE_LIVRES_PAR_AUTEUR, (auteur_id,))
+        
+        for livre in livres:
+            print(f"  - {livre[1]} ({livre[3]})")
+        
+        return livres
     
     def livres_apres_annee(self, annee):
         """Livres publiés après une année"""
-        # TODO : Sélectionnez les livres publiés après une année donnée
-        # Template :
-        # self.cursor.execute('''
-        #     SELECT * FROM livres
-        #     WHERE annee_publication > ?
-        # ''', (annee,))
-        # livres = self.cursor.fetchall()
-        # 
-        # for livre in livres:
-        #     print(f"  - {livre[1]} ({livre[3]})")
-        # 
-        # return livres
-        pass
+        livres = self._lire(self.REQUETE_LIVRES_APRES_ANNEE, (annee,))
+        
+        for livre in livres:
+            print(f"  - {livre[1]} ({livre[3]})")
+        
+        return livres
     
     def emprunts_en_cours(self):
         """Emprunts actuellement en cours"""
-        # TODO : Sélectionnez les emprunts avec statut = 'en_cours'
-        # Template :
-        # self.cursor.execute('''
-        #     SELECT * FROM emprunts
-        #     WHERE statut = ?
-        # ''', ('en_cours',))
-        # emprunts = self.cursor.fetchall()
-        # 
-        # for emprunt in emprunts:
-        #     print(f"  Livre #{emprunt[1]} emprunté par {emprunt[2]} le {emprunt[3]}")
-        # 
-        # return emprunts
-        pass
+        emprunts = self._lire(self.REQUETE_EMPRUNTS_EN_COURS, ('en_cours',))
+        
+        for emprunt in emprunts:
+            print(f"  Livre #{emprunt[1]} emprunté par {emprunt[2]} le {emprunt[3]}")
+        
+        return emprunts
     
     # Exercice 9 : Jointures
+    REQUETE_LIVRES_AVEC_AUTEURS = '''
+        SELECT livres.titre, auteurs.nom, auteurs.prenom, livres.annee_publication
+        FROM livres
+        JOIN auteurs ON livres.auteur_id = auteurs.id
+    '''
+    
+    REQUETE_EMPRUNTS_AVEC_DETAILS = '''
+        SELECT emprunts.emprunteur, livres.titre, auteurs.nom, auteurs.prenom,
+               emprunts.date_emprunt, emprunts.statut
+        FROM emprunts
+        JOIN livres ON emprunts.livre_id = livres.id
+        JOIN auteurs ON livres.auteur_id = auteurs.id
+    '''
+    
     def livres_avec_auteurs(self):
         """Livres avec nom de l'auteur"""
-        # TODO : Jointure entre livres et auteurs
-        # Template :
-        # self.cursor.execute('''
-        #     SELECT livres.titre, auteurs.nom, auteurs.prenom, livres.annee_publication
-        #     FROM livres
-        #     JOIN auteurs ON livres.auteur_id = auteurs.id
-        # ''')
-        # resultats = self.cursor.fetchall()
-        # 
-        # for livre in resultats:
-        #     print(f"  - {livre[0]} par {livre[1]} {livre[2]} ({livre[3]})")
-        # 
-        # return resultats
-        pass
+        resultats = self._lire(self.REQUETE_LIVRES_AVEC_AUTEURS)
+        
+        for livre in resultats:
+            print(f"  - {livre[0]} par {livre[1]} {livre[2]} ({livre[3]})")
+        
+        return resultats
     
     def emprunts_avec_details(self):
         """Emprunts avec détails du livre et auteur"""
-        # TODO : Jointure entre emprunts, livres et auteurs
-        # Template :
-        # self.cursor.execute('''
-        #     SELECT emprunts.emprunteur, livres.titre, auteurs.nom, auteurs.prenom,
-        #            emprunts.date_emprunt, emprunts.statut
-        #     FROM emprunts
-        #     JOIN livres ON emprunts.livre_id = livres.id
-        #     JOIN auteurs ON livres.auteur_id = auteurs.id
-        # ''')
-        # resultats = self.cursor.fetchall()
-        # 
-        # for emprunt in resultats:
-        #     print(f"  - {emprunt[0]} a emprunté '{emprunt[1]}' de {emprunt[2]} {emprunt[3]} ({emprunt[5]})")
-        # 
-        # return resultats
-        pass
+        resultats = self._lire(self.REQUETE_EMPRUNTS_AVEC_DETAILS)
+        
+        for emprunt in resultats:
+            print(f"  - {emprunt[0]} a emprunté '{emprunt[1]}' de {emprunt[2]} {emprunt[3]} ({emprunt[5]})")
+        
+        return resultats
+    
+    # ============= PARCOURS PAR LOTS =============
+    
+    # Variantes en générateurs des requêtes ci-dessus, pour les résultats
+    # trop gros pour tenir en mémoire (export, traitement de millions
+    # d'emprunts) : voir iterer()
+    
+    def iterer_livres(self, taille_lot=1000, fabrique=None):
+        return self.iterer(self.REQUETE_LIVRES, (), taille_lot, fabrique)
+    
+    def iterer_livres_par_auteur(self, auteur_id, taille_lot=1000, fabrique=None):
+        return self.iterer(self.REQUETE_LIVRES_PAR_AUTEUR, (auteur_id,), taille_lot, fabrique)
+    
+    def iterer_livres_apres_annee(self, annee, taille_lot=1000, fabrique=None):
+        return self.iterer(self.REQUETE_LIVRES_APRES_ANNEE, (annee,), taille_lot, fabrique)
+    
+    def iterer_emprunts(self, taille_lot=1000, fabrique=None):
+        return self.iterer('SELECT * FROM emprunts', (), taille_lot, fabrique)
+    
+    def iterer_emprunts_en_cours(self, taille_lot=1000, fabrique=None):
+        return self.iterer(self.REQUETE_EMPRUNTS_EN_COURS, ('en_cours',), taille_lot, fabrique)
+    
+    def iterer_livres_avec_auteurs(self, taille_lot=1000, fabrique=None):
+        return self.iterer(self.REQUETE_LIVRES_AVEC_AUTEURS, (), taille_lot, fabrique)
+    
+    def iterer_emprunts_avec_details(self, taille_lot=1000, fabrique=None):
+        return self.iterer(self.REQUETE_EMPRUNTS_AVEC_DETAILS, (), taille_lot, fabrique)
+    
+    def iterer_emprunts_par_periode(self, pattern_date, taille_lot=1000, fabrique=None):
+        where, params = filtre_regexp("date_emprunt", pattern_date, ancre=True)
+        return self.iterer('SELECT * FROM emprunts WHERE ' + where, params, taille_lot, fabrique)
+    
+    def exporter_emprunts_csv(self, chemin, taille_lot=10_000):
+        """Exporte les emprunts avec leurs détails en CSV, lot par lot"""
+        nb = 0
+        with open(chemin, "w", newline="", encoding="utf-8") as f:
+            ecrivain = csv.writer(f)
+            lignes = self.iterer_emprunts_avec_details(taille_lot)
+            premiere = next(lignes, None)
+            if premiere is not None:
+                ecrivain.writerow(premiere._fields)
+                ecrivain.writerow(premiere)
+                nb = 1
+            for ligne in lignes:
+                ecrivain.writerow(ligne)
+                nb += 1
+        return nb
     
     # ============= PARTIE 3 : COMBINAISON REGEX ET BASE DE DONNÉES =============
     
     # Exercice 10 : Recherche avancée avec regex
     def rechercher_livres_par_titre(self, pattern):
         """Recherche des livres dont le titre correspond à un pattern regex"""
-        # Pattern fourni pour vous aider
         # Exemple : r'harry.*potter' (insensible à la casse)
+        # Le filtre s'exécute dans SQLite (fonction REGEXP), précédé d'un
+        # LIKE '%harry%potter%' : seuls les livres trouvés sont transférés
+        where, params = filtre_regexp("titre", pattern, ignorer_casse=True)
+        return self._lire(
+            'SELECT id, titre, auteur_id, annee_publication, genre FROM livres '
+            'WHERE ' + where, params
+        )
+    
+    def rechercher_livres_plein_texte(self, texte, limite=20, prefixe=True):
+        """
+        Recherche plein texte dans les titres et auteurs (index livres_fts)
         
-        # ÉTAPE 1 : Récupérer tous les livres
-        self.cursor.execute('SELECT id, titre, auteur_id, annee_publication, genre FROM livres')
-        tous_les_livres = self.cursor.fetchall()
-        
-        # ÉTAPE 2 : Filtrer avec regex
-        # TODO : Utilisez re.search() ou re.match() pour filtrer
-        # Compilez le pattern avec re.IGNORECASE pour ignorer la casse
-        
-        # Exemple de structure :
-        # import re
-        # regex = re.compile(pattern, re.IGNORECASE)
-        # livres_trouves = []
-        # for livre in tous_les_livres:
-        #     if regex.search(livre[1]):  # livre[1] est le titre
-        #         livres_trouves.append(livre)
-        # return livres_trouves
-        
-        pass
+        Chaque mot de `texte` doit apparaître, le dernier pouvant être un
+        début de mot si prefixe (voir requete_fts()) ; casse et accents
+        sont ignorés : 'etranger' trouve "L'Étranger",
+        'harry pot' les Harry Potter. Les livres sont classés par bm25,
+        un mot du titre pesant plus qu'un mot du nom de l'auteur.
+        Retourne les mêmes colonnes que rechercher_livres_par_titre().
+        """
+        requete = requete_fts(texte, prefixe)
+        if not requete:
+            return []
+        return self._lire('''
+            SELECT livres.id, livres.titre, livres.auteur_id,
+                   livres.annee_publication, livres.genre
+            FROM livres_fts
+            JOIN livres ON livres.id = livres_fts.rowid
+            WHERE livres_fts MATCH ?
+            ORDER BY bm25(livres_fts, 10.0, 1.0)
+            LIMIT ?
+        ''', (requete, limite))
     
     def rechercher_auteurs_par_pays(self, pattern_pays):
         """Recherche des auteurs selon un pattern de nationalité"""
-        # Pattern fourni : r'Fran[cç]ais[e]?' pour Français/Française
-        
-        # TODO : Récupérer les auteurs et filtrer par nationalité
-        # self.cursor.execute('SELECT * FROM auteurs')
-        # Appliquez le pattern regex sur la colonne nationalite
-        
-        pass
+        # Exemple : r'Fran[cç]ais[e]?' pour Français/Française
+        where, params = filtre_regexp("nationalite", pattern_pays, ignorer_casse=True)
+        return self._lire('SELECT * FROM auteurs WHERE ' + where, params)
     
     def emprunts_par_periode(self, pattern_date):
         """Trouve les emprunts selon un pattern de date"""
-        # Pattern fourni : r'2024-11-.*' pour novembre 2024
-        # Pattern : r'2024-.*' pour toute l'année 2024
-        
-        # TODO : Récupérer les emprunts et filtrer par date
-        # self.cursor.execute('SELECT * FROM emprunts')
-        # Appliquez le pattern sur date_emprunt
-        
-        pass
+        # Exemples : r'2024-11-.*' pour novembre 2024, r'2024-.*' pour 2024
+        # Le pattern s'applique au début de date_emprunt (comme re.match) :
+        # le préfixe '2024-11-' devient un intervalle de dates indexable
+        where, params = filtre_regexp("date_emprunt", pattern_date, ancre=True)
+        return self._lire('SELECT * FROM emprunts WHERE ' + where, params)
     
     # Statistiques
     def afficher_statistiques(self):
         """Affiche des statistiques sur la bibliothèque"""
-        # TODO : Comptez les livres, auteurs, emprunts en cours
-        # Utilisez des requêtes SELECT COUNT(*)
-        pass
+        nb_livres, nb_auteurs, nb_en_cours = self._lire('''
+            SELECT (SELECT COUNT(*) FROM livres),
+                   (SELECT COUNT(*) FROM auteurs),
+                   (SELECT COUNT(*) FROM emprunts WHERE statut = 'en_cours')
+        ''')[0]
+        
+        print(f"Livres : {nb_livres}")
+        print(f"Auteurs : {nb_auteurs}")
+        print(f"Emprunts en cours : {nb_en_cours}")
+        
+        return {"livres": nb_livres, "auteurs": nb_auteurs, "emprunts_en_cours": nb_en_cours}
+
+
+class _Interruption:
+    """Connexion utilisée par un appel asynchrone, interrompue s'il est annulé"""
+    
+    def __init__(self):
+        self.conn = None
+        self.annule = False
+        self._verrou = threading.Lock()
+    
+    def attacher(self, conn):
+        with self._verrou:
+            if self.annule:
+                raise sqlite3.OperationalError("interrupted")
+            self.conn = conn
+    
+    def detacher(self):
+        with self._verrou:
+            conn, self.conn = self.conn, None
+            return conn
+    
+    def interrompre(self):
+        with self._verrou:
+            self.annule = True
+            if self.conn is not None:
+                self.conn.interrupt()
+
+
+class AsyncBibliothequeDB:
+    """
+    Façade asyncio de BibliothequeDB : mêmes méthodes, en coroutines.
+    
+    - les requêtes s'exécutent sur un ThreadPoolExecutor de la taille du
+      pool de connexions ; un sémaphore asyncio réserve la connexion avant
+      d'occuper un thread, la boucle d'événements n'attend jamais sqlite3
+      et un thread n'attend jamais une connexion ;
+    - flux() lit un résultat par lots (fetchmany) en itérateur
+      asynchrone, sans le charger en entier ;
+    - annulation : un appel annulé avant de démarrer ne s'exécute pas, une
+      requête en cours est interrompue (Connection.interrupt) et sa
+      connexion rendue au pool. Une transaction d'écriture déjà commencée
+      va à son terme.
+    
+    Utilisation :
+        async with AsyncBibliothequeDB("bibliotheque.db") as db:
+            livres = await db.livres_par_auteur(2)
+            async for emprunt in db.flux_emprunts_avec_details():
+                ...
+    """
+    
+    def __init__(self, db_name='bibliotheque.db', taille_pool=4):
+        self.db = BibliothequeDB(db_name, taille_pool)
+        self._executeur = None
+        self._places = None
+    
+    async def connecter(self):
+        await asyncio.to_thread(self.db.connecter)
+        taille = self.db.pool.taille_max
+        self._executeur = ThreadPoolExecutor(max_workers=taille, thread_name_prefix="bibliotheque")
+        self._places = asyncio.Semaphore(taille)
+    
+    async def deconnecter(self):
+        if self._executeur is not None:
+            await asyncio.to_thread(self._executeur.shutdown, cancel_futures=True)
+            self._executeur = None
+        await asyncio.to_thread(self.db.deconnecter)
+    
+    async def __aenter__(self):
+        await self.connecter()
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.deconnecter()
+    
+    async def _executer(self, interruption, fonction, *args):
+        """Exécute fonction(*args) sur l'exécuteur ; annulable"""
+        travail = self._executeur.submit(fonction, *args)
+        futur = asyncio.wrap_future(travail)
+        try:
+            return await asyncio.shield(futur)
+        except asyncio.CancelledError:
+            if not travail.cancel():
+                # Déjà démarré : on interrompt la requête et on attend que
+                # le thread ait rendu la connexion
+                interruption.interrompre()
+                await asyncio.wait([futur])
+                if not futur.cancelled():
+                    futur.exception()
+            raise
+    
+    async def _appeler(self, methode, *args):
+        """Appelle une méthode de BibliothequeDB sur une connexion réservée"""
+        interruption = _Interruption()
+        
+        def travail():
+            with self.db.connexion() as conn:
+                interruption.attacher(conn)
+                try:
+                    return methode(*args)
+                finally:
+                    interruption.detacher()
+        
+        async with self._places:
+            return await self._executer(interruption, travail)
+    
+    async def flux(self, sql, params=(), taille_lot=500):
+        """Itérateur asynchrone sur les lignes d'une requête, lues par lots"""
+        pool = self.db.pool
+        interruption = _Interruption()
+        curseur = None
+        
+        def ouvrir():
+            conn = pool.emprunter()
+            try:
+                interruption.attacher(conn)
+            except BaseException:
+                pool.rendre(conn)
+                raise
+            return conn.execute(sql, params)
+        
+        def fermer():
+            if curseur is not None:
+                curseur.close()
+            pool.rendre(interruption.detacher())
+        
+        async with self._places:
+            try:
+                curseur = await self._executer(interruption, ouvrir)
+                while lot := await self._executer(interruption, curseur.fetchmany, taille_lot):
+                    for ligne in lot:
+                        yield ligne
+            finally:
+                if interruption.conn is not None:
+                    # La connexion doit revenir au pool même si on est annulé
+                    await asyncio.shield(asyncio.wrap_future(self._executeur.submit(fermer)))
+    
+    def flux_livres_avec_auteurs(self, taille_lot=500):
+        return self.flux(BibliothequeDB.REQUETE_LIVRES_AVEC_AUTEURS, taille_lot=taille_lot)
+    
+    def flux_emprunts_avec_details(self, taille_lot=500):
+        return self.flux(BibliothequeDB.REQUETE_EMPRUNTS_AVEC_DETAILS, taille_lot=taille_lot)
+    
+    # Méthodes de BibliothequeDB
+    
+    async def creer_tables(self, plein_texte=True):
+        return await self._appeler(self.db.creer_tables, plein_texte)
+    
+    async def inserer_donnees_exemple(self):
+        return await self._appeler(self.db.inserer_donnees_exemple)
+    
+    async def charger_en_masse(self, table, lignes, colonnes=None, taille_lot=50_000):
+        return await self._appeler(self.db.charger_en_masse, table, lignes, colonnes, taille_lot)
+    
+    async def afficher_tous_livres(self):
+        return await self._appeler(self.db.afficher_tous_livres)
+    
+    async def livres_par_auteur(self, auteur_id):
+        return await self._appeler(self.db.livres_par_auteur, auteur_id)
+    
+    async def livres_apres_annee(self, annee):
+        return await self._appeler(self.db.livres_apres_annee, annee)
+    
+    async def emprunts_en_cours(self):
+        return await self._appeler(self.db.emprunts_en_cours)
+    
+    async def livres_avec_auteurs(self):
+        return await self._appeler(self.db.livres_avec_auteurs)
+    
+    async def emprunts_avec_details(self):
+        return await self._appeler(self.db.emprunts_avec_details)
+    
+    async def rechercher_livres_par_titre(self, pattern):
+        return await self._appeler(self.db.rechercher_livres_par_titre, pattern)
+    
+    async def rechercher_livres_plein_texte(self, texte, limite=20, prefixe=True):
+        return await self._appeler(self.db.rechercher_livres_plein_texte, texte, limite, prefixe)
+    
+    async def rechercher_auteurs_par_pays(self, pattern_pays):
+        return await self._appeler(self.db.rechercher_auteurs_par_pays, pattern_pays)
+    
+    async def emprunts_par_periode(self, pattern_date):
+        return await self._appeler(self.db.emprunts_par_periode, pattern_date)
+    
+    async def afficher_statistiques(self):
+        return await self._appeler(self.db.afficher_statistiques)
 
 
 # ============= TESTS =============
@@ -430,43 +2155,586 @@ def test_exercice_10():
     print("-" * 60)
     print("Pattern : r'harry.*potter' (tous les livres Harry Potter)")
     
-    # TODO : Décommentez après implémentation
-    # resultats = db.rechercher_livres_par_titre(r'harry.*potter')
-    # print(f"Trouvé {len(resultats)} livre(s) :")
-    # for livre in resultats:
-    #     print(f"  - {livre[1]}")
-    
-    print("ATTENTION : Implémentez rechercher_livres_par_titre() puis décommentez\n")
+    resultats = db.rechercher_livres_par_titre(r'harry.*potter')
+    print(f"Trouvé {len(resultats)} livre(s) :")
+    for livre in resultats:
+        print(f"  - {livre[1]}")
+    print()
     
     print("Test 2 : Rechercher des auteurs par nationalité")
     print("-" * 60)
     print("Pattern : r'Fran[cç]ais[e]?' (Français ou Française)")
     
-    # TODO : Décommentez après implémentation
-    # auteurs = db.rechercher_auteurs_par_pays(r'Fran[cç]ais[e]?')
-    # print(f"Trouvé {len(auteurs)} auteur(s) français :")
-    # for auteur in auteurs:
-    #     print(f"  - {auteur[2]} {auteur[1]}")
-    
-    print("ATTENTION : Implémentez rechercher_auteurs_par_pays() puis décommentez\n")
+    auteurs = db.rechercher_auteurs_par_pays(r'Fran[cç]ais[e]?')
+    print(f"Trouvé {len(auteurs)} auteur(s) français :")
+    for auteur in auteurs:
+        print(f"  - {auteur[2]} {auteur[1]}")
+    print()
     
     print("Test 3 : Emprunts par période")
     print("-" * 60)
     print("Pattern : r'2024-11-.*' (novembre 2024)")
     
-    # TODO : Décommentez après implémentation
-    # emprunts = db.emprunts_par_periode(r'2024-11-.*')
-    # print(f"Trouvé {len(emprunts)} emprunt(s) en novembre 2024")
-    
-    print("ATTENTION : Implémentez emprunts_par_periode() puis décommentez\n")
+    emprunts = db.emprunts_par_periode(r'2024-11-.*')
+    print(f"Trouvé {len(emprunts)} emprunt(s) en novembre 2024\n")
     
     print("=" * 60)
-    print("CONSEIL : Utilisez re.compile() avec re.IGNORECASE")
-    print("   pour des recherches insensibles à la casse !")
+    print("Le filtrage s'exécute dans SQLite via la fonction REGEXP :")
+    print("   seules les lignes qui correspondent sont transférées.")
+    
+    db.deconnecter()
+
+
+def demo_conseiller_index():
+    """Instrumente les requêtes des exercices 8 à 10 puis applique les index conseillés"""
+    print("\n=== Instrumentation et conseiller d'index ===\n")
+    
+    db = BibliothequeDB(':memory:')
+    db.connecter()
+    db.creer_tables()
+    db.inserer_donnees_exemple()
+    profileur = db.activer_instrumentation()
+    
+    def executer_requetes():
+        db.livres_par_auteur(2)
+        db.livres_apres_annee(1940)
+        db.emprunts_en_cours()
+        db.emprunts_avec_details()
+        db.emprunts_par_periode(r'2024-11-.*')
+    
+    executer_requetes()
+    profileur.rapport()
+    
+    print("\nIndex conseillés :")
+    for requete in db.conseiller_index(appliquer=True):
+        print(f"  {requete}")
+    
+    executer_requetes()
+    print("\nParcours complets restants :")
+    for sql, tables in profileur.scans_complets().items():
+        print(f"  {', '.join(tables)} : {sql[:80]}")
     
     db.deconnecter()
 
 
+def benchmark_pool(nb_threads=8, requetes_par_thread=200, part_ecritures=0.1):
+    """
+    Lecteurs et écrivains concurrents sur une même BibliothequeDB.
+    
+    Vérifie qu'aucune écriture n'échoue avec "database is locked" et
+    affiche les statistiques d'attente du pool.
+    """
+    print(f"\n=== Benchmark pool ({nb_threads} threads x {requetes_par_thread} requêtes) ===\n")
+    
+    with tempfile.TemporaryDirectory() as dossier:
+        db = BibliothequeDB(os.path.join(dossier, "bench.db"), taille_pool=4)
+        db.connecter()
+        db.creer_tables()
+        db.inserer_donnees_exemple()
+        erreurs = []
+        
+        def travailleur(numero):
+            try:
+                for i in range(requetes_par_thread):
+                    if (i * nb_threads + numero) % round(1 / part_ecritures) == 0:
+                        with db.transaction() as conn:
+                            conn.execute(
+                                "INSERT INTO emprunts (livre_id, emprunteur, date_emprunt) "
+                                "VALUES (?, ?, ?)",
+                                (1 + i % 14, f"Lecteur {numero}", "2024-12-01"),
+                            )
+                    else:
+                        with db.connexion() as conn:
+                            conn.execute(
+                                "SELECT COUNT(*) FROM emprunts WHERE statut = 'en_cours'"
+                            ).fetchone()
+            except sqlite3.Error as e:
+                erreurs.append(e)
+        
+        debut = time.perf_counter()
+        threads = [threading.Thread(target=travailleur, args=(n,)) for n in range(nb_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        duree = time.perf_counter() - debut
+        
+        stats = db.pool.statistiques()
+        db.deconnecter()
+    
+    total = nb_threads * requetes_par_thread
+    print(f"{total} requêtes en {duree:.2f}s ({total / duree:.0f} req/s)")
+    print(f"Erreurs SQLite : {len(erreurs)}")
+    print(f"Connexions ouvertes : {stats['connexions']}/{stats['taille_max']}")
+    print(f"Attente moyenne : {stats['attente_moyenne_ms']:.3f} ms, "
+          f"max : {stats['attente_max_ms']:.2f} ms ({stats['attentes']} attentes)")
+    return stats
+
+
+def benchmark_chargement(nb_lignes=1_000_000, taille_lot=50_000):
+    """
+    Import d'emprunts depuis un CSV : insertion ligne par ligne, un seul
+    executemany avec les index en place, puis charger_en_masse().
+    """
+    print(f"\n=== Benchmark chargement ({nb_lignes} emprunts) ===\n")
+    
+    def emprunts(n):
+        for i in range(n):
+            yield (1 + i % 14, f"Lecteur {i % 5000}", f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}",
+                   None, "en_cours" if i % 3 else "retourné")
+    
+    colonnes = ["livre_id", "emprunteur", "date_emprunt", "date_retour", "statut"]
+    requete = f"INSERT INTO emprunts ({', '.join(colonnes)}) VALUES (?, ?, ?, ?, ?)"
+    
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin_csv = os.path.join(dossier, "emprunts.csv")
+        with open(chemin_csv, "w", newline="", encoding="utf-8") as f:
+            ecrivain = csv.writer(f)
+            ecrivain.writerow(colonnes)
+            ecrivain.writerows(emprunts(nb_lignes))
+        
+        for methode in ("ligne par ligne", "executemany", "charger_en_masse"):
+            db = BibliothequeDB(os.path.join(dossier, f"{methode}.db"))
+            db.connecter()
+            with redirect_stdout(io.StringIO()):
+                db.creer_tables()
+                db.inserer_donnees_exemple()
+            with db.transaction() as conn:
+                conn.execute("CREATE INDEX idx_emprunts_livre_id ON emprunts (livre_id)")
+                conn.execute("CREATE INDEX idx_emprunts_statut ON emprunts (statut)")
+                conn.execute("CREATE INDEX idx_emprunts_date_emprunt ON emprunts (date_emprunt)")
+            
+            debut = time.perf_counter()
+            if methode == "ligne par ligne":
+                # Une transaction par ligne : on se limite à un échantillon
+                n = min(nb_lignes, 5000)
+                for ligne in emprunts(n):
+                    with db.transaction() as conn:
+                        conn.execute(requete, ligne)
+            elif methode == "executemany":
+                n = nb_lignes
+                with db.transaction() as conn:
+                    conn.executemany(requete, emprunts(n))
+            else:
+                with redirect_stdout(io.StringIO()):
+                    n = db.charger_en_masse("emprunts", chemin_csv, taille_lot=taille_lot)["lignes"]
+            duree = time.perf_counter() - debut
+            print(f"{methode:18}: {n:>9} lignes en {duree:6.2f}s ({n / duree:>9,.0f} lignes/s)")
+            db.deconnecter()
+
+
+def benchmark_plein_texte(nb_livres=5_000_000, nb_requetes=1000):
+    """
+    Recherche plein texte (FTS5) contre recherche regex sur un catalogue
+    synthétique de nb_livres titres.
+    
+    Les titres sont faits de mots inventés (accentués), pour un
+    vocabulaire de 27 000 termes comme un vrai catalogue. Les requêtes
+    reprennent deux mots d'un titre existant, sans accents : complets,
+    puis avec le second tronqué à 5 lettres (saisie en cours).
+    """
+    import random
+    import statistics
+    import unicodedata
+    
+    print(f"\n=== Benchmark plein texte ({nb_livres} livres) ===\n")
+    rng = random.Random(42)
+    syllabes = ["ba", "lé", "ro", "mi", "tu", "ça", "né", "po", "gri", "fè",
+                "lu", "da", "vo", "sé", "ké", "zi", "char", "mon", "ève", "tra",
+                "pli", "dou", "rê", "ga", "sti", "noû", "bel", "quo", "jan", "wé"]
+    vocabulaire = [a + b + c for a in syllabes for b in syllabes for c in syllabes]
+    
+    def sans_accents(mot):
+        return unicodedata.normalize("NFD", mot).encode("ascii", "ignore").decode()
+    
+    def mesurer(requetes):
+        durees, trouves = [], 0
+        for texte in requetes:
+            t = time.perf_counter()
+            trouves += bool(db.rechercher_livres_plein_texte(texte))
+            durees.append(time.perf_counter() - t)
+        durees.sort()
+        return (f"médiane {1000 * statistics.median(durees):.3f} ms, "
+                f"p95 {1000 * durees[int(0.95 * len(durees))]:.3f} ms "
+                f"({trouves}/{len(requetes)} avec résultats)")
+    
+    with tempfile.TemporaryDirectory() as dossier:
+        db = BibliothequeDB(os.path.join(dossier, "catalogue.db"))
+        db.connecter()
+        db.creer_tables(plein_texte=False)
+        
+        debut = time.perf_counter()
+        pas = max(nb_livres // nb_requetes, 1)
+        exemples = []
+        
+        def livres():
+            for i in range(nb_livres):
+                titre = " ".join(rng.choices(vocabulaire, k=rng.randint(2, 5)))
+                if i % pas == 0:
+                    exemples.append(titre.split())
+                yield titre.capitalize(), 1 + i % 1000
+        
+        with db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO auteurs (nom, prenom) VALUES (?, ?)",
+                ((rng.choice(vocabulaire).capitalize(), rng.choice(vocabulaire).capitalize())
+                 for _ in range(1000)),
+            )
+            conn.executemany("INSERT INTO livres (titre, auteur_id) VALUES (?, ?)", livres())
+        print(f"Chargement : {time.perf_counter() - debut:.1f}s")
+        
+        debut = time.perf_counter()
+        db.creer_index_plein_texte()
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO livres_fts (livres_fts) VALUES ('optimize')")
+        print(f"Indexation FTS5 : {time.perf_counter() - debut:.1f}s\n")
+        
+        paires = [[sans_accents(m) for m in rng.sample(mots, 2)] for mots in exemples[:nb_requetes]]
+        print("FTS5, mots complets    :", mesurer([f"{a} {b}" for a, b in paires]))
+        print("FTS5, dernier préfixe  :", mesurer([f"{a} {b[:5]}" for a, b in paires]))
+        
+        a, b = paires[0]
+        t = time.perf_counter()
+        db.rechercher_livres_par_titre(rf"{a}.*{b}")
+        print(f"Regex (1 requête)      : {1000 * (time.perf_counter() - t):.1f} ms")
+        
+        db.deconnecter()
+
+
+def benchmark_cache(nb_appels=500, part_ecritures=0.05, nb_emprunts=2000):
+    """
+    Tableau de bord : afficher_statistiques, livres_avec_auteurs et
+    emprunts_avec_details appelés en boucle, avec quelques emprunts
+    enregistrés entre deux appels ; sans puis avec cache.
+    
+    Vérifie que les résultats sont identiques dans les deux cas et qu'une
+    écriture faite par une autre connexion est vue malgré le cache.
+    """
+    print(f"\n=== Benchmark cache ({nb_appels} appels, {nb_emprunts} emprunts) ===\n")
+    pas_ecriture = round(1 / part_ecritures)
+    
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "tableau_de_bord.db")
+        db = BibliothequeDB(chemin)
+        db.connecter()
+        with redirect_stdout(io.StringIO()):
+            db.creer_tables()
+            db.inserer_donnees_exemple()
+            db.charger_en_masse("emprunts", (
+                (1 + i % 14, f"Lecteur {i % 500}", f"2024-{1 + i % 12:02}-{1 + i % 28:02}",
+                 None, "rendu" if i % 3 else "en_cours")
+                for i in range(nb_emprunts)
+            ), colonnes=("livre_id", "emprunteur", "date_emprunt", "date_retour", "statut"))
+        
+        def tableau_de_bord():
+            resultats = []
+            with open(os.devnull, "w") as nul, redirect_stdout(nul):
+                for i in range(nb_appels):
+                    if i % pas_ecriture == pas_ecriture - 1:
+                        with db.transaction() as conn:
+                            conn.execute(
+                                "INSERT INTO emprunts (livre_id, emprunteur, date_emprunt) "
+                                "VALUES (?, ?, ?)", (1 + i % 14, "Tableau de bord", "2024-12-01"))
+                    resultats.append((db.afficher_statistiques(), db.livres_avec_auteurs(),
+                                      len(db.emprunts_avec_details())))
+            return resultats
+        
+        durees = {}
+        resultats = {}
+        for mode in ("sans cache", "avec cache"):
+            if mode == "avec cache":
+                db.activer_cache()
+            with db.transaction() as conn:
+                conn.execute("DELETE FROM emprunts WHERE emprunteur = 'Tableau de bord'")
+            debut = time.perf_counter()
+            resultats[mode] = tableau_de_bord()
+            durees[mode] = time.perf_counter() - debut
+            print(f"{mode:12}: {durees[mode]:6.2f}s ({3 * nb_appels / durees[mode]:,.0f} requêtes/s)")
+        
+        stats = db.cache.statistiques()
+        print(f"\nAccélération : x{durees['sans cache'] / durees['avec cache']:.1f}")
+        print(f"Hits : {stats['hits']}, misses : {stats['misses']}, "
+              f"contournements : {stats['contournements']} "
+              f"(taux {100 * stats['taux_hits']:.1f} %), invalidations : {stats['invalidations']}")
+        print(f"Résultats identiques : {resultats['sans cache'] == resultats['avec cache']}")
+        
+        with redirect_stdout(io.StringIO()):
+            avant = db.afficher_statistiques()["livres"]
+            externe = sqlite3.connect(chemin)
+            externe.execute("INSERT INTO livres (titre, auteur_id) VALUES ('Écrit ailleurs', 1)")
+            externe.commit()
+            externe.close()
+            apres = db.afficher_statistiques()["livres"]
+        print(f"Écriture externe vue : {apres == avant + 1} ({avant} -> {apres} livres)")
+        
+        db.deconnecter()
+    return stats
+
+
+def benchmark_async(nb_requetes=1000, nb_emprunts=5000):
+    """
+    Latence de la boucle d'événements pendant nb_requetes requêtes
+    concurrentes : BibliothequeDB appelée directement depuis les
+    coroutines, puis AsyncBibliothequeDB. Une sonde se réveille toutes
+    les millisecondes et mesure son retard.
+    
+    Vérifie ensuite qu'une requête longue annulée rend sa connexion.
+    """
+    import statistics
+    
+    print(f"\n=== Benchmark asyncio ({nb_requetes} requêtes concurrentes) ===\n")
+    
+    def melange(db):
+        """nb_requetes appels (sans arguments) aux méthodes de db"""
+        appels = [
+            lambda i: db.livres_par_auteur(1 + i % 7),
+            lambda i: db.emprunts_en_cours(),
+            lambda i: db.livres_avec_auteurs(),
+            lambda i: db.rechercher_livres_par_titre(r"^L"),
+            lambda i: db.emprunts_par_periode(rf"2024-{1 + i % 12:02}-.*"),
+            lambda i: db.afficher_statistiques(),
+        ]
+        return [lambda i=i: appels[i % len(appels)](i) for i in range(nb_requetes)]
+    
+    async def sonde(retards, arret):
+        while not arret.is_set():
+            debut = time.perf_counter()
+            await asyncio.sleep(0.001)
+            retards.append(time.perf_counter() - debut - 0.001)
+    
+    async def mesurer(nom, lancer):
+        retards, arret = [], asyncio.Event()
+        tache_sonde = asyncio.create_task(sonde(retards, arret))
+        await asyncio.sleep(0.01)
+        debut = time.perf_counter()
+        with open(os.devnull, "w") as nul, redirect_stdout(nul):
+            await lancer()
+        duree = time.perf_counter() - debut
+        arret.set()
+        await tache_sonde
+        retards.sort()
+        print(f"{nom:20}: {duree:6.2f}s, retard de la boucle médian "
+              f"{1000 * statistics.median(retards):6.2f} ms, "
+              f"p99 {1000 * retards[int(0.99 * (len(retards) - 1))]:7.2f} ms, "
+              f"max {1000 * retards[-1]:7.2f} ms")
+    
+    async def scenario(chemin):
+        async with AsyncBibliothequeDB(chemin) as adb:
+            with redirect_stdout(io.StringIO()):
+                await adb.creer_tables()
+                await adb.inserer_donnees_exemple()
+                await adb.charger_en_masse("emprunts", [
+                    (1 + i % 14, f"Lecteur {i % 500}", f"2024-{1 + i % 12:02}-{1 + i % 28:02}",
+                     None, "rendu" if i % 3 else "en_cours")
+                    for i in range(nb_emprunts)
+                ], colonnes=("livre_id", "emprunteur", "date_emprunt", "date_retour", "statut"))
+            
+            async def direct():
+                # Chaque méthode synchrone bloque la boucle le temps de sa requête
+                async def appel(requete):
+                    return requete()
+                await asyncio.gather(*(appel(requete) for requete in melange(adb.db)))
+            
+            async def asynchrone():
+                await asyncio.gather(*(requete() for requete in melange(adb)))
+            
+            await mesurer("au repos", lambda: asyncio.sleep(1))
+            await mesurer("BibliothequeDB", direct)
+            await mesurer("AsyncBibliothequeDB", asynchrone)
+            
+            async def parcours_long():
+                async for _ in adb.flux("SELECT a.id, b.id FROM emprunts a, emprunts b "
+                                        "WHERE a.emprunteur REGEXP b.emprunteur"):
+                    pass
+            
+            tache = asyncio.create_task(parcours_long())
+            await asyncio.sleep(0.2)
+            debut = time.perf_counter()
+            tache.cancel()
+            try:
+                await tache
+            except asyncio.CancelledError:
+                pass
+            annulation = time.perf_counter() - debut
+            # Toutes les connexions doivent être de nouveau disponibles
+            taille = adb.db.pool.taille_max
+            with redirect_stdout(io.StringIO()):
+                await asyncio.wait_for(
+                    asyncio.gather(*(adb.afficher_statistiques() for _ in range(taille))),
+                    timeout=5,
+                )
+            print(f"\nAnnulation d'un parcours en cours : {1000 * annulation:.1f} ms, "
+                  f"{taille}/{taille} connexions disponibles ensuite")
+    
+    with tempfile.TemporaryDirectory() as dossier:
+        asyncio.run(scenario(os.path.join(dossier, "async.db")))
+
+
+def benchmark_streaming(nb_emprunts=1_000_000, taille_lot=1000):
+    """
+    Parcours des emprunts détaillés : fetchall() contre iterer() par lots
+    (tuples nommés, sqlite3.Row), puis export CSV. Durée mesurée seule,
+    pic mémoire Python mesuré par tracemalloc dans un second passage.
+    """
+    import tracemalloc
+    
+    print(f"\n=== Benchmark parcours par lots ({nb_emprunts} emprunts) ===\n")
+    
+    with tempfile.TemporaryDirectory() as dossier:
+        db = BibliothequeDB(os.path.join(dossier, "streaming.db"))
+        db.connecter()
+        with redirect_stdout(io.StringIO()):
+            db.creer_tables()
+            db.inserer_donnees_exemple()
+            db.charger_en_masse("emprunts", (
+                (1 + i % 14, f"Lecteur {i % 5000}", f"2024-{1 + i % 12:02}-{1 + i % 28:02}",
+                 None, "rendu" if i % 3 else "en_cours")
+                for i in range(nb_emprunts)
+            ), colonnes=("livre_id", "emprunteur", "date_emprunt", "date_retour", "statut"))
+        
+        def tout_charger():
+            # Ce que fait emprunts_avec_details(), sans l'affichage
+            return sum(emprunt[5] == "en_cours" for emprunt in db._lire(db.REQUETE_EMPRUNTS_AVEC_DETAILS))
+        
+        methodes = {
+            "fetchall": tout_charger,
+            "iterer (tuples nommés)": lambda: sum(
+                e.statut == "en_cours" for e in db.iterer_emprunts_avec_details(taille_lot)),
+            "iterer (sqlite3.Row)": lambda: sum(
+                e["statut"] == "en_cours"
+                for e in db.iterer_emprunts_avec_details(taille_lot, fabrique=sqlite3.Row)),
+            "export CSV": lambda: db.exporter_emprunts_csv(os.path.join(dossier, "emprunts.csv")),
+        }
+        for nom, methode in methodes.items():
+            debut = time.perf_counter()
+            resultat = methode()
+            duree = time.perf_counter() - debut
+            tracemalloc.start()
+            methode()
+            pic = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{nom:24}: {duree:6.2f}s, pic mémoire {pic / 2**20:8.1f} Mo (résultat : {resultat})")
+        
+        db.deconnecter()
+
+
+def benchmark_validateurs(nb_entrees=10_000_000):
+    """
+    Débit des validateurs sur nb_entrees valeurs (réparties entre les
+    cinq validateurs, valides et invalides mélangées) : re.fullmatch
+    avec le pattern en texte à chaque appel, contre le registre
+    VALIDATEURS (patterns compilés, tests rapides, valider_lot).
+    Lève RuntimeError si les deux ne donnent pas les mêmes résultats.
+    """
+    print(f"\n=== Benchmark validateurs ({nb_entrees} valeurs) ===\n")
+    echantillons = {
+        "email": ["alice@example.com", "jean.dupont+biblio@univ-lyon.fr", "invalid.email",
+                  "a@b", "deux@@arobases.fr", "espace @mail.com", "x" * 300, "bob@site.c0m"],
+        "telephone": ["0612345678", "06 12 34 56 78", "06-12-34-56-78", "06 12-34 56 78",
+                      "0012345678", "06123456", "+33612345678", "06.12.34.56.78"],
+        "code_postal": ["75001", "69007", "7500", "750011", "7500A", "٧٥٠٠١", "", "13 00"],
+        "date": ["15/01/2024", "29/02/2024", "29/02/2023", "31/04/2024", "1/1/2024",
+                 "2024-01-15", "32/01/2024", "01/13/2024"],
+        "mot_de_passe": ["Azerty#2024", "motdepasse", "MotDePasse1", "Court#1",
+                         "SANSMINUSCULE#1", "sans majuscule 1", "Très$ecret99", "Abcdefg1\n"],
+    }
+    
+    def naif(validateur):
+        pattern, flags, controle = validateur.regex.pattern, validateur.regex.flags, validateur.controle
+        
+        def valider(valeur):
+            match = re.fullmatch(pattern, valeur, flags)
+            return match is not None and (controle is None or controle(match))
+        return valider
+    
+    par_validateur = nb_entrees // len(echantillons)
+    total = {"naïf": 0.0, "registre": 0.0}
+    for nom, valeurs in echantillons.items():
+        validateur = VALIDATEURS[nom]
+        attendu = [naif(validateur)(v) and (validateur.longueur_max is None
+                                             or len(v) <= validateur.longueur_max)
+                   for v in valeurs]
+        obtenu = VALIDATEURS.valider_lot(nom, valeurs)
+        if obtenu != attendu:
+            # Comparer des débits n'a de sens que si les résultats sont identiques
+            ecarts = [(v, o, a) for v, o, a in zip(valeurs, obtenu, attendu) if o != a]
+            raise RuntimeError(f"{nom} : le registre diffère du naïf "
+                               f"(valeur, registre, naïf) : {ecarts}")
+        
+        entrees = valeurs * (par_validateur // len(valeurs))
+        debut = time.perf_counter()
+        list(map(naif(validateur), entrees))
+        duree_naif = time.perf_counter() - debut
+        debut = time.perf_counter()
+        VALIDATEURS.valider_lot(nom, entrees)
+        duree = time.perf_counter() - debut
+        total["naïf"] += duree_naif
+        total["registre"] += duree
+        print(f"{nom:13}: naïf {len(entrees) / duree_naif / 1e6:5.2f} M/s, "
+              f"registre {len(entrees) / duree / 1e6:5.2f} M/s (x{duree_naif / duree:.1f})")
+    
+    print(f"\nTotal : naïf {total['naïf']:.1f}s, registre {total['registre']:.1f}s "
+          f"(x{total['naïf'] / total['registre']:.1f})")
+
+
+def benchmark_extraction(taille_mo=256, taille_bloc=1 << 20):
+    """
+    Extraction des emails, téléphones, URLs et IPs d'un dump texte de
+    taille_mo Mo : quatre passages (un par extraire_*), un seul passage
+    avec EXTRACTEUR, puis lecture du fichier par blocs (iterer_fichier)
+    qui donne les mêmes correspondances sans charger le fichier.
+    """
+    import random
+    
+    print(f"\n=== Benchmark extraction ({taille_mo} Mo) ===\n")
+    rng = random.Random(42)
+    mots = ("le livre emprunté par la lectrice est rendu au bibliothécaire "
+            "avec retard selon le registre du mois dernier").split()
+    lignes = []
+    for i in range(20_000):
+        ligne = " ".join(rng.choices(mots, k=12))
+        if i % 10 == 0:
+            ligne += f" contact{i}@exemple.fr"
+        elif i % 10 == 1:
+            ligne += f" (voir https://www.site{i}.fr/page?id={i})"
+        elif i % 10 == 2:
+            ligne += f" Tél : 06 {i % 100:02} 34 56 78."
+        elif i % 10 == 3:
+            ligne += f" depuis 192.168.{i % 256}.{i % 200}"
+        lignes.append(ligne)
+    modele = "\n".join(lignes) + "\n"
+    
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "dump.txt")
+        with open(chemin, "w", encoding="utf-8") as f:
+            for _ in range(max(taille_mo * 2**20 // len(modele.encode()), 1)):
+                f.write(modele)
+        taille = os.path.getsize(chemin) / 2**20
+        
+        with open(chemin, encoding="utf-8") as f:
+            texte = f.read()
+        
+        debut = time.perf_counter()
+        separes = sum(len(extraire(texte)) for extraire in
+                      (extraire_emails, extraire_telephones, extraire_urls, extraire_ips))
+        duree = time.perf_counter() - debut
+        print(f"4 passages        : {duree:6.2f}s ({taille / duree:6.1f} Mo/s), {separes} trouvés")
+        
+        debut = time.perf_counter()
+        un_passage = sum(1 for _ in EXTRACTEUR.iterer(texte))
+        duree = time.perf_counter() - debut
+        print(f"1 passage         : {duree:6.2f}s ({taille / duree:6.1f} Mo/s), {un_passage} trouvés")
+        del texte
+        
+        debut = time.perf_counter()
+        par_type = {nom: 0 for nom in EXTRACTEUR.types}
+        for correspondance in EXTRACTEUR.iterer_fichier(chemin, taille_bloc):
+            par_type[correspondance.type] += 1
+        duree = time.perf_counter() - debut
+        print(f"fichier par blocs : {duree:6.2f}s ({taille / duree:6.1f} Mo/s), "
+              f"{sum(par_type.values())} trouvés {par_type}")
+
+
 if __name__ == "__main__":
     print("=== Module 09 : Regex et Base de Données ===\n")
     
@@ -479,5 +2747,32 @@ if __name__ == "__main__":
     # Décommentez pour tester vos fonctions regex :
     # test_regex()
     
+    # Décommentez pour mesurer le débit des validateurs :
+    # benchmark_validateurs()
+    
+    # Décommentez pour mesurer l'extraction en un seul passage :
+    # benchmark_extraction()
+    
     # Décommentez pour tester l'exercice 10 (Recherche avec Regex) :
     # test_exercice_10()
+    
+    # Décommentez pour instrumenter les requêtes et créer les index conseillés :
+    # demo_conseiller_index()
+    
+    # Décommentez pour tester le pool de connexions multi-threads :
+    # benchmark_pool()
+    
+    # Décommentez pour comparer les méthodes d'import massif :
+    # benchmark_chargement()
+    
+    # Décommentez pour comparer recherche plein texte et regex :
+    # benchmark_plein_texte()
+    
+    # Décommentez pour mesurer le cache des requêtes du tableau de bord :
+    # benchmark_cache()
+    
+    # Décommentez pour mesurer la façade asyncio sous 1000 requêtes concurrentes :
+    # benchmark_async()
+    
+    # Décommentez pour comparer fetchall() et le parcours par lots :
+    # benchmark_streaming()
@@ -0,0 +1,634 @@
+from main import (EXTRACTEUR, VALIDATEURS, AsyncBibliothequeDB, BibliothequeDB, PoolConnexions,
+                  analyser_pattern, filtre_regexp, requete_fts)
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import calendar
+import collections
+import csv
+import itertools
+import random
+import re
+import sqlite3
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = BibliothequeDB(str(tmp_path / "bibliotheque.db"))
+    db.connecter()
+    db.creer_tables()
+    db.inserer_donnees_exemple()
+    yield db
+    db.deconnecter()
+
+
+def compter(db, table):
+    with db.connexion() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_pool_ecritures_visibles(db):
+    nb_livres = compter(db, "livres")
+    ecrit, verifie = threading.Event(), threading.Event()
+
+    def ecrivain():
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO livres (titre, auteur_id, annee_publication, isbn) "
+                         "VALUES ('Pendant', 1, 2000, 'isbn-pendant')")
+            ecrit.set()
+            verifie.wait(10)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futur = executor.submit(ecrivain)
+        assert ecrit.wait(10)
+        # Non commitée : invisible des autres connexions
+        assert executor.submit(compter, db, "livres").result() == nb_livres
+        verifie.set()
+        futur.result()
+        # Commitée : visible de toutes les connexions du pool
+        assert set(executor.map(compter, [db] * 8, ["livres"] * 8)) == {nb_livres + 1}
+
+    # Écriture par self.conn, hors du pool
+    db.cursor.execute("DELETE FROM livres WHERE isbn = 'isbn-pendant'")
+    db.conn.commit()
+    assert compter(db, "livres") == nb_livres
+
+
+def test_pool_taille_max(tmp_path):
+    pool = PoolConnexions(str(tmp_path / "pool.db"), taille_max=2, timeout=0.1)
+    premiere, seconde = pool.emprunter(), pool.emprunter()
+    with pytest.raises(TimeoutError):
+        pool.emprunter()
+    pool.rendre(seconde)
+    assert pool.emprunter() is seconde
+    pool.rendre(premiere)
+    pool.rendre(seconde)
+    pool.fermer()
+
+
+def test_plans_apres_creation_index(db):
+    profileur = db.activer_instrumentation()
+    db.livres_par_auteur(2)
+    assert profileur.scans_complets() == {"SELECT * FROM livres WHERE auteur_id = ?": ["livres"]}
+    with db.transaction() as conn:
+        conn.execute("CREATE INDEX idx_livres_auteur_id ON livres (auteur_id)")
+    profileur.invalider_plans()
+    db.livres_par_auteur(2)
+    assert profileur.scans_complets() == {}
+    plan = profileur.requetes["SELECT * FROM livres WHERE auteur_id = ?"]["plan"]
+    assert plan == ["SEARCH livres USING INDEX idx_livres_auteur_id (auteur_id=?)"]
+
+
+def ajouter_livre(conn, isbn, auteur_id=2):
+    conn.execute("INSERT INTO livres (titre, auteur_id, annee_publication, isbn) "
+                 "VALUES ('Nouveau', ?, 2000, ?)", (auteur_id, isbn))
+
+
+def test_cache_requetes_invalidation(db):
+    cache = db.activer_cache()
+    livres = db.livres_par_auteur(2)
+    auteurs = db.rechercher_auteurs_par_pays("Fran")
+    assert db.livres_par_auteur(2) == livres
+    assert cache.statistiques()["hits"] == 1
+
+    # Transaction du pool : seuls les résultats lisant livres sont retirés
+    with db.transaction() as conn:
+        ajouter_livre(conn, "isbn-pool")
+    assert len(db.livres_par_auteur(2)) == len(livres) + 1
+    assert db.rechercher_auteurs_par_pays("Fran") == auteurs
+    assert cache.statistiques()["hits"] == 2
+
+    # Écriture hors du pool : PRAGMA data_version vide le cache
+    ajouter_livre(db.cursor, "isbn-externe")
+    db.conn.commit()
+    assert len(db.livres_par_auteur(2)) == len(livres) + 2
+
+
+def test_cache_requetes_pendant_ecriture(db):
+    db.activer_cache()
+    livres = db.livres_par_auteur(2)
+    ecrit, fin = threading.Event(), threading.Event()
+
+    def ecrivain():
+        with db.transaction() as conn:
+            ajouter_livre(conn, "isbn-lent")
+            ecrit.set()
+            fin.wait(10)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futur = executor.submit(ecrivain)
+        assert ecrit.wait(10)
+        # Lectures concurrentes sans attendre la fin de l'écriture, sans
+        # la voir, servies par le cache
+        lectures = [executor.submit(db.livres_par_auteur, 2) for _ in range(20)]
+        assert all(lecture.result(timeout=5) == livres for lecture in lectures)
+        assert db.cache.statistiques()["hits"] == 20
+        fin.set()
+        futur.result()
+    assert len(db.livres_par_auteur(2)) == len(livres) + 1
+
+    # Lecture dans une transaction : hors cache, mais comptée
+    with db.transaction():
+        assert len(db.livres_par_auteur(2)) == len(livres) + 1
+    stats = db.cache.statistiques()
+    assert stats["contournements"] == 1
+    assert (stats["hits"], stats["misses"]) == (20, 2)
+    assert stats["taux_hits"] == pytest.approx(20 / 23)
+
+
+def executer_requetes(db):
+    db.livres_par_auteur(2)
+    db.livres_apres_annee(1940)
+    db.emprunts_en_cours()
+    db.emprunts_avec_details()
+    db.emprunts_par_periode(r'2024-11-.*')
+
+
+def index_existants(db):
+    with db.connexion() as conn:
+        return {nom for (nom,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")}
+
+
+def test_conseiller_index(db):
+    profileur = db.activer_instrumentation()
+    executer_requetes(db)
+    assert len(profileur.scans_complets()) == 5
+
+    conseilles = db.conseiller_index()
+    assert conseilles == [
+        "CREATE INDEX IF NOT EXISTS idx_livres_auteur_id ON livres (auteur_id)",
+        "CREATE INDEX IF NOT EXISTS idx_emprunts_livre_id ON emprunts (livre_id)",
+        "CREATE INDEX IF NOT EXISTS idx_livres_annee_publication ON livres (annee_publication)",
+        "CREATE INDEX IF NOT EXISTS idx_emprunts_statut ON emprunts (statut)",
+        "CREATE INDEX IF NOT EXISTS idx_emprunts_date_emprunt ON emprunts (date_emprunt)",
+    ]
+    assert index_existants(db) == set()
+
+    assert db.conseiller_index(appliquer=True) == conseilles
+    assert index_existants(db) == {r.split()[5] for r in conseilles}
+    executer_requetes(db)
+    # Reste le parcours de la table externe de la jointure, sans filtre
+    assert list(profileur.scans_complets().values()) == [["emprunts"]]
+    assert db.conseiller_index() == []
+
+
+# Patterns de l'énoncé, appliqués naïvement à la chaîne entière
+REGEX_REFERENCE = {
+    "email": r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+    "telephone": r"0[1-9]([ -]?)[0-9]{2}(?:\1[0-9]{2}){3}",
+    "code_postal": r"[0-9]{5}",
+    "date": r"(0[1-9]|[12][0-9]|3[01])/(0[1-9]|1[0-2])/([0-9]{4})",
+    "mot_de_passe": r"(?=.*[A-Z])(?=.*[a-z])(?=.*[0-9])(?=.*[^A-Za-z0-9]).{8,}",
+}
+
+ALPHABETS = {
+    "email": "ab.Z9_%+-@@..é ",
+    "telephone": "0123456789  --.+",
+    "code_postal": "0123456789 A٧",
+    "date": "0123456789////-",
+    "mot_de_passe": "aZ9#é \n",
+}
+
+EXEMPLES = {
+    "email": ["alice@example.com", "jean.dupont+biblio@univ-lyon.fr", "a@b.cd", "x" * 250 + "@b.fr"],
+    "telephone": ["0612345678", "06 12 34 56 78", "06-12-34-56-78", "06 12-34 56 78"],
+    "code_postal": ["75001", "٧٥٠٠١"],
+    "date": ["15/01/2024", "29/02/2024", "29/02/2023", "29/02/1900", "29/02/2000",
+             "31/04/2024", "29/02/0000"],
+    "mot_de_passe": ["Azerty#2024", "Abcdefg1\n", "Très$ecret99", "Court#1"],
+}
+
+
+def valide_reference(nom, valeur):
+    match = re.fullmatch(REGEX_REFERENCE[nom], valeur, re.DOTALL)
+    if match is None:
+        return False
+    if nom == "email":
+        return len(valeur) <= 254
+    if nom == "date":
+        jour, mois, annee = map(int, match.groups())
+        jours = [31, 29 if calendar.isleap(annee) else 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+        return jour <= jours[mois - 1]
+    return True
+
+
+def valeurs_aleatoires(nom, rng, nombre=20_000):
+    alphabet = ALPHABETS[nom]
+    for _ in range(nombre):
+        if rng.random() < 0.5:
+            yield "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+        else:
+            # Exemple modifié à un caractère près
+            valeur = list(rng.choice(EXEMPLES[nom]))
+            i = rng.randrange(len(valeur) + 1)
+            action = rng.randrange(3)
+            if action == 0:
+                valeur.insert(i, rng.choice(alphabet))
+            elif i < len(valeur):
+                if action == 1:
+                    del valeur[i]
+                else:
+                    valeur[i] = rng.choice(alphabet)
+            yield "".join(valeur)
+
+
+def test_validateurs_regex_reference():
+    rng = random.Random(9)
+    for nom in REGEX_REFERENCE:
+        valeurs = EXEMPLES[nom] + list(valeurs_aleatoires(nom, rng))
+        attendu = [valide_reference(nom, v) for v in valeurs]
+        assert VALIDATEURS.valider_lot(nom, valeurs) == attendu, nom
+        assert any(attendu) and not all(attendu)
+    assert not VALIDATEURS.valider("email", None)
+
+
+def texte_aleatoire(rng, nb_morceaux=3000):
+    morceaux = ["alice@example.com", "jean.dupont+biblio@univ-lyon.fr", "06 12 34 56 78",
+                "0612345678", "https://exemple.fr/page?id=3.", "www.site.com/a)", "192.168.1.254",
+                "10.0.0.1.5", "256.1.1.1", "mot", "x@y", "é", ",", "\n", " ", "07-11-22-33-44"]
+    return "".join(rng.choice(morceaux) + rng.choice(["", " ", ", ", "\n"])
+                   for _ in range(nb_morceaux))
+
+
+def test_extraction_par_blocs(tmp_path):
+    texte = texte_aleatoire(random.Random(5))
+    attendu = list(EXTRACTEUR.iterer(texte))
+    assert {c.type for c in attendu} == {"email", "url", "ip", "telephone"}
+    for taille in (1, 7, 100, 4096):
+        blocs = (texte[i:i + taille] for i in range(0, len(texte), taille))
+        assert list(EXTRACTEUR.iterer_flux(blocs, chevauchement=64)) == attendu, taille
+
+    chemin = tmp_path / "texte.txt"
+    chemin.write_text(texte, encoding="utf-8")
+    assert list(EXTRACTEUR.iterer_fichier(chemin, taille_bloc=333, chevauchement=64)) == attendu
+    assert EXTRACTEUR.extraire_fichier(chemin, taille_bloc=333, chevauchement=64) == \
+        EXTRACTEUR.extraire(texte)
+
+
+# Atomes des patterns aléatoires : littéraux (ASCII, non ASCII, échappés),
+# atomes sans littéral, quantificateurs, options globales
+ATOMES_LITTERAUX = list("abkisABKIS02-_%é É") + [
+    "\\.", "\\-", "\\%", "\\\\", "\\x61", "\\u00e9", "\\101", "\\N{LATIN SMALL LETTER E WITH ACUTE}"]
+ATOMES_AUTRES = [".", "\\d", "\\w", "\\s", "\\b", "[a-c]", "[^a]", "[]a]", "[\\]é]", "[é-ê]", "$"]
+QUANTIFICATEURS = ["*", "+", "?", "{0,2}", "{2}", "*?", "+?", "{1,}", "{,1}"]
+OPTIONS = ["", "", "", "(?i)", "(?i)", "(?x)", "(?ix)", "(?s)", "(?m)", "(?a)"]
+PATTERNS_DATES = ["2024-11-", "2024-11-.*", "2024-11-\\d{2}", "2024-1[01]-", "2024-11-0?1",
+                  "2024-11-(?:01|30)", "2024-11- # mois"]
+CARACTERES_CHAINES = "abkisABKIS02-_%.é ÉſİıK\n\\"
+DATES = ["2024-10-31", "2024-11", "2024-11-", "2024-11-01", "2024-11-30", "2024-11.",
+         "2024-11/01", "2024-12-01", "2024-11-01\n2024-12"]
+
+
+def sequence_aleatoire(rng, profondeur):
+    morceaux = []
+    for _ in range(rng.randint(1, 5)):
+        tirage = rng.random()
+        if tirage < 0.55:
+            atome = rng.choice(ATOMES_LITTERAUX)
+        elif tirage < 0.8 or profondeur >= 2:
+            atome = rng.choice(ATOMES_AUTRES)
+        else:
+            ouvrant = rng.choice(["(", "(?:", "(?i:"])
+            atome = ouvrant + alternative_aleatoire(rng, profondeur + 1, 0.3) + ")"
+        if atome not in ("$", "\\b") and rng.random() < 0.3:
+            atome += rng.choice(QUANTIFICATEURS)
+        morceaux.append(atome)
+    return "".join(morceaux)
+
+
+def alternative_aleatoire(rng, profondeur, proba_branche):
+    branches = [sequence_aleatoire(rng, profondeur)]
+    while rng.random() < proba_branche:
+        branches.append(sequence_aleatoire(rng, profondeur))
+    return "|".join(branches)
+
+
+def pattern_aleatoire(rng):
+    options = rng.choice(OPTIONS)
+    if rng.random() < 0.1:
+        return options + rng.choice(PATTERNS_DATES)
+    corps = alternative_aleatoire(rng, 0, 0.15)
+    if rng.random() < 0.3:
+        corps = "^" + corps
+    if "x" in options and rng.random() < 0.5:
+        corps += " # commentaire"
+    return options + corps
+
+
+def test_filtre_regexp_prefixe_date():
+    where, params = filtre_regexp("date_emprunt", "2024-11-.*", ancre=True)
+    assert where == "date_emprunt >= ? AND date_emprunt < ? AND date_emprunt REGEXP ?"
+    assert params[:2] == ["2024-11-", "2024-11."]
+    assert analyser_pattern("2024-11-\\d{2}") == ("2024-11-", ["2024-11-"])
+    assert analyser_pattern("harry.*potter") == ("harry", ["harry", "potter"])
+    assert analyser_pattern("h?arry.*potter") == ("", ["arry", "potter"])
+    assert analyser_pattern("a|b") == ("", [])
+
+
+def test_filtre_regexp_comme_re():
+    # Les préfiltres ne doivent écarter aucune ligne que REGEXP retiendrait
+    rng = random.Random(17)
+    chaines = sorted({"".join(rng.choice(CARACTERES_CHAINES) for _ in range(rng.randint(0, 10)))
+                      for _ in range(80)} | set(DATES))
+    conn = sqlite3.connect(":memory:")
+    conn.create_function("REGEXP", 2, lambda p, v: re.search(p, v) is not None)
+    conn.execute("CREATE TABLE t (v TEXT)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(c,) for c in chaines])
+    couverture = collections.Counter()
+    nb_patterns = 0
+    while nb_patterns < 3000:
+        pattern = pattern_aleatoire(rng)
+        try:
+            re.compile(pattern)
+        except re.error:
+            continue
+        nb_patterns += 1
+        for ancre in (False, True):
+            for ignorer_casse in (False, True):
+                where, params = filtre_regexp("v", pattern, ignorer_casse, ancre)
+                trouve = [v for (v,) in conn.execute(f"SELECT v FROM t WHERE {where} ORDER BY v", params)]
+                regex = re.compile(pattern, re.IGNORECASE if ignorer_casse else 0)
+                correspond = regex.match if ancre else regex.search
+                attendu = [c for c in chaines if correspond(c)]
+                assert trouve == attendu, (pattern, ancre, ignorer_casse, params)
+                if " < ? " in where:
+                    couverture["intervalle"] += 1
+                if " LIKE " in where and re.search(r"[^\x00-\x7f]", pattern):
+                    couverture["casse non ASCII" if ignorer_casse else "non ASCII"] += 1
+        if re.compile(pattern).flags & re.VERBOSE:
+            couverture["verbeux"] += 1
+        if "|" in pattern and "(" not in re.sub(r"^(?:\(\?[aimsx]+\))*", "", pattern):
+            couverture["alternative"] += 1
+    assert min(couverture.values()) >= 100 and len(couverture) == 5, couverture
+
+
+COLONNES_LIVRES = ["titre", "auteur_id", "annee_publication", "isbn", "genre"]
+
+
+def livres_a_charger(n, debut=0):
+    return [(f"Zorglub tome {i}", 1 + i % 7, 1900 + i % 100, f"isbn-masse-{i}", "Roman")
+            for i in range(debut, debut + n)]
+
+
+def pragmas_ecrivain(db):
+    with db.pool.ecriture() as conn:
+        return (conn.execute("PRAGMA synchronous").fetchone()[0],
+                conn.execute("PRAGMA journal_mode").fetchone()[0])
+
+
+def objets_livres(db):
+    with db.connexion() as conn:
+        return {nom for (nom,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger') "
+            "AND tbl_name = 'livres' AND sql IS NOT NULL")}
+
+
+def preparer_chargement(db):
+    with db.transaction() as conn:
+        conn.execute("CREATE INDEX idx_livres_annee ON livres (annee_publication)")
+    return pragmas_ecrivain(db), objets_livres(db)
+
+
+def test_charger_en_masse_sources(db, tmp_path):
+    pragmas, objets = preparer_chargement(db)
+    assert {"idx_livres_annee", "livres_fts_insert"} <= objets
+    nb_livres = compter(db, "livres")
+
+    chemin = str(tmp_path / "livres.csv")
+    with open(chemin, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLONNES_LIVRES)
+        writer.writerows(livres_a_charger(25))
+    assert db.charger_en_masse("livres", chemin, taille_lot=10)["lignes"] == 25
+    dictionnaires = [dict(zip(COLONNES_LIVRES, ligne)) for ligne in livres_a_charger(25, 25)]
+    assert db.charger_en_masse("livres", iter(dictionnaires), taille_lot=7)["lignes"] == 25
+    assert db.charger_en_masse("livres", livres_a_charger(25, 50), colonnes=COLONNES_LIVRES)["lignes"] == 25
+
+    assert compter(db, "livres") == nb_livres + 75
+    with db.connexion() as conn:
+        assert conn.execute("SELECT titre, auteur_id, annee_publication, isbn, genre FROM livres "
+                            "WHERE isbn = 'isbn-masse-30'").fetchone() == livres_a_charger(1, 30)[0]
+    # Index, trigger et pragmas rétablis ; l'index plein texte contient les
+    # lignes chargées et suit les insertions suivantes
+    assert objets_livres(db) == objets
+    assert pragmas_ecrivain(db) == pragmas
+    assert len(db.rechercher_livres_plein_texte("zorglub", limite=100)) == 75
+    with db.transaction() as conn:
+        ajouter_livre(conn, "isbn-apres")
+    assert db.rechercher_livres_plein_texte("nouveau")
+
+
+def test_charger_en_masse_lot_en_erreur(db):
+    pragmas, objets = preparer_chargement(db)
+    lignes = livres_a_charger(10)
+    lignes[7] = (None,) + lignes[7][1:]  # titre NOT NULL
+    with pytest.raises(sqlite3.IntegrityError, match="NOT NULL"):
+        db.charger_en_masse("livres", lignes, colonnes=COLONNES_LIVRES, taille_lot=5)
+    assert objets_livres(db) == objets
+    assert pragmas_ecrivain(db) == pragmas
+    # Le premier lot, commité, est indexé en plein texte
+    assert len(db.rechercher_livres_plein_texte("zorglub")) == 5
+
+
+def test_charger_en_masse_index_unique_viole(db):
+    pragmas, objets = preparer_chargement(db)
+    with db.transaction() as conn:
+        conn.execute("CREATE UNIQUE INDEX idx_livres_titre ON livres (titre)")
+    doublons = livres_a_charger(3) + [("Zorglub tome 0", 1, 2000, "isbn-doublon", "Roman")]
+
+    # Chargement réussi mais index UNIQUE impossible à recréer
+    with pytest.raises(sqlite3.IntegrityError, match="idx_livres_titre"):
+        db.charger_en_masse("livres", doublons, colonnes=COLONNES_LIVRES)
+    assert objets_livres(db) == objets  # les autres index sont rétablis
+    assert pragmas_ecrivain(db) == pragmas
+
+    # Chargement en erreur : son erreur l'emporte sur celle de l'index
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM livres WHERE isbn = 'isbn-doublon'")
+        conn.execute("CREATE UNIQUE INDEX idx_livres_titre ON livres (titre)")
+    lignes = [("Zorglub tome 0", 1, 2000, "isbn-a", "Roman"),   # titre en double, commité
+              ("Zorglub tome 8", 1, 2000, "isbn-b", "Roman"),
+              ("Zorglub tome 9", 1, 2000, "isbn-a", "Roman")]   # isbn UNIQUE
+    with pytest.raises(sqlite3.IntegrityError, match="livres.isbn") as erreur:
+        db.charger_en_masse("livres", lignes, colonnes=COLONNES_LIVRES, taille_lot=2)
+    assert any("idx_livres_titre" in note for note in erreur.value.__notes__)
+    assert objets_livres(db) == objets
+    assert pragmas_ecrivain(db) == pragmas
+
+
+REQUETE_SANS_FIN = ("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+                    "SELECT COUNT(*) FROM n")
+
+
+async def annuler(tache, delai=0.2):
+    await asyncio.sleep(delai)
+    tache.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(tache, timeout=5)
+
+
+def test_async_annulation_lecture(db):
+    async def scenario():
+        async with AsyncBibliothequeDB(db.db_name, taille_pool=2) as adb:
+            pool = adb.db.pool
+
+            async def parcours():
+                async for _ in adb.flux(REQUETE_SANS_FIN):
+                    pass
+
+            # Requête en cours : interrompue, connexion rendue
+            await annuler(asyncio.create_task(parcours()))
+            assert pool.statistiques()["empruntees"] == 0
+            # Appel en cours d'exécution (lecture via _lire)
+            await annuler(asyncio.create_task(adb._appeler(adb.db._lire, REQUETE_SANS_FIN)))
+            assert pool.statistiques()["empruntees"] == 0
+
+            # Appel pas encore démarré (pool occupé) : abandonné
+            occupants = [asyncio.create_task(parcours()) for _ in range(2)]
+            await asyncio.sleep(0.1)
+            emprunts = pool.statistiques()["emprunts"]
+            await annuler(asyncio.create_task(adb.livres_par_auteur(2)), delai=0.05)
+            assert pool.statistiques()["emprunts"] == emprunts
+            for tache in occupants:
+                await annuler(tache, delai=0)
+            assert pool.statistiques()["empruntees"] == 0
+
+            # Les connexions servent de nouveau
+            assert len(await adb.livres_par_auteur(2)) == len(db.livres_par_auteur(2))
+            assert [ligne async for ligne in adb.flux("SELECT id FROM auteurs")]
+
+    asyncio.run(scenario())
+
+
+def test_async_annulation_ecriture(db):
+    nb_emprunts = compter(db, "emprunts")
+    demarre = threading.Event()
+
+    def emprunts(n):
+        for i in range(n):
+            demarre.set()
+            yield (1 + i % 14, f"Lecteur {i}", "2024-11-01", None, "en_cours")
+
+    async def scenario():
+        async with AsyncBibliothequeDB(db.db_name) as adb:
+            tache = asyncio.create_task(adb.charger_en_masse(
+                "emprunts", emprunts(100_000),
+                colonnes=("livre_id", "emprunteur", "date_emprunt", "date_retour", "statut"),
+                taille_lot=1000))
+            assert await asyncio.to_thread(demarre.wait, 5)
+            await annuler(tache, delai=0)
+            assert adb.db.pool.statistiques()["empruntees"] == 0
+
+    asyncio.run(scenario())
+    # L'écriture commencée est allée à son terme
+    assert compter(db, "emprunts") == nb_emprunts + 100_000
+
+
+def titres_trouves(db, texte, **options):
+    return sorted(ligne[1] for ligne in db.rechercher_livres_plein_texte(texte, **options))
+
+
+def test_requete_fts():
+    assert requete_fts("harry pot") == '"harry" "pot"*'
+    assert requete_fts("harry pot", prefixe=False) == '"harry" "pot"'
+    assert requete_fts('"NEAR(a b)" OR c* -d') == '"NEAR" "a" "b" "OR" "c" "d"*'
+    assert requete_fts(" *-\"") == ""
+
+
+def test_recherche_plein_texte(db):
+    # Casse et accents ignorés
+    assert titres_trouves(db, "etranger") == ["L'Étranger"]
+    assert titres_trouves(db, "ÉTRANGER") == ["L'Étranger"]
+    # Le dernier mot est un préfixe, pas les autres
+    harry_potter = ["Harry Potter et la Chambre des secrets",
+                    "Harry Potter à l'école des sorciers"]
+    assert titres_trouves(db, "harry pot") == harry_potter
+    assert titres_trouves(db, "harry pot", prefixe=False) == []
+    assert titres_trouves(db, "har potter") == []
+    # Recherche aussi dans le nom de l'auteur
+    assert titres_trouves(db, "emile zola") == ["Germinal", "L'Assommoir"]
+    assert len(db.rechercher_livres_plein_texte("roman", limite=1)) <= 1
+
+
+def test_recherche_plein_texte_saisie_speciale(db):
+    for texte in ['"', '"harry', 'NEAR(harry potter)', 'harry OR', 'AND', '*', 'pot*',
+                  '-harry', 'harry -potter', '^harry', 'titre:harry', "l'", "", "   "]:
+        db.rechercher_livres_plein_texte(texte)
+    # Les opérateurs saisis restent du texte
+    assert titres_trouves(db, '"harry') == titres_trouves(db, "harry")
+    assert titres_trouves(db, "-harry") == titres_trouves(db, "harry")
+    assert titres_trouves(db, "harry OR germinal") == []
+    assert titres_trouves(db, "titre:peste") == []
+
+
+def test_recherche_plein_texte_mises_a_jour(db):
+    with db.transaction() as conn:
+        conn.execute("UPDATE livres SET titre = 'La Chute' WHERE titre = 'La Peste'")
+        conn.execute("UPDATE auteurs SET nom = 'Kamus' WHERE nom = 'Camus'")
+        ajouter_livre(conn, "isbn-nouveau", auteur_id=7)
+        conn.execute("DELETE FROM livres WHERE titre = 'Germinal'")
+    assert titres_trouves(db, "peste") == []
+    assert titres_trouves(db, "chute") == ["La Chute"]
+    assert titres_trouves(db, "camus") == []
+    assert titres_trouves(db, "kamus") == ["L'Étranger", "La Chute"]
+    assert titres_trouves(db, "germinal") == []
+    assert len(titres_trouves(db, "zola")) == 2
+
+
+def test_iterer_par_lots(db):
+    # Lecture paresseuse : une requête sans fin se parcourt lot par lot
+    lignes = db.iterer("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+                       "SELECT i FROM n", taille_lot=1000)
+    assert [ligne.i for ligne in itertools.islice(lignes, 2500)] == list(range(1, 2501))
+    assert db.pool.statistiques()["empruntees"] == 1
+    lignes.close()
+    assert db.pool.statistiques()["empruntees"] == 0
+
+    # Noms invalides ou en double renommés, accès par position inchangé
+    lignes = list(db.iterer("SELECT COUNT(*), auteur_id, auteur_id FROM livres "
+                            "GROUP BY auteur_id ORDER BY auteur_id", taille_lot=2))
+    assert lignes[0]._fields == ("_0", "auteur_id", "_2")
+    assert [tuple(ligne) for ligne in lignes] == [(2, i, i) for i in range(1, 8)]
+
+    # fabrique remplace les tuples nommés
+    lignes = list(db.iterer("SELECT titre, annee_publication FROM livres WHERE auteur_id = ?",
+                            (2,), taille_lot=1, fabrique=sqlite3.Row))
+    assert all(isinstance(ligne, sqlite3.Row) for ligne in lignes)
+    assert [ligne["titre"] for ligne in lignes] == ["L'Étranger", "La Peste"]
+    assert db.pool.statistiques()["empruntees"] == 0
+
+
+def test_iterer_comme_fetchall(db):
+    with db.connexion() as conn:
+        emprunts = conn.execute("SELECT * FROM emprunts").fetchall()
+    paires = [
+        (db.iterer_livres, (), db.afficher_tous_livres()),
+        (db.iterer_livres_par_auteur, (6,), db.livres_par_auteur(6)),
+        (db.iterer_livres_apres_annee, (1900,), db.livres_apres_annee(1900)),
+        (db.iterer_emprunts, (), emprunts),
+        (db.iterer_emprunts_en_cours, (), db.emprunts_en_cours()),
+        (db.iterer_livres_avec_auteurs, (), db.livres_avec_auteurs()),
+        (db.iterer_emprunts_avec_details, (), db.emprunts_avec_details()),
+        (db.iterer_emprunts_par_periode, ("2024-11-",), db.emprunts_par_periode("2024-11-")),
+    ]
+    for iterer, args, attendu in paires:
+        assert attendu
+        for taille_lot in (1, 3, 1000):
+            assert list(map(tuple, iterer(*args, taille_lot=taille_lot))) == attendu, iterer.__name__
+
+
+def test_exporter_emprunts_csv(db, tmp_path):
+    chemin = tmp_path / "emprunts.csv"
+    assert db.exporter_emprunts_csv(chemin, taille_lot=3) == 7
+    with open(chemin, newline="", encoding="utf-8") as f:
+        lignes = list(csv.reader(f))
+    assert lignes[0] == ["emprunteur", "titre", "nom", "prenom", "date_emprunt", "statut"]
+    assert lignes[1:] == [list(ligne) for ligne in db.emprunts_avec_details()]
+
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM emprunts")
+    assert db.exporter_emprunts_csv(chemin) == 0
+    assert chemin.read_text(encoding="utf-8") == ""
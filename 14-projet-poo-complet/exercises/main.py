@@ -18,6 +18,9 @@ Implémentez toutes les classes demandées avec :
 - Documentation (docstrings)
 """
 
+from array import array
+from datetime import date
+
 # ============================================================
 # PROJET 1 - SYSTÈME DE GESTION DE BIBLIOTHÈQUE
 # ============================================================
@@ -76,23 +79,48 @@ class Membre:
         pass
 
 
+TARIF_PENALITE = 0.50  # € par jour de retard
+
+
+def penalites_lot(jours_retard, tarif=TARIF_PENALITE):
+    """
+    Calcule en un appel les pénalités d'un tableau de jours de retard.
+    
+    Les valeurs négatives (rendu en avance) donnent 0. Avec NumPy on
+    obtient un ndarray : un million d'emprunts se recalculent en quelques
+    millisecondes. Sans NumPy, le repli array('d') fait une boucle Python
+    par emprunt, aussi coûteuse que calculer_penalite() sur chacun.
+    """
+    try:
+        import numpy as np
+        return np.maximum(np.asarray(jours_retard), 0) * tarif
+    except ImportError:
+        return array("d", [j * tarif if j > 0 else 0.0 for j in jours_retard])
+
+
 class Emprunt:
     """Représente un emprunt de livre."""
     
     def __init__(self, livre, membre, date_emprunt, date_retour_prevue):
-        # À compléter
-        pass
-    
-    def calculer_penalite(self):
+        self.livre = livre
+        self.membre = membre
+        self.date_emprunt = date_emprunt
+        self.date_retour_prevue = date_retour_prevue
+        self.date_retour_reel = None
+    
+    def jours_retard(self, date_reference=None):
+        """Jours de retard (négatif si en avance), au retour ou à date_reference"""
+        fin = self.date_retour_reel or date_reference or date.today()
+        return (fin - self.date_retour_prevue).days
+    
+    def calculer_penalite(self, date_reference=None):
         """Calcule la pénalité (0.50€ par jour de retard)"""
-        # À compléter
-        pass
+        return max(0, self.jours_retard(date_reference)) * TARIF_PENALITE
     
     @property
     def est_en_retard(self):
         """Vérifie si l'emprunt est en retard"""
-        # À compléter
-        pass
+        return self.jours_retard() > 0
     
     def __str__(self):
         """Affichage formaté de l'emprunt"""
@@ -100,6 +128,20 @@ class Emprunt:
         pass
 
 
+def calculer_penalites(emprunts, date_reference=None):
+    """
+    Version par lot de Emprunt.calculer_penalite() : une liste
+    d'emprunts -> tableau de pénalités (voir penalites_lot()).
+    """
+    fin = (date_reference or date.today()).toordinal()
+    jours = array("i", [
+        (e.date_retour_reel.toordinal() if e.date_retour_reel else fin)
+        - e.date_retour_prevue.toordinal()
+        for e in emprunts
+    ])
+    return penalites_lot(jours)
+
+
 class Bibliotheque:
     """Gère l'ensemble de la bibliothèque."""
     
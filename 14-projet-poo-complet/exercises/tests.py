@@ -0,0 +1,54 @@
+from main import TARIF_PENALITE, Emprunt, calculer_penalites, penalites_lot
+from array import array
+from datetime import date, timedelta
+import sys
+
+import pytest
+
+
+REFERENCE = date(2024, 11, 20)
+
+
+def emprunts_varies():
+    """Emprunts rendus ou non, en avance, à la date prévue ou en retard"""
+    emprunts = []
+    for ecart in (-30, -1, 0, 1, 2, 15, 400):
+        rendu = Emprunt("livre", "membre", date(2024, 1, 1), REFERENCE - timedelta(days=ecart))
+        en_cours = Emprunt("livre", "membre", date(2024, 1, 1), REFERENCE - timedelta(days=ecart))
+        rendu.date_retour_reel = REFERENCE + timedelta(days=3)
+        emprunts += [rendu, en_cours]
+    return emprunts
+
+
+def verifier_penalites():
+    emprunts = emprunts_varies()
+    attendu = [e.calculer_penalite(REFERENCE) for e in emprunts]
+    assert list(calculer_penalites(emprunts, REFERENCE)) == attendu
+    assert attendu[1::2] == [0, 0, 0, 0.5, 1.0, 7.5, 200.0]  # emprunts en cours
+
+    jours = [-5, -1, 0, 1, 2, 10]
+    assert list(penalites_lot(array("i", jours))) == [max(j, 0) * TARIF_PENALITE for j in jours]
+    assert list(penalites_lot(jours, tarif=2.0)) == [0, 0, 0, 2.0, 4.0, 20.0]
+    assert list(calculer_penalites([], REFERENCE)) == []
+
+
+def test_penalites_sans_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)  # import numpy -> ImportError
+    assert isinstance(penalites_lot([1, 2]), array)
+    verifier_penalites()
+
+
+def test_penalites_numpy():
+    np = pytest.importorskip("numpy")
+    assert isinstance(penalites_lot([1, 2]), np.ndarray)
+    verifier_penalites()
+
+
+def test_emprunt_en_retard():
+    emprunt = Emprunt("livre", "membre", date.today() - timedelta(days=20),
+                      date.today() - timedelta(days=6))
+    assert emprunt.est_en_retard
+    assert emprunt.jours_retard() == 6
+    emprunt.date_retour_reel = date.today() - timedelta(days=7)
+    assert not emprunt.est_en_retard
+    assert emprunt.calculer_penalite() == 0
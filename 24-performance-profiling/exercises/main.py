@@ -1,9 +1,29 @@
 # Écrivez votre code ici !
 # Consultez le fichier instructions.md pour les consignes
 
+import bisect
+import csv
+import hashlib
+import heapq
+import json
+import marshal
+import math
+import os
+import pickle
+import platform
+import random
+import shelve
+import signal
+import statistics
+import sys
+import tempfile
+import threading
 import timeit
 import time
-from functools import lru_cache
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial, wraps
+from itertools import compress
 
 # ============= PARTIE 1 : TIMEIT =============
 
@@ -11,15 +31,15 @@ from functools import lru_cache
 def exemple_timeit():
     """Exemples d'utilisation de timeit"""
     
-    # Mesurer une expression simple
-    temps = timeit.timeit("'-'.join(str(n) for n in range(100))", number=10000)
-    print(f"Generator expression : {temps:.4f}s")
+    # Mesurer une expression simple (number calibré par autorange)
+    mesure = mesurer("'-'.join(str(n) for n in range(100))")
+    print(f"Generator expression : {formater_mesure(mesure)}")
     
-    temps = timeit.timeit("'-'.join([str(n) for n in range(100)])", number=10000)
-    print(f"List comprehension : {temps:.4f}s")
+    mesure = mesurer("'-'.join([str(n) for n in range(100)])")
+    print(f"List comprehension : {formater_mesure(mesure)}")
     
-    temps = timeit.timeit("'-'.join(map(str, range(100)))", number=10000)
-    print(f"Map : {temps:.4f}s")
+    mesure = mesurer("'-'.join(map(str, range(100)))")
+    print(f"Map : {formater_mesure(mesure)}")
 
 
 # Fonction de timing réutilisable
@@ -158,6 +178,148 @@ def crible_numpy(n):
         return crible_eratosthene(n)
 
 
+# Version 5 : Crible segmenté (streaming)
+def _cribler_segment(debut, fin, base):
+    """
+    Crible les nombres impairs de [debut, fin[ (debut impair).
+
+    Retourne un bytearray où l'octet i vaut 1 si debut + 2*i est premier.
+    """
+    taille = (fin - debut + 1) // 2
+    segment = bytearray(b"\x01") * taille
+    for p in base:
+        carre = p * p
+        if carre >= fin:
+            break
+        # Premier multiple impair de p dans le segment
+        multiple = max(carre, (debut + p - 1) // p * p)
+        if multiple % 2 == 0:
+            multiple += p
+        i = (multiple - debut) // 2
+        # Deux multiples impairs consécutifs sont espacés de 2p, soit p octets
+        segment[i::p] = bytes(len(range(i, taille, p)))
+    return segment
+
+
+def crible_segmente(n, taille_segment=1 << 15):
+    """
+    Crible d'Ératosthène segmenté - Générateur de nombres premiers <= n
+
+    Seuls les impairs sont stockés (un octet chacun) et le crible avance
+    par segments de `taille_segment` impairs, dimensionnés pour rester en
+    cache. La mémoire utilisée est O(sqrt(n)) : on peut parcourir les
+    premiers jusqu'à 10^10 sans jamais les avoir tous en mémoire.
+    """
+    if n < 2:
+        return
+    yield 2
+
+    # Premiers impairs <= sqrt(n) : les seuls nécessaires pour cribler
+    base = crible_eratosthene(max(math.isqrt(n), 2))[1:]
+
+    debut = 3
+    while debut <= n:
+        fin = min(debut + 2 * taille_segment, n + 1)
+        segment = _cribler_segment(debut, fin, base)
+        yield from compress(range(debut, fin, 2), segment)
+        debut = fin
+
+
+# Version 6 : Crible parallèle (multi-cœurs)
+_BASE_PREMIERS = []
+
+
+def _initialiser_worker_crible(base):
+    """Reçoit une seule fois par processus les premiers de base partagés"""
+    global _BASE_PREMIERS
+    _BASE_PREMIERS = base
+
+
+def _cribler_plage(tache):
+    """
+    Crible une plage [debut, fin[ dans un processus worker.
+
+    Selon le mode, retourne seulement le nombre de premiers, leur somme,
+    ou les octets du crible (1 octet par impair) : jamais une liste d'entiers.
+    """
+    debut, fin, mode, taille_segment = tache
+    total = 0
+    octets = bytearray()
+    for d in range(debut, fin, 2 * taille_segment):
+        f = min(d + 2 * taille_segment, fin)
+        segment = _cribler_segment(d, f, _BASE_PREMIERS)
+        if mode == "compter":
+            total += segment.count(1)
+        elif mode == "somme":
+            total += sum(compress(range(d, f, 2), segment))
+        else:
+            octets += segment
+    return total if mode != "premiers" else bytes(octets)
+
+
+def _executer_plages(n, mode, max_workers, taille_tache, taille_segment):
+    """
+    Découpe [3, n] en plages et les crible sur un ProcessPoolExecutor.
+
+    Génère les couples ((debut, fin), resultat) dans l'ordre des plages.
+    Le nombre de tâches en vol est borné pour ne pas accumuler de résultats.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    base = crible_eratosthene(max(math.isqrt(n), 2))[1:]
+    taches = (
+        (debut, min(debut + 2 * taille_tache, n + 1), mode, taille_segment)
+        for debut in range(3, n + 1, 2 * taille_tache)
+    )
+
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_initialiser_worker_crible,
+                             initargs=(base,)) as executor:
+        en_cours = deque()
+        for tache in taches:
+            en_cours.append((tache, executor.submit(_cribler_plage, tache)))
+            if len(en_cours) >= 2 * max_workers:
+                tache_finie, future = en_cours.popleft()
+                yield tache_finie[:2], future.result()
+        while en_cours:
+            tache_finie, future = en_cours.popleft()
+            yield tache_finie[:2], future.result()
+
+
+def compter_premiers_parallele(n, max_workers=None, taille_tache=1 << 22,
+                               taille_segment=1 << 15):
+    """Nombre de premiers <= n, calculé sur plusieurs cœurs"""
+    if n < 2:
+        return 0
+    return 1 + sum(nombre for _, nombre in _executer_plages(
+        n, "compter", max_workers, taille_tache, taille_segment))
+
+
+def somme_premiers_parallele(n, max_workers=None, taille_tache=1 << 22,
+                             taille_segment=1 << 15):
+    """Somme des premiers <= n, calculée sur plusieurs cœurs"""
+    if n < 2:
+        return 0
+    return 2 + sum(somme for _, somme in _executer_plages(
+        n, "somme", max_workers, taille_tache, taille_segment))
+
+
+def premiers_parallele(n, max_workers=None, taille_tache=1 << 20,
+                       taille_segment=1 << 15):
+    """
+    Générateur des premiers <= n, criblés sur plusieurs cœurs.
+
+    Les workers renvoient un octet par impair (bien plus compact à
+    transférer qu'une liste d'entiers) et les premiers sont reconstruits
+    ici, dans l'ordre.
+    """
+    if n < 2:
+        return
+    yield 2
+    for (debut, fin), octets in _executer_plages(
+            n, "premiers", max_workers, taille_tache, taille_segment):
+        yield from compress(range(debut, fin, 2), octets)
+
+
 # ============= PROFILING AVEC cProfile =============
 
 def fibonacci_lent(n):
@@ -175,6 +337,85 @@ def fibonacci_rapide(n):
     return fibonacci_rapide(n-1) + fibonacci_rapide(n-2)
 
 
+def fibonacci_iteratif(n):
+    """Fibonacci itératif O(n) (comme le générateur du module 20)"""
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+
+def _fibonacci_paire(n, modulo=None):
+    """
+    Retourne (F(n), F(n+1)) par doublement rapide, en O(log n) étapes.
+
+    Formules : F(2k) = F(k) * (2*F(k+1) - F(k))
+               F(2k+1) = F(k)² + F(k+1)²
+    Les bits de n sont parcourus du poids fort au poids faible : pas de
+    récursion, donc pas de limite de profondeur.
+    """
+    if n < 0:
+        raise ValueError("n doit être positif")
+    if modulo is not None and modulo < 1:
+        raise ValueError(f"modulo doit valoir au moins 1 (reçu {modulo})")
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if modulo is not None:
+            c %= modulo
+            d %= modulo
+        if bit == "1":
+            a, b = d, c + d
+            if modulo is not None:
+                b %= modulo
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fibonacci_doublement(n, modulo=None):
+    """Fibonacci O(log n) par doublement rapide, éventuellement modulo m"""
+    return _fibonacci_paire(n, modulo)[0]
+
+
+def fibonacci_lot(indices, modulo=None, ecart_lineaire=64):
+    """
+    Calcule F(i) pour plusieurs indices en une passe.
+
+    Les indices sont traités dans l'ordre croissant en partant du
+    précédent : un petit écart est parcouru pas à pas, un grand écart g
+    est franchi avec (F(g), F(g+1)) et la formule d'addition
+    F(k+g) = F(k)F(g+1) + F(k+1)F(g) - F(k)F(g).
+    Retourne les résultats dans l'ordre des indices donnés.
+    """
+    if modulo is not None and modulo < 1:
+        raise ValueError(f"modulo doit valoir au moins 1 (reçu {modulo})")
+    resultats = {}
+    k, a, b = 0, 0, 1  # a = F(k), b = F(k+1)
+    if modulo is not None:
+        # État réduit dès le départ : F(1) = 1 vaut 0 modulo 1
+        a, b = a % modulo, b % modulo
+    for i in sorted(set(indices)):
+        if i < 0:
+            raise ValueError("les indices doivent être positifs")
+        ecart = i - k
+        if ecart <= ecart_lineaire:
+            for _ in range(ecart):
+                a, b = b, a + b
+                if modulo is not None:
+                    a, b = a % modulo, b % modulo
+        else:
+            fg, fg1 = _fibonacci_paire(ecart, modulo)
+            a, b = a * fg1 + (b - a) * fg, b * fg1 + a * fg
+            if modulo is not None:
+                a %= modulo
+                b %= modulo
+        k = i
+        resultats[i] = a
+    return [resultats[i] for i in indices]
+
+
 def calcul_lourd():
     """Fonction pour profiling"""
     total = 0
@@ -183,6 +424,351 @@ def calcul_lourd():
     return total
 
 
+# ============= MÉMOÏSATION BORNÉE (LRU/LFU, TTL) =============
+
+class CacheBorne:
+    """
+    Cache borné pour la mémoïsation, thread-safe.
+
+    - politique : "lru" (moins récemment utilisé) ou "lfu" (moins
+      fréquemment utilisé, à égalité le plus ancien) ;
+    - maxsize : nombre maximal d'entrées en mémoire (None = illimité) ;
+    - ttl : durée de vie d'une entrée en secondes (None = pas d'expiration) ;
+    - memoire_max : budget mémoire estimé des valeurs, en octets ;
+    - disque : chemin d'un fichier shelve servant de second niveau. Les
+      entrées évincées de la mémoire y sont écrites et y sont relues en
+      cas de défaut en mémoire.
+    """
+
+    def __init__(self, maxsize=128, politique="lru", ttl=None,
+                 memoire_max=None, disque=None):
+        if politique not in ("lru", "lfu"):
+            raise ValueError("politique doit valoir 'lru' ou 'lfu'")
+        self.maxsize = maxsize
+        self.politique = politique
+        self.ttl = ttl
+        self.memoire_max = memoire_max
+        self.chemin_disque = disque
+        self._disque = None
+        self._verrou = threading.RLock()
+        self._initialiser()
+
+    def _initialiser(self):
+        # cle -> [valeur, expiration, taille, frequence]
+        self._entrees = OrderedDict()
+        # LFU : frequence -> cles (ordre d'insertion = ancienneté)
+        self._frequences = defaultdict(OrderedDict)
+        self._freq_min = 0
+        self.memoire = 0
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self.hits_disque = 0
+
+    # --- Second niveau (disque) ---
+
+    def _ouvrir_disque(self):
+        if self._disque is None and self.chemin_disque:
+            self._disque = shelve.open(self.chemin_disque)
+        return self._disque
+
+    @staticmethod
+    def _cle_disque(cle):
+        return hashlib.sha1(pickle.dumps(cle)).hexdigest()
+
+    # --- Gestion des entrées en mémoire ---
+
+    def _toucher(self, cle, entree):
+        """Met à jour l'ordre LRU ou la fréquence LFU après un accès"""
+        if self.politique == "lru":
+            self._entrees.move_to_end(cle)
+            return
+        freq = entree[3]
+        del self._frequences[freq][cle]
+        if not self._frequences[freq]:
+            del self._frequences[freq]
+            if self._freq_min == freq:
+                self._freq_min = freq + 1
+        entree[3] = freq + 1
+        self._frequences[freq + 1][cle] = None
+
+    def _retirer(self, cle):
+        entree = self._entrees.pop(cle)
+        self.memoire -= entree[2]
+        if self.politique == "lfu":
+            bucket = self._frequences[entree[3]]
+            del bucket[cle]
+            if not bucket:
+                del self._frequences[entree[3]]
+                if self._frequences:
+                    self._freq_min = min(self._frequences)
+        return entree
+
+    def _evincer(self):
+        """Évince une entrée selon la politique, vers le disque si configuré"""
+        if self.politique == "lru":
+            cle = next(iter(self._entrees))
+        else:
+            cle = next(iter(self._frequences[self._freq_min]))
+        valeur, expiration, _, _ = self._retirer(cle)
+        self.evictions += 1
+        disque = self._ouvrir_disque()
+        if disque is not None:
+            disque[self._cle_disque(cle)] = (valeur, expiration)
+
+    def _expiree(self, expiration):
+        return expiration is not None and time.monotonic() >= expiration
+
+    # --- API ---
+
+    def obtenir(self, cle):
+        """Retourne (trouvé, valeur)"""
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is not None:
+                if not self._expiree(entree[1]):
+                    self.hits += 1
+                    self._toucher(cle, entree)
+                    return True, entree[0]
+                self._retirer(cle)
+                self.expirations += 1
+
+            disque = self._ouvrir_disque()
+            if disque is not None:
+                cle_disque = self._cle_disque(cle)
+                stocke = disque.get(cle_disque)
+                if stocke is not None:
+                    del disque[cle_disque]
+                    valeur, expiration = stocke
+                    if not self._expiree(expiration):
+                        self.hits_disque += 1
+                        self._inserer(cle, valeur, expiration)
+                        return True, valeur
+                    self.expirations += 1
+
+            self.misses += 1
+            return False, None
+
+    def stocker(self, cle, valeur):
+        with self._verrou:
+            if cle in self._entrees:
+                self._retirer(cle)
+            expiration = None if self.ttl is None else time.monotonic() + self.ttl
+            self._inserer(cle, valeur, expiration)
+
+    def _inserer(self, cle, valeur, expiration):
+        taille = _taille_element(valeur) if self.memoire_max is not None else 0
+        if self.memoire_max is not None and taille > self.memoire_max:
+            return  # Trop gros pour le cache : jamais conservé
+        if self.maxsize == 0:
+            return
+        # Place faite avant l'insertion : en LFU, la nouvelle entrée (une
+        # seule utilisation) serait sinon toujours la première évincée
+        while self._entrees and (
+                (self.maxsize is not None and len(self._entrees) >= self.maxsize)
+                or (self.memoire_max is not None and self.memoire + taille > self.memoire_max)):
+            self._evincer()
+        self._entrees[cle] = [valeur, expiration, taille, 1]
+        self.memoire += taille
+        if self.politique == "lfu":
+            self._frequences[1][cle] = None
+            self._freq_min = 1
+
+    def infos(self):
+        """Compteurs du cache (équivalent de cache_info() de lru_cache)"""
+        with self._verrou:
+            return {
+                "hits": self.hits,
+                "hits_disque": self.hits_disque,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "taille": len(self._entrees),
+                "memoire": self.memoire,
+                "maxsize": self.maxsize,
+            }
+
+    def vider(self):
+        """Vide le cache (mémoire et disque) et remet les compteurs à zéro"""
+        with self._verrou:
+            self._initialiser()
+            disque = self._ouvrir_disque()
+            if disque is not None:
+                disque.clear()
+
+    def fermer(self):
+        """Ferme le fichier du second niveau"""
+        with self._verrou:
+            if self._disque is not None:
+                self._disque.close()
+                self._disque = None
+
+
+# Sépare les arguments positionnels des arguments nommés dans les clés :
+# f(('a',), (('k', 1),)) et f('a', k=1) ne doivent pas partager une entrée
+_MARQUE_KWARGS = (object(),)
+
+
+def memoiser(maxsize=128, politique="lru", ttl=None, memoire_max=None, disque=None):
+    """
+    Décorateur de mémoïsation borné, généralisant @lru_cache.
+
+    Voir CacheBorne pour les paramètres. Comme lru_cache, la fonction
+    décorée expose cache_info() et cache_clear().
+    """
+    def decorateur(func):
+        cache = CacheBorne(maxsize, politique, ttl, memoire_max, disque)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cle = args + _MARQUE_KWARGS + tuple(sorted(kwargs.items())) if kwargs else args
+            trouve, valeur = cache.obtenir(cle)
+            if trouve:
+                return valeur
+            valeur = func(*args, **kwargs)
+            cache.stocker(cle, valeur)
+            return valeur
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.infos
+        wrapper.cache_clear = cache.vider
+        return wrapper
+    return decorateur
+
+
+@memoiser(maxsize=1000)
+def fibonacci_borne(n):
+    """Fibonacci avec cache LRU borné à 1000 entrées"""
+    if n <= 1:
+        return n
+    return fibonacci_borne(n-1) + fibonacci_borne(n-2)
+
+
+@memoiser(maxsize=256, politique="lfu", ttl=3600)
+def compter_premiers(n):
+    """Nombre de premiers <= n, mis en cache (LFU, expiration après 1h)"""
+    return sum(1 for _ in crible_segmente(n))
+
+
+# ============= PROFILER PAR ÉCHANTILLONNAGE =============
+
+class ProfileurEchantillonnage:
+    """
+    Profiler statistique à faible surcoût, utilisable en production.
+
+    Un thread de fond relève la pile de chaque thread via
+    sys._current_frames() toutes les `intervalle` secondes, au lieu
+    d'instrumenter chaque appel comme cProfile. Les piles sont agrégées
+    au format "collapsed" (a;b;c N), lisible par flamegraph.pl ou speedscope.
+
+    Utilisation :
+        with ProfileurEchantillonnage() as profileur:
+            calcul_lourd()
+        print(profileur.piles_repliees())
+    """
+
+    def __init__(self, intervalle=0.005, profondeur_max=128):
+        self.intervalle = intervalle
+        self.profondeur_max = profondeur_max
+        self.piles = Counter()
+        self.echantillons = 0
+        self._actif = threading.Event()
+        self._arret = threading.Event()
+        self._thread = None
+        self._verrou = threading.Lock()
+
+    @staticmethod
+    def _nom_frame(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _echantillonner(self):
+        moi = threading.get_ident()
+        for tid, frame in sys._current_frames().items():
+            if tid == moi:
+                continue
+            pile = []
+            while frame is not None and len(pile) < self.profondeur_max:
+                pile.append(self._nom_frame(frame))
+                frame = frame.f_back
+            pile.reverse()
+            with self._verrou:
+                self.piles[";".join(pile)] += 1
+        self.echantillons += 1
+
+    def _boucle(self):
+        while not self._arret.is_set():
+            self._actif.wait()
+            if self._arret.wait(self.intervalle):
+                break
+            if self._actif.is_set():
+                self._echantillonner()
+
+    def demarrer(self):
+        """Démarre (ou reprend) l'échantillonnage"""
+        if self._thread is None or not self._thread.is_alive():
+            self._arret.clear()
+            self._thread = threading.Thread(target=self._boucle, daemon=True,
+                                            name="profileur-echantillonnage")
+            self._thread.start()
+        self._actif.set()
+
+    def suspendre(self):
+        """Met l'échantillonnage en pause sans arrêter le thread"""
+        self._actif.clear()
+
+    def arreter(self):
+        """Arrête le thread d'échantillonnage"""
+        self._arret.set()
+        self._actif.set()  # Débloque le thread s'il était en pause
+        if self._thread is not None:
+            self._thread.join()
+        self._actif.clear()
+
+    @property
+    def actif(self):
+        return self._actif.is_set() and not self._arret.is_set()
+
+    def basculer(self, *_):
+        """Active/désactive l'échantillonnage (utilisable comme handler de signal)"""
+        if self.actif:
+            self.suspendre()
+        else:
+            self.demarrer()
+
+    def installer_signal(self, signum=None):
+        """
+        Bascule le profiler à la réception d'un signal (SIGUSR1 par défaut),
+        par exemple `kill -USR1 <pid>` sur un worker en production.
+        Unix uniquement, à appeler depuis le thread principal.
+        """
+        signal.signal(signum or signal.SIGUSR1, self.basculer)
+
+    def __enter__(self):
+        self.demarrer()
+        return self
+
+    def __exit__(self, *exc):
+        self.arreter()
+        return False
+
+    def piles_repliees(self):
+        """Piles au format collapsed : une ligne "f1;f2;f3 nombre" par pile"""
+        with self._verrou:
+            return "\n".join(f"{pile} {nombre}" for pile, nombre in self.piles.most_common())
+
+    def exporter(self, chemin):
+        """Écrit les piles repliées dans un fichier (entrée de flamegraph.pl)"""
+        with open(chemin, "w", encoding="utf-8") as f:
+            f.write(self.piles_repliees() + "\n")
+
+    def top(self, n=10):
+        """Fonctions les plus souvent en haut de pile (temps propre)"""
+        feuilles = Counter()
+        with self._verrou:
+            for pile, nombre in self.piles.items():
+                feuilles[pile.rsplit(";", 1)[-1]] += nombre
+        return feuilles.most_common(n)
+
+
 # ============= EXERCICES DE COMPLEXITÉ =============
 
 # O(1) - Constant
@@ -228,6 +814,38 @@ def binary_search(lst, target):
     return -1
 
 
+# O(m log n) - Recherche binaire par lot
+def recherche_binaire_lot(lst_triee, cibles, cote="left"):
+    """
+    Positions d'insertion de toutes les cibles dans une liste triée.
+
+    cote="left" donne la première position possible (bisect_left),
+    cote="right" la dernière (bisect_right). Utilise numpy.searchsorted
+    (un seul appel vectorisé) si NumPy est disponible, sinon bisect
+    appliqué par map (boucle en C, sans appel Python par cible).
+    Retourne une liste d'entiers dans les deux cas.
+    """
+    if cote not in ("left", "right"):
+        raise ValueError("cote doit valoir 'left' ou 'right'")
+    try:
+        import numpy as np
+        return np.searchsorted(np.asarray(lst_triee), np.asarray(cibles), side=cote).tolist()
+    except ImportError:
+        recherche = bisect.bisect_left if cote == "left" else bisect.bisect_right
+        return list(map(partial(recherche, lst_triee), cibles))
+
+
+def compter_dans_plages(lst_triee, debuts, fins):
+    """
+    Nombre d'éléments dans chaque plage [debut, fin] (bornes incluses).
+
+    Exemple : années de publication triées, combien de livres par siècle.
+    """
+    gauche = recherche_binaire_lot(lst_triee, debuts, "left")
+    droite = recherche_binaire_lot(lst_triee, fins, "right")
+    return [d - g for g, d in zip(gauche, droite)]
+
+
 # O(n log n) - Linéarithmique
 def merge_sort(lst):
     """O(n log n) - Tri fusion"""
@@ -259,6 +877,508 @@ def merge(left, right):
     return result
 
 
+# O(n log n) sans récursion ni listes intermédiaires
+def _detecter_runs(cles, valeurs):
+    """
+    Découpe la liste en séquences déjà triées (runs) et retourne leurs bornes.
+
+    Les runs strictement décroissants sont inversés sur place (strictement,
+    pour que le tri reste stable).
+    """
+    n = len(cles)
+    bornes = [0]
+    debut = 0
+    while debut < n:
+        fin = debut + 1
+        if fin < n and cles[fin] < cles[debut]:
+            while fin < n and cles[fin] < cles[fin - 1]:
+                fin += 1
+            cles[debut:fin] = cles[debut:fin][::-1]
+            if valeurs is not cles:
+                valeurs[debut:fin] = valeurs[debut:fin][::-1]
+        else:
+            while fin < n and not cles[fin] < cles[fin - 1]:
+                fin += 1
+        bornes.append(fin)
+        debut = fin
+    return bornes
+
+
+def _fusionner_runs(src_c, src_v, dst_c, dst_v, debut, milieu, fin):
+    """Fusionne src[debut:milieu] et src[milieu:fin] dans dst[debut:fin]"""
+    if not src_c[milieu] < src_c[milieu - 1]:
+        # Déjà dans l'ordre : simple copie
+        dst_c[debut:fin] = src_c[debut:fin]
+        if dst_v is not dst_c:
+            dst_v[debut:fin] = src_v[debut:fin]
+        return
+    i, j, k = debut, milieu, debut
+    while i < milieu and j < fin:
+        if src_c[j] < src_c[i]:
+            dst_c[k] = src_c[j]
+            dst_v[k] = src_v[j]
+            j += 1
+        else:
+            dst_c[k] = src_c[i]
+            dst_v[k] = src_v[i]
+            i += 1
+        k += 1
+    reste, fin_reste = (i, milieu) if i < milieu else (j, fin)
+    dst_c[k:fin] = src_c[reste:fin_reste]
+    if dst_v is not dst_c:
+        dst_v[k:fin] = src_v[reste:fin_reste]
+
+
+def merge_sort_iteratif(lst, key=None):
+    """
+    O(n log n) - Tri fusion ascendant naturel (stable)
+
+    Détecte les runs déjà triés puis les fusionne deux à deux en alternant
+    entre la liste de travail et un unique buffer auxiliaire : pas de
+    récursion, pas de slicing à chaque niveau. Avec key, les clés sont
+    calculées une seule fois et déplacées avec les valeurs.
+    """
+    valeurs = list(lst)
+    n = len(valeurs)
+    if n < 2:
+        return valeurs
+    cles = valeurs if key is None else [key(x) for x in valeurs]
+    bornes = _detecter_runs(cles, valeurs)
+
+    aux_v = [None] * n
+    aux_c = aux_v if key is None else [None] * n
+    while len(bornes) > 2:
+        nouvelles = [0]
+        for r in range(0, len(bornes) - 1, 2):
+            debut = bornes[r]
+            if r + 2 < len(bornes):
+                milieu, fin = bornes[r + 1], bornes[r + 2]
+                _fusionner_runs(cles, valeurs, aux_c, aux_v, debut, milieu, fin)
+            else:
+                # Run impair restant : recopié tel quel
+                fin = bornes[r + 1]
+                aux_c[debut:fin] = cles[debut:fin]
+                if key is not None:
+                    aux_v[debut:fin] = valeurs[debut:fin]
+            nouvelles.append(fin)
+        bornes = nouvelles
+        cles, aux_c = aux_c, cles
+        valeurs, aux_v = aux_v, valeurs
+    return valeurs
+
+
+def fusion_k_voies(sources, key=None):
+    """
+    Fusionne k itérables déjà triés en un seul flux trié (générateur).
+
+    Un tas de k éléments suffit : rien n'est matérialisé, on peut fusionner
+    directement des shards triés produits par des workers parallèles.
+    """
+    return heapq.merge(*sources, key=key)
+
+
+# ============= TRI EXTERNE (DONNÉES PLUS GRANDES QUE LA RAM) =============
+
+def _taille_element(element):
+    """Estimation grossière de la mémoire occupée par un élément"""
+    taille = sys.getsizeof(element)
+    if isinstance(element, (list, tuple)):
+        taille += sum(sys.getsizeof(x) for x in element)
+    return taille
+
+
+def _ecrire_run(elements, dossier):
+    """Écrit un run trié dans un fichier temporaire (format marshal)"""
+    with tempfile.NamedTemporaryFile("wb", dir=dossier, suffix=".run",
+                                     delete=False) as f:
+        for element in elements:
+            marshal.dump(element, f)
+    return f.name
+
+
+def _lire_run(chemin):
+    """Relit un run élément par élément, sans le charger en entier"""
+    with open(chemin, "rb", buffering=1 << 16) as f:
+        while True:
+            try:
+                yield marshal.load(f)
+            except EOFError:
+                return
+
+
+def tri_externe(elements, key=None, memoire_max=64 * 1024 * 1024,
+                fusion_max=64, dossier=None):
+    """
+    Tri externe : trie un flux plus grand que la mémoire (itérateur).
+
+    Les éléments sont accumulés jusqu'à `memoire_max` octets (estimés),
+    triés avec merge_sort_iteratif puis écrits sur disque en runs au
+    format marshal (compact, types de base : str, int, float, tuple,
+    list...). Les runs sont ensuite relus en flux et fusionnés par un tas
+    (fusion_k_voies), au plus `fusion_max` fichiers ouverts à la fois.
+
+    merge() fusionne deux listes en mémoire, sans key : il ne peut ni
+    trier les runs avec une clé ni fusionner des fichiers en flux, d'où
+    merge_sort_iteratif (sa version ascendante) et le tas k voies.
+    """
+    if fusion_max < 2:
+        raise ValueError(f"fusion_max doit valoir au moins 2 (reçu {fusion_max})")
+    return _tri_externe(elements, key, memoire_max, fusion_max, dossier)
+
+
+def _tri_externe(elements, key, memoire_max, fusion_max, dossier):
+    with tempfile.TemporaryDirectory(dir=dossier) as tmp:
+        runs = []
+        tampon = []
+        taille = 0
+        for element in elements:
+            tampon.append(element)
+            taille += _taille_element(element)
+            if taille >= memoire_max:
+                runs.append(_ecrire_run(merge_sort_iteratif(tampon, key=key), tmp))
+                tampon = []
+                taille = 0
+
+        tampon = merge_sort_iteratif(tampon, key=key)
+        if not runs:
+            # Tout tient en mémoire : pas de passage par le disque
+            yield from tampon
+            return
+        if tampon:
+            runs.append(_ecrire_run(tampon, tmp))
+        del tampon
+
+        # Passes de fusion intermédiaires si trop de runs pour les ouvrir
+        # ensemble (les groupes restent dans l'ordre : le tri reste stable)
+        while len(runs) > fusion_max:
+            fusionnes = []
+            for i in range(0, len(runs), fusion_max):
+                groupe = runs[i:i + fusion_max]
+                fusionnes.append(_ecrire_run(
+                    fusion_k_voies([_lire_run(r) for r in groupe], key=key), tmp))
+                for r in groupe:
+                    os.remove(r)
+            runs = fusionnes
+
+        yield from fusion_k_voies([_lire_run(r) for r in runs], key=key)
+
+
+def trier_csv(chemin_entree, chemin_sortie, colonne, convertir=None,
+              memoire_max=64 * 1024 * 1024):
+    """
+    Trie un fichier CSV (avec en-tête) selon une colonne, par tri externe.
+
+    convertir (int, float...) est appliqué à la colonne pour la comparaison.
+    """
+    with open(chemin_entree, newline="", encoding="utf-8") as f_in, \
+         open(chemin_sortie, "w", newline="", encoding="utf-8") as f_out:
+        lecteur = csv.reader(f_in)
+        entete = next(lecteur)
+        indice = entete.index(colonne)
+        if convertir is None:
+            cle = lambda ligne: ligne[indice]
+        else:
+            cle = lambda ligne: convertir(ligne[indice])
+
+        ecrivain = csv.writer(f_out)
+        ecrivain.writerow(entete)
+        ecrivain.writerows(tri_externe(lecteur, key=cle, memoire_max=memoire_max))
+
+
+# ============= HARNAIS DE BENCHMARK =============
+
+BENCHMARKS = {}
+
+
+def mesurer(stmt, repetitions=5, echauffement=1):
+    """
+    Mesure stmt (fonction sans argument ou chaîne) avec timeit.
+
+    Le nombre d'appels par répétition est calibré par Timer.autorange(),
+    quelques répétitions d'échauffement sont ignorées, puis on retourne
+    la médiane et l'écart interquartile (IQR) du temps par appel.
+    """
+    timer = timeit.Timer(stmt)
+    number, _ = timer.autorange()
+    for _ in range(echauffement):
+        timer.timeit(number=number)
+    temps = [t / number for t in timer.repeat(repeat=max(repetitions, 2), number=number)]
+    q1, _, q3 = statistics.quantiles(temps, n=4)
+    return {
+        "mediane": statistics.median(temps),
+        "iqr": q3 - q1,
+        "min": min(temps),
+        "repetitions": len(temps),
+        "number": number,
+    }
+
+
+def formater_mesure(mesure):
+    """Affiche une mesure : médiane ± IQR dans une unité lisible"""
+    for unite, facteur in (("s", 1), ("ms", 1e3), ("µs", 1e6), ("ns", 1e9)):
+        if mesure["mediane"] * facteur >= 1 or unite == "ns":
+            return (f"{mesure['mediane'] * facteur:.3f}{unite} "
+                    f"± {mesure['iqr'] * facteur:.3f}{unite}")
+
+
+def benchmark(tailles=(None,), nom=None):
+    """
+    Décorateur : enregistre un cas de benchmark dans BENCHMARKS.
+
+    La fonction décorée reçoit une taille d'entrée et retourne la fonction
+    sans argument à chronométrer : la préparation des données n'est pas mesurée.
+    """
+    def decorateur(func):
+        BENCHMARKS[nom or func.__name__] = (func, tuple(tailles))
+        return func
+    return decorateur
+
+
+def executer_benchmarks(noms=None, repetitions=5):
+    """Exécute les cas enregistrés pour chaque taille et retourne les résultats"""
+    resultats = {}
+    for nom, (cas, tailles) in BENCHMARKS.items():
+        if noms is not None and nom not in noms:
+            continue
+        resultats[nom] = {}
+        for taille in tailles:
+            mesure = mesurer(cas(taille), repetitions=repetitions)
+            resultats[nom][str(taille)] = mesure
+            print(f"{nom}[{taille}]: {formater_mesure(mesure)}")
+    return {
+        "python": platform.python_version(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "resultats": resultats,
+    }
+
+
+def sauvegarder_resultats(resultats, chemin):
+    """Sauvegarde des résultats de benchmark en JSON"""
+    with open(chemin, "w", encoding="utf-8") as f:
+        json.dump(resultats, f, indent=2)
+
+
+def charger_resultats(chemin):
+    """Charge des résultats de benchmark depuis un fichier JSON"""
+    with open(chemin, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def comparer_a_reference(resultats, reference, seuil=0.10):
+    """
+    Compare des résultats à une référence sauvegardée.
+
+    Un cas est en régression si sa médiane dépasse celle de la référence
+    de plus de `seuil` (10% par défaut) et de plus que le bruit mesuré
+    (somme des deux IQR). Retourne la liste des régressions.
+    """
+    regressions = []
+    for nom, par_taille in resultats["resultats"].items():
+        for taille, actuel in par_taille.items():
+            ref = reference["resultats"].get(nom, {}).get(taille)
+            if ref is None:
+                continue
+            ecart = actuel["mediane"] - ref["mediane"]
+            if ecart > max(seuil * ref["mediane"], ref["iqr"] + actuel["iqr"]):
+                regressions.append({
+                    "nom": nom,
+                    "taille": taille,
+                    "reference": ref["mediane"],
+                    "actuel": actuel["mediane"],
+                    "ratio": actuel["mediane"] / ref["mediane"],
+                })
+    return regressions
+
+
+def verifier_performances(chemin_reference="benchmarks_reference.json",
+                          seuil=0.10, noms=None):
+    """
+    Gate de régression : exécute les benchmarks et les compare à la référence.
+
+    Sans fichier de référence, les résultats courants deviennent la
+    référence. Retourne True si aucune régression n'est détectée.
+    """
+    print("\n=== Vérification des performances ===")
+    resultats = executer_benchmarks(noms)
+    if not os.path.exists(chemin_reference):
+        sauvegarder_resultats(resultats, chemin_reference)
+        print(f"Référence créée : {chemin_reference}")
+        return True
+
+    regressions = comparer_a_reference(resultats, charger_resultats(chemin_reference), seuil)
+    for r in regressions:
+        print(f"RÉGRESSION {r['nom']}[{r['taille']}]: "
+              f"{r['reference']*1e6:.2f}µs -> {r['actuel']*1e6:.2f}µs ({r['ratio']:.2f}x)")
+    if not regressions:
+        print("Aucune régression détectée")
+    return not regressions
+
+
+# Cas de benchmark des fonctions critiques du module
+def _donnees_aleatoires(n):
+    """Liste reproductible de n entiers aléatoires"""
+    rng = random.Random(42)
+    return [rng.randint(0, n) for _ in range(n)]
+
+
+@benchmark(tailles=[1000, 10000])
+def bench_merge_sort(n):
+    data = _donnees_aleatoires(n)
+    return lambda: merge_sort(data)
+
+
+@benchmark(tailles=[1000, 10000])
+def bench_merge_sort_iteratif(n):
+    data = _donnees_aleatoires(n)
+    return lambda: merge_sort_iteratif(data)
+
+
+@benchmark(tailles=[100, 500])
+def bench_bubble_sort(n):
+    data = _donnees_aleatoires(n)
+    return lambda: bubble_sort(data)
+
+
+@benchmark(tailles=[1000, 1000000])
+def bench_binary_search(n):
+    data = list(range(n))
+    return lambda: binary_search(data, n - 1)
+
+
+@benchmark(tailles=[1000, 100000])
+def bench_recherche_binaire_lot(n):
+    data = list(range(n))
+    cibles = _donnees_aleatoires(n)
+    return lambda: recherche_binaire_lot(data, cibles)
+
+
+@benchmark(tailles=[1000, 100000])
+def bench_get_first(n):
+    data = list(range(n))
+    return lambda: get_first(data)
+
+
+@benchmark(tailles=[1000, 100000])
+def bench_find_max(n):
+    data = _donnees_aleatoires(n)
+    return lambda: find_max(data)
+
+
+@benchmark(tailles=[1000, 100000])
+def bench_fibonacci_doublement(n):
+    return lambda: fibonacci_doublement(n)
+
+
+@benchmark(tailles=[10000, 1000000])
+def bench_crible_eratosthene(n):
+    return lambda: crible_eratosthene(n)
+
+
+@benchmark(tailles=[10000, 1000000])
+def bench_crible_segmente(n):
+    # deque(maxlen=0) consomme le générateur sans rien stocker
+    return lambda: deque(crible_segmente(n), maxlen=0)
+
+
+# ============= ESTIMATION DE COMPLEXITÉ =============
+
+# Classes candidates, de la plus lente à croître à la plus rapide
+CLASSES_COMPLEXITE = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log(n),
+    "O(n)": lambda n: float(n),
+    "O(n log n)": lambda n: n * math.log(n),
+    "O(n²)": lambda n: float(n) ** 2,
+    "O(n³)": lambda n: float(n) ** 3,
+}
+
+
+def _chronometrer(func, repetitions=5, budget=0.01):
+    """
+    Meilleur temps par appel de func, avec un calibrage léger.
+
+    Un appel d'essai fixe le nombre d'appels pour qu'une répétition dure
+    environ `budget` secondes (autorange viserait 0.2s, trop long pour
+    balayer plusieurs tailles).
+    """
+    timer = timeit.Timer(func)
+    essai = timer.timeit(number=1)
+    number = max(1, int(budget / essai)) if essai > 0 else 1000
+    return min(timer.repeat(repeat=repetitions, number=number)) / number
+
+
+def estimer_complexite(fabrique, n_min=1000, facteur=4, nb_tailles=5, repetitions=5):
+    """
+    Estime la classe de complexité d'une fonction.
+
+    fabrique(n) retourne la fonction sans argument à chronométrer sur une
+    entrée de taille n (même convention que @benchmark). Les tailles
+    suivent une série géométrique n_min, n_min*facteur, ...
+
+    Chaque classe g est ajustée par t ≈ a*g(n) en moindres carrés sur
+    l'erreur relative ; la meilleure est celle de plus petit résidu. La
+    confiance compare ce résidu à celui de la deuxième meilleure classe
+    (0 = indécidable, 1 = sans ambiguïté). L'exposant est la pente de
+    log(t) en fonction de log(n).
+    """
+    tailles = [n_min * facteur ** i for i in range(nb_tailles)]
+    temps = [_chronometrer(fabrique(n), repetitions) for n in tailles]
+
+    residus = {}
+    for classe, g in CLASSES_COMPLEXITE.items():
+        rapports = [g(n) / t for n, t in zip(tailles, temps)]
+        a = sum(rapports) / sum(r * r for r in rapports)
+        residus[classe] = sum((1 - a * r) ** 2 for r in rapports)
+
+    classement = sorted(residus, key=residus.get)
+    meilleure, seconde = classement[0], classement[1]
+    confiance = 1 - residus[meilleure] / residus[seconde] if residus[seconde] else 0.0
+
+    log_n = [math.log(n) for n in tailles]
+    log_t = [math.log(t) for t in temps]
+    moy_n, moy_t = statistics.fmean(log_n), statistics.fmean(log_t)
+    exposant = (sum((x - moy_n) * (y - moy_t) for x, y in zip(log_n, log_t))
+                / sum((x - moy_n) ** 2 for x in log_n))
+
+    return {
+        "classe": meilleure,
+        "confiance": confiance,
+        "exposant": exposant,
+        "residus": residus,
+        "tailles": tailles,
+        "temps": temps,
+    }
+
+
+def verifier_complexite(fabrique, maximum, **options):
+    """
+    Vérifie (en CI par exemple) qu'une fonction ne croît pas plus vite
+    que la classe `maximum`. Retourne (ok, estimation).
+    """
+    ordre = list(CLASSES_COMPLEXITE)
+    estimation = estimer_complexite(fabrique, **options)
+    ok = ordre.index(estimation["classe"]) <= ordre.index(maximum)
+    return ok, estimation
+
+
+def demo_complexite():
+    """Estime la complexité des fonctions d'exemple du module"""
+    
+    cas = [
+        ("get_first()", "O(1)", bench_get_first, {}),
+        ("find_max()", "O(n)", bench_find_max, {}),
+        ("bubble_sort()", "O(n²)", bench_bubble_sort, {"n_min": 64, "facteur": 2}),
+        ("binary_search()", "O(log n)", bench_binary_search, {}),
+        ("merge_sort()", "O(n log n)", bench_merge_sort, {}),
+    ]
+    
+    for nom, attendue, fabrique, options in cas:
+        estimation = estimer_complexite(fabrique, **options)
+        print(f"{nom}: attendu {attendue}, estimé {estimation['classe']} "
+              f"(confiance {estimation['confiance']:.0%}, "
+              f"exposant {estimation['exposant']:.2f})")
+
+
 # ============= TESTS ET BENCHMARKS =============
 
 def comparer_performances():
@@ -266,20 +1386,18 @@ def comparer_performances():
     
     print("=== Comparaison String Join ===")
     for func in [methode1_concat_string, methode2_join, methode3_list_join]:
-        temps = timeit.timeit(func, number=100)
-        print(f"{func.__name__}: {temps:.4f}s")
+        print(f"{func.__name__}: {formater_mesure(mesurer(func))}")
     
     print("\n=== Comparaison List Comprehension ===")
     for func in [avec_boucle, avec_comprehension, avec_map]:
-        temps = timeit.timeit(func, number=1000)
-        print(f"{func.__name__}: {temps:.4f}s")
+        print(f"{func.__name__}: {formater_mesure(mesurer(func))}")
     
     print("\n=== Comparaison Membership ===")
-    temps_list = timeit.timeit(test_list_membership, number=10000)
-    temps_set = timeit.timeit(test_set_membership, number=10000)
-    print(f"List: {temps_list:.4f}s")
-    print(f"Set: {temps_set:.4f}s")
-    print(f"Set est {temps_list/temps_set:.1f}x plus rapide")
+    mesure_list = mesurer(test_list_membership)
+    mesure_set = mesurer(test_set_membership)
+    print(f"List: {formater_mesure(mesure_list)}")
+    print(f"Set: {formater_mesure(mesure_set)}")
+    print(f"Set est {mesure_list['mediane']/mesure_set['mediane']:.1f}x plus rapide")
 
 
 def benchmark_nombres_premiers():
@@ -289,9 +1407,35 @@ def benchmark_nombres_premiers():
     n = 1000
     
     for func in [trouver_nombres_premiers_v1, trouver_nombres_premiers_v2, 
-                 crible_eratosthene]:
-        temps = timeit.timeit(lambda: func(n), number=10)
-        print(f"{func.__name__}: {temps:.4f}s")
+                 crible_eratosthene, crible_numpy, crible_segmente]:
+        # list() consomme le générateur de crible_segmente
+        mesure = mesurer(lambda: list(func(n)))
+        print(f"{func.__name__}: {formater_mesure(mesure)}")
+    
+    print("\n=== Cribles sur de grands n (n=1000000) ===")
+    n = 1000000
+    
+    for func in [crible_eratosthene, crible_numpy, crible_segmente]:
+        mesure = mesurer(lambda: list(func(n)), repetitions=3)
+        print(f"{func.__name__}: {formater_mesure(mesure)}")
+
+
+def benchmark_crible_parallele(n=10**8):
+    """Accélération du comptage de premiers selon le nombre de cœurs"""
+    
+    print(f"\n=== Crible parallèle (n={n}) ===")
+    
+    start = time.perf_counter()
+    nombre = compter_premiers_parallele(n, max_workers=1)
+    temps_un = time.perf_counter() - start
+    print(f"1 worker: {nombre} premiers en {temps_un:.4f}s")
+    
+    workers = os.cpu_count() or 1
+    start = time.perf_counter()
+    nombre = compter_premiers_parallele(n, max_workers=workers)
+    temps_tous = time.perf_counter() - start
+    print(f"{workers} workers: {nombre} premiers en {temps_tous:.4f}s")
+    print(f"Accélération: {temps_un/temps_tous:.1f}x")
 
 
 def demo_profiling():
@@ -312,6 +1456,37 @@ def demo_profiling():
     stats.print_stats(10)
 
 
+def demo_profiling_echantillonnage():
+    """Surcoût de cProfile comparé au profiler par échantillonnage"""
+    
+    print("\n=== Profiling par échantillonnage ===")
+    import cProfile
+    
+    def charge():
+        return trouver_nombres_premiers_v2(150000)
+    
+    start = time.perf_counter()
+    charge()
+    temps_base = time.perf_counter() - start
+    
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.runcall(charge)
+    temps_cprofile = time.perf_counter() - start
+    
+    with ProfileurEchantillonnage(intervalle=0.005) as profileur:
+        start = time.perf_counter()
+        charge()
+        temps_echantillon = time.perf_counter() - start
+    
+    print(f"Sans profiler: {temps_base:.4f}s")
+    print(f"cProfile: {temps_cprofile:.4f}s (+{(temps_cprofile/temps_base - 1)*100:.0f}%)")
+    print(f"Échantillonnage: {temps_echantillon:.4f}s "
+          f"(+{(temps_echantillon/temps_base - 1)*100:.0f}%, {profileur.echantillons} échantillons)")
+    for fonction, nombre in profileur.top(3):
+        print(f"  {nombre:5d}  {fonction}")
+
+
 def demo_memoization():
     """Démonstration de la memoization"""
     
@@ -329,6 +1504,47 @@ def demo_memoization():
     temps_rapide = time.time() - start
     print(f"Avec cache (n=30): {temps_rapide:.4f}s")
     print(f"Amélioration: {temps_lent/temps_rapide:.0f}x plus rapide")
+    
+    # Avec cache borné
+    start = time.time()
+    result = fibonacci_borne(30)
+    temps_borne = time.time() - start
+    print(f"Avec cache borné (n=30): {temps_borne:.4f}s")
+    print(f"Infos cache borné: {fibonacci_borne.cache_info()}")
+
+
+def benchmark_fibonacci():
+    """Compare les implémentations de Fibonacci"""
+    
+    print("\n=== Benchmark Fibonacci ===")
+    
+    def rapide_sans_cache(n):
+        # Vide le cache pour mesurer le calcul et non une simple lecture
+        fibonacci_rapide.cache_clear()
+        return fibonacci_rapide(n)
+    
+    print("n=25")
+    for func in [fibonacci_lent, rapide_sans_cache, fibonacci_iteratif, fibonacci_doublement]:
+        print(f"  {func.__name__}: {formater_mesure(mesurer(lambda: func(25), repetitions=3))}")
+    
+    for n in [400, 100000]:
+        print(f"n={n}")
+        fonctions = [fibonacci_iteratif, fibonacci_doublement]
+        if n < 500:
+            # fibonacci_rapide dépasse la limite de récursion au-delà
+            fonctions.insert(0, rapide_sans_cache)
+        for func in fonctions:
+            print(f"  {func.__name__}: {formater_mesure(mesurer(lambda: func(n), repetitions=3))}")
+    
+    modulo = 10**9 + 7
+    mesure = mesurer(lambda: fibonacci_doublement(10**18, modulo), repetitions=3)
+    print(f"F(10^18) mod {modulo}: {formater_mesure(mesure)}")
+    
+    indices = list(range(0, 1000000, 1000))
+    mesure_unitaire = mesurer(lambda: [fibonacci_doublement(i, modulo) for i in indices], repetitions=3)
+    mesure_lot = mesurer(lambda: fibonacci_lot(indices, modulo), repetitions=3)
+    print(f"{len(indices)} indices un par un: {formater_mesure(mesure_unitaire)}")
+    print(f"{len(indices)} indices par lot: {formater_mesure(mesure_lot)}")
 
 
 # ============= MAIN =============
@@ -347,22 +1563,25 @@ if __name__ == "__main__":
     # Nombres premiers
     print("\n3. Benchmark nombres premiers")
     benchmark_nombres_premiers()
+    # Crible parallèle jusqu'à 10**8 (plusieurs minutes sur peu de cœurs)
+    # benchmark_crible_parallele()
     
     # Profiling
     print("\n4. Profiling")
     demo_profiling()
+    demo_profiling_echantillonnage()
     
     # Memoization
     print("\n5. Memoization")
     demo_memoization()
+    benchmark_fibonacci()
     
     # Complexité
     print("\n6. Complexité algorithmique")
-    print("O(1) - Constant: get_first()")
-    print("O(n) - Linéaire: find_max()")
-    print("O(n²) - Quadratique: bubble_sort()")
-    print("O(log n) - Logarithmique: binary_search()")
-    print("O(n log n) - Linéarithmique: merge_sort()")
+    demo_complexite()
+    
+    # Gate de régression (crée benchmarks_reference.json au premier lancement)
+    # verifier_performances()
     
     print("\n" + "="*50)
     print("Consultez instructions.md pour les exercices détaillés !")
@@ -0,0 +1,274 @@
+from main import (
+    CacheBorne,
+    charger_resultats,
+    comparer_a_reference,
+    compter_dans_plages,
+    compter_premiers_parallele,
+    crible_eratosthene,
+    crible_segmente,
+    executer_benchmarks,
+    estimer_complexite,
+    fibonacci_doublement,
+    fibonacci_iteratif,
+    fibonacci_lot,
+    fusion_k_voies,
+    memoiser,
+    merge_sort_iteratif,
+    ProfileurEchantillonnage,
+    premiers_parallele,
+    recherche_binaire_lot,
+    sauvegarder_resultats,
+    somme_premiers_parallele,
+    tri_externe,
+    verifier_complexite,
+)
+import bisect
+import random
+import time
+
+import pytest
+
+
+def test_crible_segmente():
+    assert list(crible_segmente(0)) == list(crible_segmente(1)) == []
+    for n in (2, 3, 10, 97, 100, 1000):
+        assert list(crible_segmente(n, taille_segment=8)) == crible_eratosthene(n)
+    assert list(crible_segmente(200_000)) == crible_eratosthene(200_000)
+
+
+def test_crible_parallele():
+    premiers = crible_eratosthene(300_000)
+    # Petites tâches : plusieurs plages par worker, segments à cheval
+    options = dict(max_workers=2, taille_tache=10_000, taille_segment=1000)
+    assert list(premiers_parallele(300_000, **options)) == premiers
+    assert compter_premiers_parallele(300_000, **options) == len(premiers)
+    assert somme_premiers_parallele(300_000, **options) == sum(premiers)
+    assert compter_premiers_parallele(1) == 0
+
+
+def test_tri_externe():
+    rng = random.Random(6)
+    donnees = [rng.randint(0, 1000) for _ in range(5000)]
+    # Budget minuscule : plusieurs runs sur disque et passes intermédiaires
+    assert list(tri_externe(donnees, memoire_max=2000, fusion_max=2)) == sorted(donnees)
+    assert list(tri_externe(donnees)) == sorted(donnees)
+
+    lignes = [(rng.choice("abc"), i) for i in range(3000)]
+    trie = list(tri_externe(lignes, key=lambda l: l[0], memoire_max=5000, fusion_max=3))
+    assert [tuple(l) for l in trie] == sorted(lignes, key=lambda l: l[0])
+
+
+def test_tri_externe_fusion_max():
+    with pytest.raises(ValueError):
+        tri_externe([3, 1, 2], fusion_max=1)
+
+
+def test_recherche_binaire_lot():
+    donnees = [1, 3, 3, 3, 7, 10]
+    cibles = [0, 3, 4, 10, 11]
+    gauche = recherche_binaire_lot(donnees, cibles, "left")
+    droite = recherche_binaire_lot(donnees, cibles, "right")
+    assert type(gauche) is list
+    assert gauche == [bisect.bisect_left(donnees, c) for c in cibles]
+    assert droite == [bisect.bisect_right(donnees, c) for c in cibles]
+    assert compter_dans_plages(donnees, [3, 8], [7, 20]) == [4, 1]
+
+
+def test_cache_borne_lru():
+    cache = CacheBorne(maxsize=2, politique="lru")
+    cache.stocker("a", 1)
+    cache.stocker("b", 2)
+    cache.obtenir("a")
+    cache.stocker("c", 3)  # évince b, le moins récemment utilisé
+    assert cache.obtenir("b") == (False, None)
+    assert cache.obtenir("a") == (True, 1)
+    assert cache.obtenir("c") == (True, 3)
+    assert cache.infos()["evictions"] == 1
+
+
+def test_cache_borne_lfu():
+    cache = CacheBorne(maxsize=2, politique="lfu")
+    cache.stocker("a", 1)
+    cache.stocker("b", 2)
+    for _ in range(3):
+        cache.obtenir("b")
+    cache.obtenir("a")
+    cache.stocker("c", 3)  # évince a, le moins fréquemment utilisé
+    assert cache.obtenir("a") == (False, None)
+    assert cache.obtenir("b") == (True, 2)
+    assert cache.obtenir("c") == (True, 3)
+
+
+def test_cache_borne_ttl():
+    cache = CacheBorne(maxsize=10, ttl=0.05)
+    cache.stocker("a", 1)
+    assert cache.obtenir("a") == (True, 1)
+    time.sleep(0.06)
+    assert cache.obtenir("a") == (False, None)
+    assert cache.infos()["expirations"] == 1
+
+
+def test_memoiser_cles_distinctes():
+    appels = []
+
+    @memoiser(maxsize=10)
+    def f(*args, **kwargs):
+        appels.append((args, kwargs))
+        return len(appels)
+
+    assert f(("a",), (("k", 1),)) != f("a", k=1)
+    assert f("a", k=1) == f("a", k=1)
+    assert len(appels) == 2
+
+
+def test_fibonacci_doublement():
+    for n in list(range(100)) + [500, 1000, 1001]:
+        for modulo in (None, 1, 2, 10, 1_000_000_007):
+            attendu = fibonacci_iteratif(n) if modulo is None else fibonacci_iteratif(n) % modulo
+            assert fibonacci_doublement(n, modulo) == attendu
+    with pytest.raises(ValueError):
+        fibonacci_doublement(5, 0)
+
+
+def test_fibonacci_lot():
+    rng = random.Random(4)
+    series = [
+        [],
+        [0],
+        [1, 2],
+        list(range(30)),                              # petits écarts
+        [5, 3, 3, 0, 70, 1000, 999, 2500, 64, 65],   # désordre, doublons, grands écarts
+        [rng.randrange(5000) for _ in range(200)],
+    ]
+    for indices in series:
+        for modulo in (None, 1, 2, 97, 10 ** 9 + 7):
+            attendu = [fibonacci_iteratif(i) if modulo is None else fibonacci_iteratif(i) % modulo
+                       for i in indices]
+            assert fibonacci_lot(indices, modulo) == attendu
+            assert fibonacci_lot(indices, modulo, ecart_lineaire=0) == attendu
+    with pytest.raises(ValueError):
+        fibonacci_lot([1, 2], modulo=0)
+    with pytest.raises(ValueError):
+        fibonacci_lot([3, -1])
+
+
+def boucle_occupee(duree):
+    fin = time.perf_counter() + duree
+    total = 0
+    while time.perf_counter() < fin:
+        total += sum(range(100))
+    return total
+
+
+def test_profileur_echantillonnage():
+    with ProfileurEchantillonnage(intervalle=0.001) as profileur:
+        boucle_occupee(0.3)
+    assert not profileur._thread.is_alive()  # arreter() a attendu le thread
+    assert profileur.echantillons > 0
+    assert "boucle_occupee" in profileur.piles_repliees()
+    assert any(nom.startswith("boucle_occupee ") for nom, _ in profileur.top(3))
+
+    profileur.demarrer()
+    boucle_occupee(0.05)
+    profileur.suspendre()
+    assert not profileur.actif
+    time.sleep(0.02)  # un échantillon en cours peut se terminer
+    echantillons = profileur.echantillons
+    boucle_occupee(0.1)
+    assert profileur.echantillons == echantillons
+    assert profileur._thread.is_alive()
+    profileur.arreter()
+    assert not profileur._thread.is_alive()
+
+
+def test_merge_sort_iteratif():
+    rng = random.Random(8)
+    aleatoire = [rng.randrange(50) for _ in range(1000)]
+    for valeurs in ([], [7], [2, 1], list(range(100)), list(range(100, 0, -1)),
+                    [3] * 20, aleatoire, sorted(aleatoire) + sorted(aleatoire)):
+        entree = list(valeurs)
+        assert merge_sort_iteratif(valeurs) == sorted(valeurs)
+        assert valeurs == entree  # la liste d'origine n'est pas modifiée
+
+    # Stabilité avec key : les égaux gardent leur ordre d'origine,
+    # y compris dans les runs décroissants
+    enregistrements = [(rng.randrange(10), i) for i in range(500)]
+    decroissants = [(9 - i // 50, i) for i in range(500)]
+    for donnees in (enregistrements, decroissants, [(0, i) for i in range(50)]):
+        assert merge_sort_iteratif(donnees, key=lambda e: e[0]) == sorted(donnees, key=lambda e: e[0])
+    assert merge_sort_iteratif(["b", "A", "a", "B"], key=str.lower) == ["A", "a", "b", "B"]
+
+
+def test_fusion_k_voies():
+    rng = random.Random(6)
+    sources = [sorted(rng.randrange(100) for _ in range(rng.randrange(0, 50))) for _ in range(7)]
+    sources += [[], []]
+    assert list(fusion_k_voies(sources)) == sorted(v for s in sources for v in s)
+    assert list(fusion_k_voies([])) == []
+    assert list(fusion_k_voies([[], [1]])) == [1]
+    # Avec key, à clé égale la source la plus à gauche passe en premier
+    gauche, droite = [(1, "g"), (2, "g")], [(1, "d"), (3, "d")]
+    assert list(fusion_k_voies([iter(gauche), iter(droite)], key=lambda e: e[0])) == \
+        [(1, "g"), (1, "d"), (2, "g"), (3, "d")]
+
+
+def fabrique_lineaire(n):
+    data = list(range(n))
+    return lambda: sum(data)
+
+
+def fabrique_quadratique(n):
+    data = list(range(n))
+    return lambda: sum(x for x in data for _ in data)
+
+
+def test_estimer_complexite():
+    lineaire = estimer_complexite(fabrique_lineaire, n_min=2000, repetitions=3)
+    assert lineaire["classe"] in ("O(n)", "O(n log n)")
+    assert 0.7 < lineaire["exposant"] < 1.3
+    assert lineaire["tailles"] == [2000 * 4 ** i for i in range(5)]
+
+    ok, quadratique = verifier_complexite(fabrique_quadratique, "O(n log n)",
+                                          n_min=32, facteur=2, repetitions=3)
+    assert not ok
+    assert quadratique["classe"] in ("O(n²)", "O(n³)")
+    assert 1.6 < quadratique["exposant"] < 2.4
+
+    ok, _ = verifier_complexite(fabrique_lineaire, "O(n log n)", n_min=2000, repetitions=3)
+    assert ok
+
+
+def resultats_benchmark(**medianes):
+    """{nom: (médiane, iqr)} -> résultats au format de executer_benchmarks"""
+    return {"python": "3", "date": "", "resultats": {
+        nom: {"1000": {"mediane": mediane, "iqr": iqr, "min": mediane,
+                       "repetitions": 5, "number": 100}}
+        for nom, (mediane, iqr) in medianes.items()
+    }}
+
+
+def test_comparer_a_reference():
+    reference = resultats_benchmark(lent=(1.0, 0.01), bruite=(1.0, 0.2),
+                                    stable=(1.0, 0.01), disparu=(1.0, 0.0))
+    actuels = resultats_benchmark(
+        lent=(1.5, 0.01),     # +50 % : régression
+        bruite=(1.3, 0.2),    # +30 % mais dans le bruit (IQR cumulés 0.4)
+        stable=(1.05, 0.01),  # +5 % : sous le seuil de 10 %
+        nouveau=(9.0, 0.0),   # absent de la référence : ignoré
+    )
+    regressions = comparer_a_reference(actuels, reference)
+    assert [(r["nom"], r["taille"]) for r in regressions] == [("lent", "1000")]
+    assert regressions[0]["ratio"] == pytest.approx(1.5)
+    # Seuil de 1 % : +5 % devient une régression, le bruit protège encore
+    assert [r["nom"] for r in comparer_a_reference(actuels, reference, seuil=0.01)] == \
+        ["lent", "stable"]
+    assert [r["nom"] for r in comparer_a_reference(actuels, reference, seuil=0.6)] == []
+
+
+def test_resultats_json(tmp_path):
+    resultats = executer_benchmarks(noms={"bench_fibonacci_doublement"}, repetitions=2)
+    assert list(resultats["resultats"]) == ["bench_fibonacci_doublement"]
+    chemin = str(tmp_path / "reference.json")
+    sauvegarder_resultats(resultats, chemin)
+    assert charger_resultats(chemin) == resultats
+    assert comparer_a_reference(resultats, charger_resultats(chemin)) == []